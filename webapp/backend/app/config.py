@@ -20,9 +20,133 @@ class Settings(BaseSettings):
     # Redis cache (optional)
     redis_url: str | None = None
     cache_ttl_seconds: int = 86400  # 24 hours
+    # In-process fallback when Redis is absent, bounded by entries and bytes;
+    # larger results are not kept in process memory
+    result_cache_max_entries: int = 1024
+    result_cache_max_bytes: int = 512 * 1024 * 1024
+    result_cache_max_entry_bytes: int = 64 * 1024 * 1024
 
-    # Rate limiting
+    # Finished results kept server-side for exports and AI analysis by
+    # result_id: the objects themselves in process memory, plus binary
+    # (result_codec) copies written in the background to Redis (when
+    # redis_url is set) or to result_store_dir ("" keeps them in memory only)
+    result_store_ttl_seconds: int = 3600
+    result_store_max_entries: int = 256
+    result_store_dir: str = "./data/results"
+
+    # Largest accepted request body (VCF uploads included); larger ones get
+    # 413 before they are read. 0 disables the limit.
+    max_request_body_bytes: int = 32 * 1024 * 1024
+
+    # Rate limiting per API key (per client address without one). Every API
+    # request draws from the per-minute request bucket; prediction endpoints
+    # also draw their cost in upstream predictions (ISM: 3 per bp) from the
+    # prediction bucket and the daily quota (0 disables the daily quota).
+    rate_limit_enabled: bool = True
     rate_limit_per_minute: int = 60
+    rate_limit_predictions_per_minute: int = 600
+    rate_limit_prediction_burst: int = 3000
+    rate_limit_predictions_per_day: int = 1_000_000
+    # Tile GETs (/api/tiles) draw from their own bucket instead of the
+    # request bucket, since a browser view pans through many tiles
+    rate_limit_tiles_per_minute: int = 1200
+
+    # AlphaGenome client pool (clients are keyed by a hash of the API key)
+    client_pool_max_size: int = 64
+    client_pool_idle_ttl_seconds: int = 600
+
+    # Upstream thread pool (blocking AlphaGenome calls run off the event loop)
+    upstream_max_workers: int = 32
+    # Per-method caps; keep their sum at or below upstream_max_workers so a
+    # capped method can always get a thread
+    upstream_concurrency: dict[str, int] = {
+        "predict_variant": 10,
+        "predict_interval": 6,
+        "score_variant": 10,
+        "score_ism_variants": 4,
+        "score_variants": 2,
+    }
+    predict_timeout_seconds: float = 300
+    score_timeout_seconds: float = 300
+
+    # Upstream resilience: DEADLINE_EXCEEDED, ABORTED and connection errors
+    # are retried with jittered exponential backoff (the AlphaGenome client
+    # already retries UNAVAILABLE and RESOURCE_EXHAUSTED; timed-out attempts
+    # are not retried); attempts of the hedge methods still running after the
+    # recent latency percentile get a duplicate (empty list disables
+    # hedging); each method has a circuit breaker counting only server-side
+    # failures
+    upstream_attempt_timeout_seconds: float = 300
+    upstream_retry_attempts: int = 3
+    upstream_retry_base_delay_seconds: float = 0.5
+    upstream_retry_max_delay_seconds: float = 10
+    upstream_hedge_methods: list[str] = []
+    upstream_hedge_percentile: float = 0.95
+    upstream_hedge_min_samples: int = 20
+    upstream_breaker_failure_threshold: int = 5
+    upstream_breaker_reset_seconds: float = 30
+
+    # Batch scoring (/api/predict/score/batch)
+    batch_score_max_variants: int = 10000
+    batch_score_chunk_size: int = 100
+
+    # ISM: positions per score_ism_variants shard, shards in flight per run,
+    # and where finished shards are checkpointed for retries/resumes
+    ism_shard_width: int = 64
+    ism_shard_concurrency: int = 4
+    ism_checkpoint_dir: str = "./data/ism_checkpoints"
+    ism_checkpoint_ttl_seconds: int = 86400
+
+    # Max bins per output in JSON track values (interval and region chunks);
+    # finer views of large regions are read through /api/tiles
+    interval_max_bins: int = 16384
+
+    # Stitched region predictions (/api/predict/region)
+    region_max_length: int = 50_000_000
+    region_max_concurrency: int = 4
+
+    # Tile pyramid for genome-browser panning: bins per tile and zoom levels (bp)
+    tile_store_enabled: bool = True
+    tile_store_dir: str = "./data/tiles"
+    tile_bins: int = 1024
+    tile_zoom_levels: list[int] = [1, 16, 256, 4096]
+    # Size cap (least recently used tiles are evicted first) and the age
+    # after which tiles not rewritten by a newer prediction are dropped
+    tile_store_max_bytes: int = 2 * 1024 * 1024 * 1024
+    tile_store_ttl_seconds: int = 7 * 86400
+
+    # AlphaGenome backend: "remote" (the real API) or "fake" (offline synthetic
+    # data for load/perf testing). Fake latency medians are per call in ms;
+    # score_ism_variants is per 100 ISM variants.
+    alphagenome_backend: str = "remote"
+    fake_seed: int = 0
+    fake_latency_distribution: str = "lognormal"
+    fake_latency_sigma: float = 0.5
+    fake_latency_ms: dict[str, float] = {
+        "predict_variant": 1500,
+        "predict_interval": 1200,
+        "score_variant": 800,
+        "score_ism_variants": 400,
+        "score_interval": 800,
+    }
+
+    # Log a per-phase timing breakdown for requests slower than this (0 disables)
+    slow_request_log_ms: float = 5000
+
+    # Admin routes (/api/admin) and on-demand profiling of single requests
+    # (X-Profile: cprofile|sample plus X-Admin-Token) are disabled unless an
+    # admin token is set
+    admin_token: str | None = None
+    profile_dir: str = "./data/profiles"
+    profile_max_saved: int = 100
+    profile_sample_interval_ms: float = 5
+
+    # Background jobs (ISM, batch scoring). Postgres: postgresql+asyncpg://...
+    job_database_url: str = "sqlite+aiosqlite:///./data/jobs.db"
+    job_max_concurrency: int = 2
+    # Workers sharing the database renew a lease on their jobs every third
+    # of this; jobs of a worker silent for longer are marked interrupted
+    job_lease_seconds: float = 60
 
     # AlphaGenome API (NOT stored here - passed by user per request)
     # The API key is provided by the user in each request header
@@ -10,14 +10,37 @@ Get your key at: https://deepmind.google.com/science/alphagenome
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from contextlib import asynccontextmanager
 import logging
 import time
 
 from .config import get_settings
-from .routers import predict_router, metadata_router, export_router, ai_router, profile_router
+from .routers import (
+    predict_router,
+    metadata_router,
+    export_router,
+    ai_router,
+    profile_router,
+    jobs_router,
+    tiles_router,
+    admin_router,
+)
 from .models import HealthResponse
+from .services.alphagenome_service import alphagenome_service
+from .services.job_service import job_service
+from .services.rate_limiter import rate_limiter
+from .services.result_store import result_store
+from .services.profiler import profile_store
+from .services.metrics import metrics, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from .middleware import (
+    MetricsMiddleware,
+    BodySizeLimitMiddleware,
+    RateLimitMiddleware,
+    ServerTimingMiddleware,
+    ProfilingMiddleware,
+    RATE_LIMIT_HEADERS,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -33,8 +56,13 @@ settings = get_settings()
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     logger.info("Starting AlphaGenome Explorer API...")
+    await job_service.start()
     yield
     logger.info("Shutting down AlphaGenome Explorer API...")
+    await job_service.close()
+    await alphagenome_service.close()
+    await rate_limiter.close()
+    await result_store.close()
 
 
 app = FastAPI(
@@ -59,6 +87,8 @@ A professional web interface for exploring genomic predictions with AlphaGenome.
 - **Region Exploration**: Explore any genomic region
 - **Variant Scoring**: Get quantitative impact scores
 - **ISM Analysis**: In silico mutagenesis
+- **Background Jobs**: Long ISM and batch scoring runs that survive timeouts
+- **Track Tiles**: Multi-resolution tiles for panning and zooming without new predictions
 - **Multiple Export Formats**: JSON, CSV, PDF, VCF, and more
 
 ## Security
@@ -77,6 +107,13 @@ If you use AlphaGenome in your research, please cite:
     redoc_url="/redoc",
 )
 
+# Rate limiting per API key (added before CORS so 429s carry CORS headers)
+if settings.rate_limit_enabled:
+    app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
+# Reject oversized request bodies before the rate limiter or routes read them
+app.add_middleware(BodySizeLimitMiddleware, max_bytes=settings.max_request_body_bytes)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -84,8 +121,23 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=RATE_LIMIT_HEADERS + ["Server-Timing", "X-Profile-Id", "X-Profile-Url", "X-Result-Id"],
 )
 
+# Per-phase Server-Timing header and slow-request breakdown logs
+app.add_middleware(ServerTimingMiddleware, slow_request_ms=settings.slow_request_log_ms)
+
+# On-demand profiling of single requests (admin token required)
+if settings.admin_token:
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=profile_store,
+        interval_ms=settings.profile_sample_interval_ms,
+    )
+
+# Per-route latency, in-flight requests and payload sizes for /metrics
+app.add_middleware(MetricsMiddleware)
+
 
 # Request timing middleware
 @app.middleware("http")
@@ -119,6 +171,9 @@ app.include_router(metadata_router)
 app.include_router(export_router)
 app.include_router(ai_router)
 app.include_router(profile_router)
+app.include_router(jobs_router)
+app.include_router(tiles_router)
+app.include_router(admin_router)
 
 
 # Root endpoints
@@ -156,6 +211,36 @@ async def health_check():
     )
 
 
+@app.get("/stats", tags=["Root"])
+async def runtime_stats():
+    """
+    Runtime statistics (client pool, upstream queue depth, result cache).
+    """
+    return {
+        **alphagenome_service.stats(),
+        "jobs": job_service.stats(),
+        "rate_limits": rate_limiter.stats(),
+        "result_store": result_store.stats(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse, tags=["Root"])
+async def prometheus_metrics():
+    """
+    Metrics in the Prometheus text format: route, upstream and export
+    latency histograms, payload sizes, in-flight counts and cache ratios.
+    """
+    stats = {
+        **alphagenome_service.stats(),
+        "jobs": job_service.stats(),
+        "rate_limits": rate_limiter.stats(),
+        "result_store": result_store.stats(),
+    }
+    return PlainTextResponse(
+        metrics.render(stats), media_type=METRICS_CONTENT_TYPE
+    )
+
+
 @app.get("/api-key-required", tags=["Root"])
 async def api_key_info():
     """
@@ -0,0 +1,478 @@
+"""
+HTTP Middleware
+
+Request size limits, rate limiting, request metrics, Server-Timing and
+on-demand profiling for the API, written as plain ASGI middleware so request bodies can be inspected (to price
+prediction requests) and replayed to the routes, and so streaming
+responses pass through untouched.
+"""
+
+import json
+import logging
+import math
+import time
+from typing import Any, Callable
+
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import get_settings
+from .models import SequenceLength
+from .services.alphagenome_service import SEQUENCE_LENGTH_MAP
+from .services.metrics import (
+    HTTP_REQUEST_BYTES,
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUESTS_IN_FLIGHT,
+    HTTP_RESPONSE_BYTES,
+)
+from .services.rate_limiter import (
+    Bucket,
+    Decision,
+    RateLimiter,
+    finish_savings,
+    track_savings,
+)
+from .services import timing
+from .services.profiler import PROFILE_MODES, ProfileStore, RequestProfile, is_admin
+from .services.region_planner import plan_windows
+
+logger = logging.getLogger(__name__)
+
+# Alternative alleles scored per mutated position in ISM
+ISM_PREDICTIONS_PER_BP = 3
+
+RATE_LIMIT_HEADERS = [
+    "Retry-After",
+    "X-RateLimit-Limit",
+    "X-RateLimit-Remaining",
+    "X-RateLimit-Reset",
+    "X-RateLimit-Cost",
+    "X-RateLimit-Predictions-Remaining",
+    "X-RateLimit-Daily-Remaining",
+]
+
+LIMIT_MESSAGES = {
+    "requests": "Too many requests for this API key",
+    "predictions": "Prediction budget for this API key is used up",
+    "daily": "Daily prediction quota for this API key is used up",
+    "tiles": "Too many tile requests for this API key",
+}
+
+# GETs under this prefix draw from the tile bucket
+TILES_PREFIX = "/api/tiles/"
+
+
+# ============ Request Costs ============
+# Upstream predictions a request will use, estimated from its body before
+# validation; malformed bodies cost the minimum and are rejected by the route.
+
+def _ism_cost(body: dict[str, Any]) -> float:
+    return ISM_PREDICTIONS_PER_BP * int(body.get("ism_width", 256))
+
+
+def _batch_cost(body: dict[str, Any]) -> float:
+    return max(1, len(body.get("variants") or []))
+
+
+def _region_cost(body: dict[str, Any]) -> float:
+    start, end = int(body["start"]), int(body["end"])
+    if end - start > get_settings().region_max_length:
+        return 1
+    window = SEQUENCE_LENGTH_MAP[SequenceLength(body.get("sequence_length", "1MB"))]
+    return len(plan_windows(start, end, window, int(body.get("overlap", 131072))))
+
+
+JSON_COSTS: dict[str, Callable[[dict[str, Any]], float]] = {
+    "/api/predict/variant": lambda body: 2,  # prediction + scoring
+    "/api/predict/interval": lambda body: 1,
+    "/api/predict/region": _region_cost,
+    "/api/predict/score": lambda body: 1,
+    "/api/predict/score/batch": _batch_cost,
+    "/api/predict/ism": _ism_cost,
+    "/api/jobs/ism": _ism_cost,
+    "/api/jobs/score-batch": _batch_cost,
+}
+
+
+VCF_UPLOAD_PATH = "/api/predict/score/batch/vcf"
+
+
+def _vcf_cost(body: bytes) -> float:
+    # Multipart upload: count non-header lines of the file (plus a few
+    # multipart framing lines, which is close enough for pacing)
+    records = sum(
+        1 for line in body.splitlines() if line.strip() and not line.startswith(b"#")
+    )
+    return max(1, min(records, get_settings().batch_score_max_variants))
+
+
+def request_cost(path: str, body: bytes) -> float:
+    """Estimated upstream predictions for a POST to `path`."""
+    if path == VCF_UPLOAD_PATH:
+        return _vcf_cost(body)
+    try:
+        return JSON_COSTS[path](json.loads(body))
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return 1
+
+
+# ============ Request Size ============
+
+class _BodyTooLarge(HTTPException):
+    """Raised from `receive` once a body passes the limit (FastAPI re-raises it)."""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(status_code=413, detail=f"Request body exceeds {max_bytes} bytes")
+
+
+class BodySizeLimitMiddleware:
+    """
+    Reject request bodies larger than `max_bytes` with 413.
+
+    A declared Content-Length over the limit is rejected before anything
+    is read; bodies without one are cut off as soon as they pass it, so
+    neither the rate limiter nor the routes buffer more than the limit.
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.max_bytes <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        declared = Headers(scope=scope).get("content-length", "")
+        if declared.isdigit() and int(declared) > self.max_bytes:
+            await self._reject(scope, receive, send)
+            return
+
+        received = 0
+        started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise _BodyTooLarge(self.max_bytes)
+            return message
+
+        async def send_tracked(message: Message) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, send_tracked)
+        except _BodyTooLarge:
+            if started:
+                raise
+            await self._reject(scope, receive, send)
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send) -> None:
+        logger.warning(f"Rejected oversized body on {scope['method']} {scope['path']}")
+        response = JSONResponse(
+            status_code=413,
+            content={"detail": f"Request body exceeds {self.max_bytes} bytes"},
+        )
+        await response(scope, receive, send)
+
+
+# ============ Rate Limiting ============
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _replay(body: bytes, receive: Receive) -> Receive:
+    """A receive channel that yields the already-read body first."""
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
+
+
+class RateLimitMiddleware:
+    """
+    Token-bucket rate limiting for `/api/` routes.
+
+    Rejected requests get 429 with `Retry-After`; every response carries
+    the caller's remaining budget in `X-RateLimit-*` headers. Predictions
+    served from cache are refunded after the response (see
+    `rate_limiter.record_cache_hit`), so the headers show the budget
+    before the refund.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: RateLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or not scope["path"].startswith("/api/")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"].rstrip("/")
+        cost = 0.0
+        if scope["method"] == "POST" and (path in JSON_COSTS or path == VCF_UPLOAD_PATH):
+            body = await _read_body(receive)
+            receive = _replay(body, receive)
+            cost = request_cost(path, body)
+        base = (
+            self.limiter.tiles
+            if scope["method"] == "GET" and scope["path"].startswith(TILES_PREFIX)
+            else self.limiter.requests
+        )
+
+        client = scope.get("client")
+        identity = self.limiter.identity(
+            Headers(scope=scope).get("x-api-key"), client[0] if client else None
+        )
+        decision = await self.limiter.check(identity, cost, base)
+        headers = self._headers(decision, cost, base)
+
+        if not decision.allowed:
+            retry_after = max(1, math.ceil(decision.retry_after))
+            logger.warning(
+                f"Rate limited {identity[:16]} on {path} "
+                f"({decision.limited_by} bucket, cost {cost:g}, retry in {retry_after}s)"
+            )
+            response = JSONResponse(
+                status_code=429,
+                content={
+                    "detail": {
+                        "error": "Rate limit exceeded",
+                        "message": (
+                            f"{LIMIT_MESSAGES[decision.limited_by]}; "
+                            f"retry in {retry_after} seconds"
+                        ),
+                        "bucket": decision.limited_by,
+                        "cost": cost,
+                        "retry_after": retry_after,
+                    }
+                },
+                headers={**headers, "Retry-After": str(retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(headers)
+            await send(message)
+
+        if not cost:
+            await self.app(scope, receive, send_with_headers)
+            return
+
+        savings, token = track_savings()
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            finish_savings(token)
+            await self.limiter.refund(identity, min(savings.predictions, cost))
+
+    def _headers(self, decision: Decision, cost: float, base: Bucket) -> dict[str, str]:
+        left = decision.remaining[base.name]
+        headers = {
+            "X-RateLimit-Limit": str(int(base.capacity)),
+            "X-RateLimit-Remaining": str(max(0, math.floor(left))),
+            "X-RateLimit-Reset": str(
+                math.ceil(max(0.0, base.capacity - left) / base.refill_per_second)
+            ),
+        }
+        if cost:
+            headers["X-RateLimit-Cost"] = f"{cost:g}"
+            headers["X-RateLimit-Predictions-Remaining"] = str(
+                max(0, math.floor(decision.remaining[self.limiter.predictions.name]))
+            )
+            if self.limiter.daily is not None:
+                headers["X-RateLimit-Daily-Remaining"] = str(
+                    max(0, math.floor(decision.remaining[self.limiter.daily.name]))
+                )
+        return headers
+
+
+# ============ Metrics ============
+
+class MetricsMiddleware:
+    """
+    Latency, in-flight count and payload sizes per route template.
+
+    Routes are labelled by their path template (`/api/jobs/{job_id}`), and
+    requests that match no route as "unmatched", so label cardinality
+    stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        started = time.perf_counter()
+        status = 500
+        request_bytes = 0
+        response_bytes = 0
+
+        async def counting_receive() -> Message:
+            nonlocal request_bytes
+            message = await receive()
+            request_bytes += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message: Message) -> None:
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc(method)
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec(method)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, method, route, status)
+            HTTP_REQUEST_BYTES.observe(request_bytes, method, route)
+            HTTP_RESPONSE_BYTES.observe(response_bytes, method, route)
+
+
+# ============ Server-Timing ============
+
+class ServerTimingMiddleware:
+    """
+    Opens a request timing context and reports it as `Server-Timing`.
+
+    The header is written when the response starts, so for streaming
+    responses it covers only the work done before the first chunk.
+    Requests slower than `slow_request_ms` (0 disables) are logged with
+    their full phase breakdown once the response has finished.
+    """
+
+    def __init__(self, app: ASGIApp, slow_request_ms: float = 0):
+        self.app = app
+        self.slow_request_ms = slow_request_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings, token = timing.start()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", timings.header())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            timing.finish(token)
+            total = timings.total_ms()
+            if self.slow_request_ms and total >= self.slow_request_ms:
+                logger.warning(
+                    f"Slow request {scope['method']} {scope['path']} took {total:.0f}ms: "
+                    f"{timings.breakdown() or 'no recorded phases'}"
+                )
+
+
+# ============ Profiling ============
+
+class ProfilingMiddleware:
+    """
+    Profile a single request on demand.
+
+    A request carrying `X-Profile: cprofile|sample` (or `?profile=...`)
+    and a valid `X-Admin-Token` runs under the chosen profiler; the
+    response gets `X-Profile-Id` and `X-Profile-Url` pointing at the saved
+    profile. Without a valid token the flag is ignored. One request is
+    profiled at a time.
+    """
+
+    def __init__(self, app: ASGIApp, store: ProfileStore, interval_ms: float = 5):
+        self.app = app
+        self.store = store
+        self.interval_ms = interval_ms
+        self._active = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        mode = headers.get("x-profile") or QueryParams(scope["query_string"]).get("profile")
+        if not mode or not is_admin(headers.get("x-admin-token")):
+            await self.app(scope, receive, send)
+            return
+
+        if mode not in PROFILE_MODES:
+            response = JSONResponse(
+                status_code=400,
+                content={"detail": f"Profile mode must be one of {', '.join(PROFILE_MODES)}"},
+            )
+            await response(scope, receive, send)
+            return
+        if self._active:
+            response = JSONResponse(
+                status_code=409, content={"detail": "Another request is being profiled"}
+            )
+            await response(scope, receive, send)
+            return
+
+        profile_id = self.store.new_id()
+
+        async def send_with_profile(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(
+                    {
+                        "X-Profile-Id": profile_id,
+                        "X-Profile-Url": f"/api/admin/profiles/{profile_id}",
+                    }
+                )
+            await send(message)
+
+        self._active = True
+        profile = RequestProfile(mode, self.interval_ms)
+        try:
+            with profile:
+                await self.app(scope, receive, send_with_profile)
+        finally:
+            self._active = False
+            label = f"{scope['method']} {scope['path']}"
+            try:
+                self.store.save(profile_id, mode, profile.dump(), label)
+                logger.info(f"Saved {mode} profile {profile_id} for {label}")
+            except Exception as e:
+                logger.warning(f"Could not save profile for {label}: {e}")
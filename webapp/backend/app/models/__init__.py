@@ -8,7 +8,9 @@ from .requests import (
     ExportFormat,
     VariantPredictRequest,
     IntervalPredictRequest,
+    RegionPredictRequest,
     VariantScoreRequest,
+    BatchScoreRequest,
     ISMRequest,
     GeneSearchRequest,
     ExportRequest,
@@ -24,6 +26,8 @@ from .responses import (
     IntervalPredictResponse,
     ScoreResponse,
     ISMResponse,
+    JobStatusResponse,
+    JobResultResponse,
     GeneInfo,
     GeneSearchResponse,
     OntologyTerm,
@@ -45,7 +49,9 @@ __all__ = [
     # Request models
     "VariantPredictRequest",
     "IntervalPredictRequest",
+    "RegionPredictRequest",
     "VariantScoreRequest",
+    "BatchScoreRequest",
     "ISMRequest",
     "GeneSearchRequest",
     "ExportRequest",
@@ -59,6 +65,8 @@ __all__ = [
     "IntervalPredictResponse",
     "ScoreResponse",
     "ISMResponse",
+    "JobStatusResponse",
+    "JobResultResponse",
     "GeneInfo",
     "GeneSearchResponse",
     "OntologyTerm",
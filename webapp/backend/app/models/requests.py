@@ -2,7 +2,7 @@
 Pydantic models for API requests
 """
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import Literal
 from enum import Enum
 import re
@@ -86,6 +86,13 @@ class VariantPredictRequest(BaseModel):
         default=Organism.HUMAN,
         description="Target organism"
     )
+    include_exports: bool = Field(
+        default=False,
+        description=(
+            "Embed JSON, Markdown and CSV renderings in the response; "
+            "otherwise `export` holds download links for the stored result"
+        )
+    )
 
     @field_validator('variant')
     @classmethod
@@ -141,6 +148,27 @@ class IntervalPredictRequest(BaseModel):
     organism: Organism = Field(
         default=Organism.HUMAN
     )
+    resolution: int = Field(
+        default=128,
+        ge=1,
+        le=1_048_576,
+        description=(
+            "Bin size in bp for returned track values (e.g. 1, 32, 128, 2048). "
+            "Rounded down to a multiple of the output's native resolution."
+        )
+    )
+    aggregation: Literal["mean", "max"] = Field(
+        default="mean",
+        description="How positions are combined within a bin"
+    )
+    track_filter: dict[str, str | list[str]] | None = Field(
+        default=None,
+        description=(
+            "Keep only tracks whose metadata matches every entry, e.g. "
+            '{"strand": "+", "biosample_type": ["tissue", "primary_cell"]}'
+        ),
+        examples=[{"strand": "+"}]
+    )
 
     @field_validator('chromosome')
     @classmethod
@@ -151,6 +179,23 @@ class IntervalPredictRequest(BaseModel):
         return v
 
 
+class RegionPredictRequest(IntervalPredictRequest):
+    """Request model for a region predicted as stitched model windows."""
+
+    sequence_length: SequenceLength = Field(
+        default=SequenceLength.LENGTH_1MB,
+        description="Model window used to tile the region"
+    )
+    overlap: int = Field(
+        default=131072,
+        ge=0,
+        description=(
+            "Overlap between neighbouring windows in bp; half of it is "
+            "discarded at each window edge to avoid edge effects"
+        )
+    )
+
+
 class VariantScoreRequest(BaseModel):
     """Request model for variant scoring."""
 
@@ -178,6 +223,41 @@ class VariantScoreRequest(BaseModel):
         return v
 
 
+class BatchScoreRequest(BaseModel):
+    """Request model for batch variant scoring."""
+
+    variants: list[str] = Field(
+        ...,
+        min_length=1,
+        description="Variants in format chr:position:ref>alt; duplicates are scored once"
+    )
+    scorers: list[ScorerType] = Field(
+        default=[ScorerType.RNA_SEQ],
+        description="Scoring methods to use"
+    )
+    sequence_length: SequenceLength = Field(
+        default=SequenceLength.LENGTH_1MB
+    )
+    organism: Organism = Field(
+        default=Organism.HUMAN
+    )
+    max_workers: int = Field(
+        default=5,
+        ge=1,
+        le=20,
+        description="Parallel upstream requests per chunk of variants"
+    )
+
+    @field_validator('variants')
+    @classmethod
+    def validate_variant_formats(cls, v: list[str]) -> list[str]:
+        pattern = r'^chr[\dXY]+:\d+:[ACGTN]+>[ACGTN]+$'
+        for index, variant in enumerate(v):
+            if not re.match(pattern, variant, re.IGNORECASE):
+                raise ValueError(f"Invalid variant format at index {index}: {variant}")
+        return v
+
+
 class ISMRequest(BaseModel):
     """Request model for in silico mutagenesis."""
 
@@ -203,6 +283,13 @@ class ISMRequest(BaseModel):
     organism: Organism = Field(
         default=Organism.HUMAN
     )
+    matrix_encoding: Literal["list", "base64"] = Field(
+        default="list",
+        description=(
+            "JSON encoding of the ISM matrix: nested lists of floats, or "
+            "base64 of the raw little-endian float32 buffer in ism_matrix_b64"
+        )
+    )
 
 
 class GeneSearchRequest(BaseModel):
@@ -227,9 +314,14 @@ class GeneSearchRequest(BaseModel):
 class ExportRequest(BaseModel):
     """Request model for export."""
 
-    data: dict = Field(
-        ...,
-        description="Data to export"
+    data: dict | None = Field(
+        default=None,
+        description="Data to export (or give result_id instead)"
+    )
+    result_id: str | None = Field(
+        default=None,
+        description="ID of a stored prediction, score or ISM result to export",
+        max_length=64
     )
     format: ExportFormat = Field(
         default=ExportFormat.JSON
@@ -238,3 +330,10 @@ class ExportRequest(BaseModel):
         default="alphagenome_result",
         max_length=100
     )
+
+    @model_validator(mode='after')
+    def require_data_or_result_id(self) -> 'ExportRequest':
+        """Exactly one of data and result_id must be given."""
+        if (self.data is None) == (self.result_id is None):
+            raise ValueError("Provide either data or result_id")
+        return self
@@ -67,11 +67,15 @@ class VariantPredictResponse(BaseModel):
     success: bool = True
     data: PredictionResult | None = None
     error: str | None = None
+    result_id: str | None = Field(
+        default=None,
+        description="ID of the stored result, for /api/export and /api/ai by result_id"
+    )
 
-    # Export-ready formats
+    # Export-ready formats, or links to render them (include_exports=false)
     export: dict = Field(
         default_factory=dict,
-        description="Pre-formatted export data"
+        description="Pre-formatted export data or export links"
     )
 
 
@@ -80,6 +84,10 @@ class IntervalPredictResponse(BaseModel):
     success: bool = True
     data: dict | None = None
     error: str | None = None
+    result_id: str | None = Field(
+        default=None,
+        description="ID of the stored result, for /api/export and /api/ai by result_id"
+    )
     export: dict = Field(default_factory=dict)
 
 
@@ -91,6 +99,10 @@ class ScoreResponse(BaseModel):
     total_genes: int = 0
     total_tracks: int = 0
     error: str | None = None
+    result_id: str | None = Field(
+        default=None,
+        description="ID of the stored result, for /api/export and /api/ai by result_id"
+    )
 
     # Export formats
     export: dict = Field(default_factory=dict)
@@ -101,11 +113,46 @@ class ISMResponse(BaseModel):
     success: bool = True
     interval: dict
     ism_matrix: list[list[float]] | None = None
+    ism_matrix_b64: str | None = Field(
+        default=None,
+        description="Base64 of the row-major float32 matrix (matrix_encoding=base64)"
+    )
+    dtype: str | None = None
+    shape: list[int] | None = None
     top_positions: list[dict] = []
     error: str | None = None
+    result_id: str | None = Field(
+        default=None,
+        description="ID of the stored result, for /api/export and /api/ai by result_id"
+    )
     export: dict = Field(default_factory=dict)
 
 
+class JobStatusResponse(BaseModel):
+    """Status of a background job."""
+    success: bool = True
+    job_id: str
+    kind: str
+    status: str = Field(
+        description="queued, running, succeeded, failed, cancelled or interrupted"
+    )
+    params: dict = Field(default_factory=dict)
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    result_url: str | None = None
+
+
+class JobResultResponse(BaseModel):
+    """Result of a finished background job."""
+    success: bool = True
+    job_id: str
+    kind: str
+    status: str
+    result: Any = None
+
+
 class GeneInfo(BaseModel):
     """Gene information."""
     gene_id: str
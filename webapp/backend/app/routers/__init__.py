@@ -5,5 +5,17 @@ from .metadata import router as metadata_router
 from .export import router as export_router
 from .ai import router as ai_router
 from .profile import router as profile_router
+from .jobs import router as jobs_router
+from .tiles import router as tiles_router
+from .admin import router as admin_router
 
-__all__ = ["predict_router", "metadata_router", "export_router", "ai_router", "profile_router"]
+__all__ = [
+    "predict_router",
+    "metadata_router",
+    "export_router",
+    "ai_router",
+    "profile_router",
+    "jobs_router",
+    "tiles_router",
+    "admin_router",
+]
@@ -0,0 +1,111 @@
+"""
+Admin Routes
+
+Operator-only diagnostics: saved request profiles and tracemalloc
+snapshot diffs. Every route requires the `X-Admin-Token` header to match
+`Settings.admin_token`; when no token is configured the routes are off.
+
+To profile one request, send it with `X-Profile: cprofile` (pstats) or
+`X-Profile: sample` (collapsed stacks for flame graphs) plus the admin
+token, then fetch the profile from the `X-Profile-Url` response header.
+"""
+
+from fastapi import APIRouter, HTTPException, Header, Depends, Query
+from fastapi.responses import PlainTextResponse, Response
+from typing import Annotated, Literal
+import asyncio
+import logging
+
+from ..config import get_settings
+from ..services.profiler import is_admin, memory_tracker, profile_store, pstats_text
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/admin", tags=["Admin"])
+
+
+def require_admin(x_admin_token: Annotated[str | None, Header()] = None) -> None:
+    """Reject requests without the configured admin token."""
+    if not get_settings().admin_token:
+        raise HTTPException(status_code=404, detail="Admin routes are disabled")
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+# ============ Request profiles ============
+
+@router.get("/profiles", dependencies=[Depends(require_admin)])
+async def list_profiles():
+    """Saved request profiles, newest first."""
+    return {"profiles": profile_store.list()}
+
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+async def get_profile(
+    profile_id: str,
+    format: Literal["raw", "text"] = "raw",
+    sort: Literal["cumulative", "tottime", "calls"] = "cumulative",
+    limit: int = Query(default=50, ge=1, le=1000),
+):
+    """
+    Download a saved profile.
+
+    - `raw`: the pstats file (`cprofile`; open with `python -m pstats` or
+      snakeviz) or collapsed stacks (`sample`; feed to flamegraph.pl or
+      speedscope)
+    - `text`: top functions of a `cprofile` profile, sorted by `sort`
+    """
+    path = profile_store.path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    if format == "text":
+        if path.suffix != ".prof":
+            raise HTTPException(status_code=400, detail="Text reports are only available for cprofile")
+        return PlainTextResponse(await asyncio.to_thread(pstats_text, path, limit, sort))
+
+    return Response(
+        content=path.read_bytes(),
+        media_type="application/octet-stream" if path.suffix == ".prof" else "text/plain",
+        headers={"Content-Disposition": f'attachment; filename="{path.name}"'},
+    )
+
+
+# ============ Memory tracking ============
+
+@router.post("/tracemalloc/start", dependencies=[Depends(require_admin)])
+async def start_tracemalloc(frames: int = Query(default=10, ge=1, le=100)):
+    """
+    Start tracing allocations and take the baseline snapshot.
+
+    Tracing slows the process down noticeably; stop it when done.
+    """
+    await asyncio.to_thread(memory_tracker.start, frames)
+    return {"tracing": True, "frames": frames}
+
+
+@router.post("/tracemalloc/snapshot", dependencies=[Depends(require_admin)])
+async def tracemalloc_snapshot(
+    top: int = Query(default=25, ge=1, le=500),
+    key_type: Literal["lineno", "filename", "traceback"] = "lineno",
+    path_filter: str | None = Query(
+        default=None,
+        description="Only allocations from files whose path contains this, e.g. export_service",
+    ),
+):
+    """
+    Take a snapshot and report allocation growth since the previous one.
+
+    Run the suspect workload (ISM runs, exports, ...) between snapshots;
+    entries are ordered by growth, largest first.
+    """
+    if not memory_tracker.tracing:
+        raise HTTPException(status_code=409, detail="Start tracing first")
+    return await asyncio.to_thread(memory_tracker.diff, top, key_type, path_filter)
+
+
+@router.post("/tracemalloc/stop", dependencies=[Depends(require_admin)])
+async def stop_tracemalloc():
+    """Stop tracing allocations and drop the stored snapshot."""
+    memory_tracker.stop()
+    return {"tracing": False}
@@ -3,10 +3,11 @@ AI Router - Endpoints for AI-powered genomic analysis.
 """
 
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 import logging
 
 from ..services.ai_service import ai_service
+from .export import load_result
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/ai", tags=["AI"])
@@ -28,10 +29,17 @@ class ChatResponse(BaseModel):
 
 
 class AnalyzeRequest(BaseModel):
-    data: dict
+    data: dict | None = None
+    result_id: str | None = Field(default=None, max_length=64)
     question: str
     provider: str = "claude"
 
+    @model_validator(mode="after")
+    def require_data_or_result_id(self) -> "AnalyzeRequest":
+        if (self.data is None) == (self.result_id is None):
+            raise ValueError("Provide either data or result_id")
+        return self
+
 
 @router.get("/providers")
 async def get_providers():
@@ -71,10 +79,13 @@ async def chat(request: ChatRequest):
 
 @router.post("/analyze-genomic-data")
 async def analyze_genomic_data(request: AnalyzeRequest):
-    """Analyze genomic data with AI."""
+    """Analyze genomic data (or the stored result `result_id`) with AI."""
+    data = request.data
+    if request.result_id is not None:
+        data = await load_result(request.result_id)
     try:
         result = await ai_service.analyze_genomic_data(
-            data=request.data,
+            data=data,
             question=request.question,
             provider=request.provider,
         )
@@ -1,18 +1,37 @@
 """
 Export API Routes
 
-Endpoints for exporting results in various formats.
+Endpoints for exporting results in various formats. Results can be sent
+in the request body or, cheaper, referenced by the `result_id` that
+prediction, scoring and ISM responses carry.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import Response
+from typing import Any
+import asyncio
 
 from ..models import ExportRequest, ExportFormat
 from ..services.export_service import export_service
+from ..services.result_store import as_data, result_store
 
 router = APIRouter(prefix="/api/export", tags=["Export"])
 
 
+async def load_result(result_id: str) -> Any:
+    """Export-ready data of a stored result, or 404."""
+    stored = await result_store.get(result_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Result not found or expired")
+    return await asyncio.to_thread(as_data, stored.value)
+
+
+async def _request_data(request: ExportRequest) -> Any:
+    if request.result_id is not None:
+        return await load_result(request.result_id)
+    return request.data
+
+
 @router.post(
     "/download",
     summary="Download results in specified format",
@@ -29,10 +48,13 @@ async def download_export(request: ExportRequest):
     - **pdf**: PDF report (for clinical, publication)
     - **vcf**: VCF format (for bioinformatics pipelines)
     - **xlsx**: Excel workbook (for enterprise use)
+
+    Send either the result as `data` or the `result_id` of a stored one.
     """
+    data = await _request_data(request)
     try:
         content, content_type, filename = export_service.export(
-            data=request.data,
+            data=data,
             format=request.format,
             filename=request.filename,
         )
@@ -51,6 +73,41 @@ async def download_export(request: ExportRequest):
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
 
+@router.get(
+    "/results/{result_id}",
+    summary="Download a stored result in specified format",
+)
+async def download_stored_result(
+    result_id: str,
+    format: ExportFormat = ExportFormat.JSON,
+    filename: str = Query(default="alphagenome_result", max_length=100),
+):
+    """
+    Export a result kept server-side, e.g. from the `export` links of a
+    variant prediction. Stored results expire after a while (404).
+    """
+    data = await load_result(result_id)
+    try:
+        content, content_type, filename = export_service.export(
+            data=data,
+            format=format,
+            filename=filename,
+        )
+
+        return Response(
+            content=content,
+            media_type=content_type,
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}",
+            },
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+
+
 @router.post(
     "/clipboard/{format}",
     summary="Get text for clipboard",
@@ -66,6 +123,8 @@ async def get_clipboard_text(
     - **markdown**: Formatted markdown text
     - **json**: Pretty-printed JSON
     - **tsv**: Tab-separated for pasting into spreadsheets
+
+    Send either the result as `data` or the `result_id` of a stored one.
     """
     if format not in ["markdown", "json", "tsv"]:
         raise HTTPException(
@@ -73,8 +132,9 @@ async def get_clipboard_text(
             detail=f"Invalid format for clipboard: {format}. Use 'markdown', 'json', or 'tsv'",
         )
 
+    data = await _request_data(request)
     try:
-        text = export_service.get_copyable_text(request.data, format)
+        text = export_service.get_copyable_text(data, format)
         return {"text": text, "format": format}
 
     except Exception as e:
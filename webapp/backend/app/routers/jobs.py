@@ -0,0 +1,157 @@
+"""
+Background Job Routes
+
+Long-running analyses (ISM, batch scoring) are submitted as jobs and
+polled for status, so they survive proxy timeouts and closed tabs.
+
+Jobs are only visible to the API key that submitted them.
+"""
+
+from fastapi import APIRouter, HTTPException, Depends
+from typing import Any
+import logging
+
+from ..models import (
+    ISMRequest,
+    BatchScoreRequest,
+    JobStatusResponse,
+    JobResultResponse,
+)
+from ..services.alphagenome_service import alphagenome_service
+from ..services.job_service import job_service, SUCCEEDED
+from ..services import matrix_transport
+from .predict import get_api_key
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
+
+
+# ============ Job runners ============
+
+async def _run_ism_job(api_key: str, params: dict[str, Any]) -> dict[str, Any]:
+    request = ISMRequest.model_validate(params)
+    result = await alphagenome_service.run_ism(
+        api_key=api_key,
+        chromosome=request.chromosome,
+        start=request.start,
+        end=request.end,
+        ism_width=request.ism_width,
+        scorer_type=request.scorer,
+        tissue=request.tissue,
+        sequence_length=request.sequence_length,
+        organism=request.organism,
+    )
+    return {
+        "interval": result["interval"],
+        **matrix_transport.encode_matrix_json(result["ism_matrix"], request.matrix_encoding),
+    }
+
+
+async def _run_score_batch_job(api_key: str, params: dict[str, Any]) -> dict[str, Any]:
+    request = BatchScoreRequest.model_validate(params)
+    results: list[dict[str, Any] | None] = [None] * len(request.variants)
+    summary: dict[str, Any] = {}
+
+    async for event in alphagenome_service.score_variants_stream(
+        api_key=api_key,
+        variants=request.variants,
+        scorers=request.scorers,
+        sequence_length=request.sequence_length,
+        organism=request.organism,
+        max_workers=request.max_workers,
+    ):
+        if event["event"] == "result":
+            record = {k: v for k, v in event.items() if k not in ("event", "indices")}
+            for index in event["indices"]:
+                results[index] = record
+        elif event["event"] == "end":
+            summary = {k: v for k, v in event.items() if k != "event"}
+
+    return {"summary": summary, "results": results}
+
+
+job_service.register("ism", _run_ism_job)
+job_service.register("score_batch", _run_score_batch_job)
+
+
+# ============ Endpoints ============
+
+def _status_response(job: dict[str, Any]) -> JobStatusResponse:
+    result_url = (
+        f"{router.prefix}/{job['job_id']}/result" if job["status"] == SUCCEEDED else None
+    )
+    return JobStatusResponse(**job, result_url=result_url)
+
+
+@router.post("/ism", response_model=JobStatusResponse, status_code=202)
+async def submit_ism_job(
+    request: ISMRequest,
+    api_key: str = Depends(get_api_key),
+):
+    """
+    Submit an In Silico Mutagenesis analysis as a background job.
+
+    Poll `GET /api/jobs/{job_id}` for progress and fetch the matrix from
+    `GET /api/jobs/{job_id}/result` once it has succeeded.
+
+    **Requires your own AlphaGenome API key.**
+    """
+    job = await job_service.submit(api_key, "ism", request.model_dump(mode="json"))
+    return _status_response(job)
+
+
+@router.post("/score-batch", response_model=JobStatusResponse, status_code=202)
+async def submit_score_batch_job(
+    request: BatchScoreRequest,
+    api_key: str = Depends(get_api_key),
+):
+    """
+    Submit batch variant scoring as a background job.
+
+    The result lists one entry per input variant, in input order.
+
+    **Requires your own AlphaGenome API key.**
+    """
+    job = await job_service.submit(api_key, "score_batch", request.model_dump(mode="json"))
+    return _status_response(job)
+
+
+@router.get("/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str, api_key: str = Depends(get_api_key)):
+    """Get the status of a job."""
+    job = await job_service.get(job_id, api_key)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _status_response(job)
+
+
+@router.get("/{job_id}/result", response_model=JobResultResponse)
+async def get_job_result(job_id: str, api_key: str = Depends(get_api_key)):
+    """Get the result of a succeeded job."""
+    found = await job_service.get_result(job_id, api_key)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    job, result = found
+    if job["status"] != SUCCEEDED:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "error": "Job has no result",
+                "status": job["status"],
+                "message": job["error"] or "Job has not finished yet",
+            },
+        )
+    return JobResultResponse(
+        job_id=job["job_id"], kind=job["kind"], status=job["status"], result=result
+    )
+
+
+@router.delete("/{job_id}", response_model=JobStatusResponse)
+async def cancel_job(job_id: str, api_key: str = Depends(get_api_key)):
+    """Cancel a queued or running job."""
+    job = await job_service.cancel(job_id, api_key)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _status_response(job)
@@ -5,14 +5,19 @@ All prediction endpoints require the user to provide their own API key
 in the X-API-Key header.
 """
 
-from fastapi import APIRouter, HTTPException, Header, Depends
-from typing import Annotated
+from fastapi import APIRouter, HTTPException, Header, Depends, File, Form, UploadFile
+from fastapi.responses import Response, StreamingResponse
+from typing import Annotated, Any, AsyncIterator
+import json
 import logging
+import math
 
 from ..models import (
     VariantPredictRequest,
     IntervalPredictRequest,
+    RegionPredictRequest,
     VariantScoreRequest,
+    BatchScoreRequest,
     ISMRequest,
     VariantPredictResponse,
     IntervalPredictResponse,
@@ -21,8 +26,16 @@ from ..models import (
     ErrorResponse,
     format_as_markdown,
     format_as_csv,
+    ScorerType,
+    SequenceLength,
+    Organism,
 )
+from ..config import get_settings
 from ..services.alphagenome_service import alphagenome_service
+from ..services.resilience import CircuitOpenError
+from ..services.result_store import export_links, result_store
+from ..services.vcf import parse_vcf_variants
+from ..services import matrix_transport, timing
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +67,18 @@ def get_api_key(x_api_key: Annotated[str | None, Header()] = None) -> str:
     return x_api_key
 
 
+def _upstream_unavailable(e: CircuitOpenError) -> HTTPException:
+    """503 for an upstream endpoint whose circuit breaker is open."""
+    return HTTPException(
+        status_code=503,
+        detail={
+            "error": "AlphaGenome temporarily unavailable",
+            "message": str(e),
+        },
+        headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+    )
+
+
 @router.post(
     "/variant",
     response_model=VariantPredictResponse,
@@ -79,6 +104,10 @@ async def predict_variant(
     **Requires your own AlphaGenome API key.**
 
     Example variant format: `chr22:36201698:A>C`
+
+    The result is kept server-side for a while; `export` links to it in
+    every export format. Set `include_exports` to embed JSON, Markdown
+    and CSV renderings in the response instead.
     """
     try:
         result = await alphagenome_service.predict_variant(
@@ -90,22 +119,34 @@ async def predict_variant(
             organism=request.organism,
         )
 
-        # Prepare export formats
-        export_data = result.model_dump()
-        export = {
-            "json": export_data,
-            "markdown": format_as_markdown(result),
-            "csv": format_as_csv(result.scores) if result.scores else "",
-        }
+        result_id = await result_store.put("variant", result)
+        if request.include_exports:
+            # Prepare export formats
+            with timing.phase("model_dump"):
+                export_data = result.model_dump()
+            with timing.phase("format_markdown"):
+                markdown = format_as_markdown(result)
+            with timing.phase("format_csv"):
+                csv = format_as_csv(result.scores) if result.scores else ""
+            export = {
+                "json": export_data,
+                "markdown": markdown,
+                "csv": csv,
+            }
+        else:
+            export = export_links(result_id, result_store.ttl_seconds)
 
         return VariantPredictResponse(
             success=True,
             data=result,
+            result_id=result_id,
             export=export,
         )
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except CircuitOpenError as e:
+        raise _upstream_unavailable(e)
     except Exception as e:
         logger.exception(f"Prediction failed: {e}")
         raise HTTPException(
@@ -131,6 +172,14 @@ async def predict_interval(
 
     Useful for exploring a region of the genome without a specific variant.
 
+    Each output includes its track `values` as a [bins, tracks] matrix,
+    binned server-side to `resolution` bp with `aggregation` (mean or max).
+    Use `track_filter` to keep only tracks matching metadata values.
+
+    At most `INTERVAL_MAX_BINS` bins per output are returned; read finer
+    views of large intervals from `/api/tiles`. Export formats are
+    linked from `export` by `result_id`.
+
     **Requires your own AlphaGenome API key.**
     """
     try:
@@ -142,21 +191,88 @@ async def predict_interval(
             outputs=request.outputs,
             tissues=request.tissues,
             organism=request.organism,
+            resolution=request.resolution,
+            aggregation=request.aggregation,
+            track_filter=request.track_filter,
         )
 
+        result_id = await result_store.put("interval", result)
         return IntervalPredictResponse(
             success=True,
             data=result,
-            export={"json": result},
+            result_id=result_id,
+            export=export_links(result_id, result_store.ttl_seconds),
         )
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except CircuitOpenError as e:
+        raise _upstream_unavailable(e)
     except Exception as e:
         logger.exception(f"Interval prediction failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post(
+    "/region",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def predict_region(
+    request: RegionPredictRequest,
+    api_key: str = Depends(get_api_key),
+):
+    """
+    Predict a region larger than the model window.
+
+    The region is split into overlapping `sequence_length` windows that
+    run concurrently; each keeps only its central part and the parts are
+    streamed in genomic order as newline-delimited JSON:
+
+    - `{"event": "start", "windows": N, ...}`
+    - `{"event": "chunk", "index": i, "start": ..., "end": ..., "outputs": {...}}`
+      with each output binned like `/api/predict/interval`; concatenating
+      the chunks' `values` gives one contiguous [bins, tracks] array
+    - `{"event": "error", "index": i, ...}` for a window that failed
+    - `{"event": "end", "completed": ..., "failed": ...}`
+
+    **Requires your own AlphaGenome API key.**
+    """
+    max_length = get_settings().region_max_length
+    if request.end - request.start > max_length:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Region too large: {request.end - request.start}bp (maximum {max_length}bp)",
+        )
+
+    events = alphagenome_service.predict_region_stream(
+        api_key=api_key,
+        chromosome=request.chromosome,
+        start=request.start,
+        end=request.end,
+        outputs=request.outputs,
+        tissues=request.tissues,
+        organism=request.organism,
+        sequence_length=request.sequence_length,
+        overlap=request.overlap,
+        resolution=request.resolution,
+        aggregation=request.aggregation,
+        track_filter=request.track_filter,
+    )
+    try:
+        # Plan the windows up front so bad parameters fail with a 400
+        first = await events.__anext__()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def stream() -> AsyncIterator[dict[str, Any]]:
+        yield first
+        async for event in events:
+            yield event
+
+    return StreamingResponse(_ndjson(stream()), media_type="application/x-ndjson")
+
+
 @router.post(
     "/score",
     response_model=ScoreResponse,
@@ -182,32 +298,165 @@ async def score_variant(
         )
 
         # Convert to dict for export
-        scores_dict = [s.model_dump() for s in scores]
+        with timing.phase("model_dump"):
+            scores_dict = [s.model_dump() for s in scores]
+        with timing.phase("format_csv"):
+            csv = format_as_csv(scores)
+
+        result_id = await result_store.put(
+            "score", {"variant": request.variant, "scores": scores}
+        )
 
         return ScoreResponse(
             success=True,
             variant=request.variant,
+            result_id=result_id,
             scores=scores,
             total_genes=len(set(s.gene_name for s in scores)),
             total_tracks=len(scores),
             export={
                 "json": scores_dict,
-                "csv": format_as_csv(scores),
+                "csv": csv,
             },
         )
 
+    except CircuitOpenError as e:
+        raise _upstream_unavailable(e)
     except Exception as e:
         logger.exception(f"Scoring failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _ndjson(
+    events: AsyncIterator[dict[str, Any]],
+    start_extra: dict[str, Any] | None = None,
+) -> AsyncIterator[bytes]:
+    """Encode a stream of events as newline-delimited JSON."""
+    async for event in events:
+        if start_extra and event.get("event") == "start":
+            event = {**event, **start_extra}
+        yield (json.dumps(event, default=str) + "\n").encode("utf-8")
+
+
+def _batch_response(
+    api_key: str,
+    variants: list[str],
+    scorers: list[ScorerType],
+    sequence_length: SequenceLength,
+    organism: Organism,
+    max_workers: int,
+    start_extra: dict[str, Any] | None = None,
+) -> StreamingResponse:
+    max_variants = get_settings().batch_score_max_variants
+    if len(variants) > max_variants:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many variants: {len(variants)} (maximum {max_variants})",
+        )
+
+    events = alphagenome_service.score_variants_stream(
+        api_key=api_key,
+        variants=variants,
+        scorers=scorers,
+        sequence_length=sequence_length,
+        organism=organism,
+        max_workers=max_workers,
+    )
+    return StreamingResponse(
+        _ndjson(events, start_extra),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.post(
+    "/score/batch",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def score_variants_batch(
+    request: BatchScoreRequest,
+    api_key: str = Depends(get_api_key),
+):
+    """
+    Score many variants in one request.
+
+    Results stream back as NDJSON in completion order, one line per
+    unique variant. Each line carries `indices` (positions in the input
+    list) so the original order can be rebuilt. Duplicate variants are
+    scored once and already-cached variants are returned first.
+
+    **Requires your own AlphaGenome API key.**
+    """
+    return _batch_response(
+        api_key,
+        request.variants,
+        request.scorers,
+        request.sequence_length,
+        request.organism,
+        request.max_workers,
+    )
+
+
+@router.post(
+    "/score/batch/vcf",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def score_vcf_batch(
+    file: UploadFile = File(..., description="VCF file (plain text)"),
+    scorers: list[ScorerType] = Form(default=[ScorerType.RNA_SEQ]),
+    sequence_length: SequenceLength = Form(default=SequenceLength.LENGTH_1MB),
+    organism: Organism = Form(default=Organism.HUMAN),
+    max_workers: int = Form(default=5, ge=1, le=20),
+    api_key: str = Depends(get_api_key),
+):
+    """
+    Score every variant in an uploaded VCF.
+
+    Same NDJSON stream as `/score/batch`; `indices` refer to the order
+    of ALT alleles in the file. Symbolic alleles and unsupported contigs
+    are skipped and counted in the first line.
+
+    **Requires your own AlphaGenome API key.**
+    """
+    try:
+        text = (await file.read()).decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="VCF must be UTF-8 text")
+
+    variants, skipped = parse_vcf_variants(text.splitlines())
+    if not variants:
+        raise HTTPException(status_code=400, detail="No scorable variants found in VCF")
+
+    return _batch_response(
+        api_key,
+        variants,
+        scorers,
+        sequence_length,
+        organism,
+        max_workers,
+        start_extra={"skipped_records": skipped},
+    )
+
+
 @router.post(
     "/ism",
     response_model=ISMResponse,
+    responses={
+        200: {
+            "content": {
+                matrix_transport.NPY_MEDIA_TYPE: {},
+                matrix_transport.ARROW_MEDIA_TYPE: {},
+            },
+            "description": "ISM matrix as JSON, a .npy file or an Arrow IPC stream",
+        },
+        406: {"model": ErrorResponse, "description": "Arrow requested but pyarrow is not installed"},
+    },
 )
 async def run_ism(
     request: ISMRequest,
     api_key: str = Depends(get_api_key),
+    accept: Annotated[str | None, Header()] = None,
 ):
     """
     Run In Silico Mutagenesis (ISM) analysis.
@@ -215,10 +464,32 @@ async def run_ism(
     Systematically mutates every position in a region to identify
     functionally important bases.
 
+    The matrix format follows the `Accept` header:
+    - `application/json` (default): `ism_matrix` as nested lists, or
+      `ism_matrix_b64` with `matrix_encoding="base64"`
+    - `application/x-npy`: a float32 NumPy .npy file
+    - `application/vnd.apache.arrow.stream`: an Arrow IPC stream with one
+      fixed-size list column of 4 floats (A, C, G, T) per position
+
+    Binary responses carry the interval in the `X-ISM-Interval` header
+    and the stored result's ID in `X-Result-Id`.
+
     **Note:** This can take several minutes depending on the region size.
+    For large `ism_width`, submit it as a background job via
+    `POST /api/jobs/ism` instead to avoid proxy timeouts.
 
     **Requires your own AlphaGenome API key.**
     """
+    media_type = matrix_transport.negotiate_media_type(accept)
+    if media_type == matrix_transport.ARROW_MEDIA_TYPE:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(
+                status_code=406,
+                detail="Arrow output requires pyarrow. Install with: pip install pyarrow",
+            )
+
     try:
         result = await alphagenome_service.run_ism(
             api_key=api_key,
@@ -231,14 +502,50 @@ async def run_ism(
             sequence_length=request.sequence_length,
             organism=request.organism,
         )
-
-        return ISMResponse(
-            success=True,
-            interval=result["interval"],
-            ism_matrix=result["ism_matrix"],
-            export={"json": result},
-        )
-
+    except CircuitOpenError as e:
+        raise _upstream_unavailable(e)
     except Exception as e:
         logger.exception(f"ISM failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+    interval = result["interval"]
+    matrix = matrix_transport.as_float32(result["ism_matrix"])
+    # The matrix itself is stored; exports turn it into lists when read
+    result_id = await result_store.put(
+        "ism", {"interval": interval, "ism_matrix": matrix, "shape": list(matrix.shape)}
+    )
+    if media_type != matrix_transport.JSON_MEDIA_TYPE:
+        return _ism_binary_response(media_type, interval, matrix, result_id)
+
+    payload = {
+        "interval": interval,
+        **matrix_transport.encode_matrix_json(matrix, request.matrix_encoding),
+    }
+    return ISMResponse(
+        success=True,
+        **payload,
+        result_id=result_id,
+        export=export_links(result_id, result_store.ttl_seconds),
+    )
+
+
+def _ism_binary_response(
+    media_type: str, interval: dict[str, Any], matrix: Any, result_id: str
+) -> Response:
+    """Serve the ISM matrix as .npy or Arrow IPC without a JSON round-trip."""
+    interval_text = f"{interval['chromosome']}:{interval['start']}-{interval['end']}"
+    headers = {"X-ISM-Interval": interval_text, "X-Result-Id": result_id}
+
+    if media_type == matrix_transport.NPY_MEDIA_TYPE:
+        chunks = matrix_transport.npy_chunks(matrix)
+        headers["Content-Length"] = str(sum(len(chunk) for chunk in chunks))
+        headers["Content-Disposition"] = 'attachment; filename="ism_matrix.npy"'
+
+        async def body() -> AsyncIterator[bytes | memoryview]:
+            for chunk in chunks:
+                yield chunk
+
+        return StreamingResponse(body(), media_type=media_type, headers=headers)
+
+    content = matrix_transport.arrow_stream(matrix, metadata={"interval": interval_text})
+    return Response(content=content, media_type=media_type, headers=headers)
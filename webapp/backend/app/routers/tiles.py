@@ -0,0 +1,133 @@
+"""
+Tile Routes
+
+Zoom-level tiles of predicted tracks for genome-browser panning. Tiles
+are built from earlier interval predictions and served from the local
+tile pyramid without calling AlphaGenome again.
+"""
+
+from fastapi import APIRouter, HTTPException, Header, Depends
+from fastapi.responses import Response
+from typing import Annotated
+import asyncio
+import logging
+
+import numpy as np
+
+from ..models import Organism, OutputType
+from ..services.alphagenome_service import alphagenome_service
+from ..services import matrix_transport
+from ..services.tile_store import is_known_chromosome
+from .predict import get_api_key
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/tiles", tags=["Tiles"])
+
+
+def _tile_store():
+    if alphagenome_service.tile_store is None:
+        raise HTTPException(status_code=503, detail="Tile store is disabled")
+    return alphagenome_service.tile_store
+
+
+@router.get("/info")
+async def get_tile_info():
+    """Tile size and zoom levels (bp per bin) of the tile pyramid."""
+    store = _tile_store()
+    return {
+        "tile_bins": store.tile_bins,
+        "zoom_levels": store.zoom_levels,
+        "url_template": (
+            f"{router.prefix}/{{organism}}/{{chromosome}}/{{output}}/"
+            "{ontology}/{resolution}/{tile}"
+        ),
+    }
+
+
+@router.get(
+    "/{organism}/{chromosome}/{output}/{ontology}/{resolution}/{tile}",
+    responses={
+        200: {
+            "content": {matrix_transport.NPY_MEDIA_TYPE: {}},
+            "description": "Tile as JSON or a float32 .npy file",
+        },
+        404: {"description": "Tile not built yet; run an interval prediction covering it"},
+    },
+)
+async def get_tile(
+    organism: Organism,
+    chromosome: str,
+    output: OutputType,
+    ontology: str,
+    resolution: int,
+    tile: int,
+    api_key: str = Depends(get_api_key),
+    accept: Annotated[str | None, Header()] = None,
+):
+    """
+    Get one zoom-level tile of predicted track values.
+
+    A tile at `resolution` bp per bin covers
+    `[tile * resolution * tile_bins, (tile + 1) * resolution * tile_bins)`.
+    Values are `[tile_bins, tracks]`; bins not yet covered by a prediction
+    are `null` (JSON) or NaN (`Accept: application/x-npy`).
+
+    Tiles are filled by `POST /api/predict/interval`; this endpoint never
+    calls AlphaGenome. Tile GETs draw from their own rate-limit bucket
+    (`RATE_LIMIT_TILES_PER_MINUTE`), not the per-minute request bucket.
+
+    **Requires your own AlphaGenome API key.**
+    """
+    store = _tile_store()
+    if resolution not in store.zoom_levels or tile < 0:
+        raise HTTPException(
+            status_code=400,
+            detail=f"resolution must be one of {store.zoom_levels} and tile >= 0",
+        )
+    if not is_known_chromosome(organism.value, chromosome):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown chromosome for {organism.value}: {chromosome}",
+        )
+
+    try:
+        # Blocking file I/O (and a directory scan on first use)
+        found = await asyncio.to_thread(
+            store.read_tile, organism.value, chromosome, output.value, ontology, resolution, tile
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if found is None:
+        raise HTTPException(status_code=404, detail="Tile not built yet")
+
+    values, tracks = found
+    start, end = store.tile_bounds(resolution, tile)
+    covered = ~np.isnan(values).all(axis=1)
+
+    if matrix_transport.negotiate_media_type(accept) == matrix_transport.NPY_MEDIA_TYPE:
+        return Response(
+            content=b"".join(matrix_transport.npy_chunks(values)),
+            media_type=matrix_transport.NPY_MEDIA_TYPE,
+            headers={
+                "X-Tile-Interval": f"{chromosome}:{start}-{end}",
+                "X-Tile-Coverage": f"{covered.mean():.4f}",
+            },
+        )
+
+    rows = values.tolist()
+    for i in np.flatnonzero(~covered).tolist():
+        rows[i] = None
+    return {
+        "organism": organism.value,
+        "chromosome": chromosome,
+        "output": output.value,
+        "ontology": ontology,
+        "resolution": resolution,
+        "tile": tile,
+        "start": start,
+        "end": end,
+        "coverage": float(covered.mean()),
+        "tracks": tracks,
+        "values": rows,
+    }
@@ -8,14 +8,23 @@ IMPORTANT: The API key is provided by the user per-request,
 NOT stored on the server.
 """
 
+import asyncio
+import copy
+import itertools
 import logging
-from typing import Any
+import math
+import time
+from collections import deque
+from contextlib import AbstractContextManager
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar
 from datetime import datetime
 
+import numpy as np
 from alphagenome.data import genome
 from alphagenome.models import dna_client, variant_scorers
 from alphagenome.interpretation import ism
 
+from ..config import get_settings
 from ..models import (
     OutputType,
     SequenceLength,
@@ -27,9 +36,147 @@ from ..models import (
     TrackData,
     TrackMetadata,
 )
+from . import result_codec
+from .client_pool import ClientPool, fingerprint_api_key
+from .coalescer import RequestCoalescer
+from .fake_dna_client import FakeDnaClient
+from .interval_index import IntervalIndex
+from .ism_checkpoints import ISMCheckpointStore, shard_key
+from .metrics import UPSTREAM_CALL_SECONDS
+from .region_planner import NATIVE_ROW_ALIGN, RegionWindow, plan_windows
+from .rate_limiter import record_cache_hit
+from .resilience import ResilientCaller
+from . import timing
+from .result_cache import ResultCache, cache_key
+from .score_conversion import gene_scores_from_tidy, impact_level
+from .tile_store import TileStore
+from .tracks import DEFAULT_RESOLUTION, check_bins, effective_resolution, render_output
+from .upstream_executor import UpstreamExecutor
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+def _client_factory(settings: Any) -> Callable[[str], Any]:
+    """DnaClient factory for the configured backend."""
+    if settings.alphagenome_backend == "fake":
+        logger.warning("Using the FAKE AlphaGenome backend: predictions are synthetic")
+        return lambda api_key: FakeDnaClient(
+            seed=settings.fake_seed,
+            latency_ms=settings.fake_latency_ms,
+            latency_distribution=settings.fake_latency_distribution,
+            latency_sigma=settings.fake_latency_sigma,
+        )
+    if settings.alphagenome_backend != "remote":
+        raise ValueError(f"Unknown ALPHAGENOME_BACKEND: {settings.alphagenome_backend}")
+    return dna_client.create
+
+
+def _elapsed_ms(started: float) -> float:
+    """Milliseconds since a `time.perf_counter()` reading."""
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def _mark_cache_hit(result: PredictionResult) -> PredictionResult:
+    """Drop the original computation's timings from a cached prediction."""
+    result.metadata.pop("timings_ms", None)
+    result.metadata["cache_hit"] = True
+    return result
+
+
+def _batch_result(
+    variant_str: str,
+    indices: list[int],
+    scores: list[GeneScore],
+    cached: bool = False,
+) -> dict[str, Any]:
+    """One NDJSON record of a batch scoring stream."""
+    return {
+        "event": "result",
+        "indices": indices,
+        "variant": variant_str,
+        "success": True,
+        "cached": cached,
+        "total_genes": len(set(s.gene_name for s in scores)),
+        "scores": [s.model_dump() for s in scores],
+    }
+
+
+def _ism_tissue_scores(variant_scores: list[list[Any]], tissue: str) -> np.ndarray:
+    """
+    Gather one tissue's score from every ISM variant into a single array.
+
+    All ISM AnnData objects share the same track metadata, so the tissue
+    column is resolved once from the first one. Variants score 0.0 when
+    the tissue has no track.
+    """
+    scores = np.zeros(len(variant_scores), dtype=np.float32)
+    if not variant_scores:
+        return scores
+
+    var = variant_scores[0][0].var
+    if "ontology_curie" not in var.columns:
+        return scores
+    matches = np.flatnonzero(var["ontology_curie"].to_numpy() == tissue)
+    if matches.size == 0:
+        return scores
+
+    column = int(matches[0])
+    for i, per_scorer in enumerate(variant_scores):
+        scores[i] = per_scorer[0].X[0, column]
+    return scores
+
+
+def _keep_rows(raw: dict[str, Any], w: RegionWindow) -> dict[str, Any]:
+    """Restrict a raw window output to the window's kept (central) part."""
+    values = raw.get("values")
+    if values is None:
+        return raw
+    native = raw.get("resolution", 1)
+    first = w.keep_offset // native
+    last = first + -(-(w.keep_end - w.keep_start) // native)
+    kept = values[first:last]
+    return {**raw, "values": kept, "shape": list(kept.shape)}
+
+
+def _sliceable(raw: dict[str, Any]) -> bool:
+    """Whether every output of a raw interval prediction has positional values."""
+    return all(output.get("values") is not None for output in raw["outputs"].values())
+
+
+def _slice_interval(wide: dict[str, Any], start: int, end: int) -> dict[str, Any] | None:
+    """
+    Cut [start, end) out of a raw interval prediction that contains it.
+
+    Rows are taken at the cached window's positions, exactly as if the
+    window had been predicted and then cropped. Returns None when the cut
+    would split a native bin (e.g. a 128bp ChIP bin) or an output has no
+    positional values.
+    """
+    window = wide["interval"]
+    offset = start - window["start"]
+    outputs: dict[str, Any] = {}
+    for name, raw in wide["outputs"].items():
+        values = raw.get("values")
+        native = raw.get("resolution", 1)
+        if values is None or offset % native:
+            return None
+        first = offset // native
+        kept = values[first:first + -(-(end - start) // native)]
+        outputs[name] = {**raw, "values": kept, "shape": list(kept.shape)}
+
+    return {
+        "interval": {"chromosome": window["chromosome"], "start": start, "end": end},
+        "outputs": outputs,
+        "sliced_from": window,
+    }
+
+
+def _slice_packed_interval(blob: bytes, start: int, end: int) -> dict[str, Any] | None:
+    """`_slice_interval` of a cached, packed prediction (CPU-bound)."""
+    return _slice_interval(result_codec.unpack(blob), start, end)
+
 
 # Mapping from our enums to AlphaGenome's
 OUTPUT_TYPE_MAP = {
@@ -66,6 +213,9 @@ SCORER_MAP = {
     ScorerType.CONTACT_MAP: "CONTACT_MAP",
 }
 
+# Tile ingests (each holding a full-resolution prediction) allowed in flight
+TILE_INGEST_MAX_PENDING = 4
+
 
 class AlphaGenomeService:
     """
@@ -76,18 +226,196 @@ class AlphaGenomeService:
     """
 
     def __init__(self):
-        """Initialize service (no persistent state)."""
-        self._clients: dict[str, dna_client.DnaClient] = {}
+        """Initialize service with a pool of reusable clients."""
+        settings = get_settings()
+        self.client_pool = ClientPool(
+            max_size=settings.client_pool_max_size,
+            idle_ttl_seconds=settings.client_pool_idle_ttl_seconds,
+            factory=_client_factory(settings),
+        )
+        self.executor = UpstreamExecutor(
+            max_workers=settings.upstream_max_workers,
+            endpoint_limits=settings.upstream_concurrency,
+        )
+        self.resilience = ResilientCaller(
+            attempt_timeout=settings.upstream_attempt_timeout_seconds,
+            max_attempts=settings.upstream_retry_attempts,
+            base_delay=settings.upstream_retry_base_delay_seconds,
+            max_delay=settings.upstream_retry_max_delay_seconds,
+            hedge_methods=settings.upstream_hedge_methods,
+            hedge_percentile=settings.upstream_hedge_percentile,
+            hedge_min_samples=settings.upstream_hedge_min_samples,
+            breaker_failure_threshold=settings.upstream_breaker_failure_threshold,
+            breaker_reset_seconds=settings.upstream_breaker_reset_seconds,
+        )
+        self.result_cache = ResultCache(
+            redis_url=settings.redis_url,
+            ttl_seconds=settings.cache_ttl_seconds,
+            max_memory_entries=settings.result_cache_max_entries,
+            max_memory_bytes=settings.result_cache_max_bytes,
+            max_entry_bytes=settings.result_cache_max_entry_bytes,
+        )
+        self.coalescer = RequestCoalescer()
+        self.interval_index = IntervalIndex(max_entries=settings.result_cache_max_entries)
+        self.ism_checkpoints = ISMCheckpointStore(
+            directory=settings.ism_checkpoint_dir,
+            ttl_seconds=settings.ism_checkpoint_ttl_seconds,
+        )
+        self.tile_store = (
+            TileStore(
+                directory=settings.tile_store_dir,
+                tile_bins=settings.tile_bins,
+                zoom_levels=settings.tile_zoom_levels,
+                max_bytes=settings.tile_store_max_bytes,
+                ttl_seconds=settings.tile_store_ttl_seconds,
+            )
+            if settings.tile_store_enabled
+            else None
+        )
+        # Background tile ingests; beyond TILE_INGEST_MAX_PENDING new
+        # predictions are not added to the pyramid
+        self._tile_ingests: set[asyncio.Task] = set()
+        self.tile_ingests_skipped = 0
+        self.ism_shard_width = settings.ism_shard_width
+        self.ism_shard_concurrency = settings.ism_shard_concurrency
+
+    def _get_client(self, api_key: str) -> AbstractContextManager[dna_client.DnaClient]:
+        """
+        Lease a pooled AlphaGenome client for the given API key.
+
+        Clients are keyed by a hash of the key, never the raw key, and
+        are evicted after sitting idle for the configured TTL; a client
+        is never closed while a lease on it is outstanding.
+        """
+        return self.client_pool.lease(api_key)
+
+    async def _call(self, api_key: str, method: str, **kwargs: Any) -> Any:
+        """
+        Run a blocking DnaClient method in the upstream executor.
 
-    def _get_client(self, api_key: str) -> dna_client.DnaClient:
+        The method name doubles as the endpoint used for concurrency
+        caps, so e.g. ISM jobs cannot starve variant predictions, and for
+        the retry/hedging/circuit-breaker policy.
         """
-        Get or create an AlphaGenome client for the given API key.
 
-        In production, consider caching clients with TTL.
+        def invoke():
+            with self._get_client(api_key) as client:
+                return getattr(client, method)(**kwargs)
+
+        async def attempt():
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                result = await self.executor.run(method, invoke)
+                outcome = "ok"
+                return result
+            except asyncio.CancelledError:
+                outcome = "cancelled"
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                UPSTREAM_CALL_SECONDS.observe(elapsed, method, outcome)
+                timing.record(f"upstream_{method}", elapsed * 1000)
+
+        return await self.resilience.call(method, attempt)
+
+    async def _timed_call(
+        self,
+        api_key: str,
+        method: str,
+        timeout: float,
+        timings: dict[str, float],
+        **kwargs: Any,
+    ) -> Any:
+        """`_call` with a timeout, recording elapsed ms under `method`."""
+        started = time.perf_counter()
+        try:
+            return await asyncio.wait_for(
+                self._call(api_key, method, **kwargs), timeout
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"{method} timed out after {timeout:g}s") from None
+        finally:
+            timings[method] = _elapsed_ms(started)
+
+    async def _cached(
+        self,
+        api_key: str,
+        kind: str,
+        params: dict[str, Any],
+        compute: Callable[[], Awaitable[tuple[T, bool]]],
+        encode: Callable[[T], bytes],
+        decode: Callable[[bytes], T],
+        on_hit: Callable[[T], T] | None = None,
+        cost: float = 1,
+    ) -> T:
         """
-        # For simplicity, create a new client each time
-        # In production, you might cache with a short TTL
-        return dna_client.create(api_key)
+        Serve a result from the cache or compute and store it.
+
+        On a miss, identical concurrent requests share one upstream call.
+        The API key fingerprint is part of the coalescing key so one
+        user's invalid key never fails another user's request.
+
+        `compute` returns (value, cacheable); partial results (e.g. a
+        prediction whose scoring failed) are returned but not stored.
+        `on_hit` adjusts a freshly decoded cache hit (e.g. to drop
+        per-computation metadata) before it is returned. `cost` is the
+        upstream predictions a hit saves; it is refunded to the caller's
+        rate limit.
+        Encoding and decoding run in a thread: full-resolution tracks take
+        long enough to stall every other request on the loop.
+        """
+        key = cache_key(kind, params)
+        with timing.phase("cache_get"):
+            blob = await self.result_cache.get(key)
+        if blob is not None:
+            try:
+                with timing.phase("cache_decode"):
+                    value = await asyncio.to_thread(decode, blob)
+                record_cache_hit(cost)
+                return on_hit(value) if on_hit is not None else value
+            except Exception as e:
+                logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+
+        async def compute_and_store() -> T:
+            value, cacheable = await compute()
+            if cacheable:
+                with timing.phase("cache_set"):
+                    await self.result_cache.set(key, await asyncio.to_thread(encode, value))
+            return value
+
+        flight_key = f"{key}:{fingerprint_api_key(api_key)}"
+        return await self.coalescer.run(flight_key, compute_and_store)
+
+    async def close(self) -> None:
+        """Release pooled clients, worker threads and cache connections."""
+        # Let tile writes in progress finish rather than leave partial tiles
+        await asyncio.gather(*self._tile_ingests, return_exceptions=True)
+        self.client_pool.close()
+        self.executor.shutdown()
+        await self.result_cache.close()
+
+    def stats(self) -> dict[str, Any]:
+        """Runtime counters for the service."""
+        return {
+            "backend": get_settings().alphagenome_backend,
+            "client_pool": self.client_pool.stats(),
+            "upstream": self.executor.stats(),
+            "resilience": self.resilience.stats(),
+            "result_cache": self.result_cache.stats(),
+            "coalescing": self.coalescer.stats(),
+            "interval_slicing": self.interval_index.stats(),
+            "ism_checkpoints": self.ism_checkpoints.stats(),
+            "tiles": (
+                {
+                    **self.tile_store.stats(),
+                    "ingests_pending": len(self._tile_ingests),
+                    "ingests_skipped": self.tile_ingests_skipped,
+                }
+                if self.tile_store
+                else None
+            ),
+        }
 
     def _parse_variant(self, variant_str: str) -> genome.Variant:
         """Parse variant string into Variant object."""
@@ -106,40 +434,6 @@ class AlphaGenomeService:
             alternate_bases=alt,
         )
 
-    def _interpret_score(self, raw_score: float, quantile: float) -> str:
-        """Generate human-readable interpretation of score."""
-        if abs(raw_score) < 0.01:
-            return "No significant effect"
-
-        direction = "increase" if raw_score > 0 else "decrease"
-
-        if quantile > 0.95:
-            strength = "Strong"
-        elif quantile > 0.80:
-            strength = "Moderate"
-        elif quantile > 0.60:
-            strength = "Weak"
-        else:
-            strength = "Minimal"
-
-        return f"{strength} {direction}"
-
-    def _determine_impact_level(self, scores: list[GeneScore]) -> str:
-        """Determine overall impact level from scores."""
-        if not scores:
-            return "MODIFIER"
-
-        max_quantile = max(s.quantile_score for s in scores)
-
-        if max_quantile > 0.95:
-            return "HIGH"
-        elif max_quantile > 0.80:
-            return "MODERATE"
-        elif max_quantile > 0.60:
-            return "LOW"
-        else:
-            return "MODIFIER"
-
     async def predict_variant(
         self,
         api_key: str,
@@ -163,10 +457,51 @@ class AlphaGenomeService:
         Returns:
             PredictionResult with tracks and scores
         """
-        logger.info(f"Predicting variant: {variant_str}")
+        params = {
+            "variant": variant_str,
+            "outputs": sorted(o.value for o in outputs),
+            "tissues": sorted(tissues),
+            "sequence_length": sequence_length.value,
+            "organism": organism.value,
+        }
+        result = await self._cached(
+            api_key,
+            "predict_variant",
+            params,
+            lambda: self._predict_variant_upstream(
+                api_key, variant_str, outputs, tissues, sequence_length, organism
+            ),
+            result_codec.encode_prediction,
+            result_codec.decode_prediction,
+            on_hit=_mark_cache_hit,
+            cost=2,  # prediction + scoring
+        )
+        # Echo this request's parameters, not the ones that filled the cache.
+        # Copy first: coalesced requests share the same result object, and
+        # model_copy is shallow, so metadata gets its own copy too.
+        request_params = {
+            **result.request_params,
+            "outputs": [o.value for o in outputs],
+            "tissues": tissues,
+        }
+        return result.model_copy(
+            update={
+                "request_params": request_params,
+                "metadata": copy.deepcopy(result.metadata),
+            }
+        )
 
-        # Get client with user's API key
-        client = self._get_client(api_key)
+    async def _predict_variant_upstream(
+        self,
+        api_key: str,
+        variant_str: str,
+        outputs: list[OutputType],
+        tissues: list[str],
+        sequence_length: SequenceLength,
+        organism: Organism,
+    ) -> tuple[PredictionResult, bool]:
+        """Uncached variant prediction; returns (result, cacheable)."""
+        logger.info(f"Predicting variant: {variant_str}")
 
         # Parse variant
         variant = self._parse_variant(variant_str)
@@ -179,61 +514,84 @@ class AlphaGenomeService:
         ag_outputs = [OUTPUT_TYPE_MAP[o] for o in outputs]
         ag_organism = ORGANISM_MAP[organism]
 
-        # Make prediction
-        variant_output = client.predict_variant(
-            interval=interval,
-            variant=variant,
-            requested_outputs=ag_outputs,
-            ontology_terms=tissues,
-            organism=ag_organism,
-        )
+        settings = get_settings()
+        timings: dict[str, float] = {}
+        started = time.perf_counter()
 
-        # Also get scores
+        # Prediction and scoring are independent upstream calls, so they
+        # run concurrently; each has its own timeout.
         scorer = variant_scorers.RECOMMENDED_VARIANT_SCORERS.get("RNA_SEQ")
-        scores_list = []
-
+        calls = [
+            self._timed_call(
+                api_key,
+                "predict_variant",
+                settings.predict_timeout_seconds,
+                timings,
+                interval=interval,
+                variant=variant,
+                requested_outputs=ag_outputs,
+                ontology_terms=tissues,
+                organism=ag_organism,
+            )
+        ]
         if scorer:
-            try:
-                score_result = client.score_variant(
+            calls.append(
+                self._timed_call(
+                    api_key,
+                    "score_variant",
+                    settings.score_timeout_seconds,
+                    timings,
                     interval=interval,
                     variant=variant,
                     variant_scorers=[scorer],
                     organism=ag_organism,
                 )
+            )
+        outcomes = await asyncio.gather(*calls, return_exceptions=True)
 
-                if score_result:
-                    scores_df = variant_scorers.tidy_scores(
-                        score_result, match_gene_strand=True
-                    )
+        # A failed prediction fails the request; a failed scoring does not.
+        if isinstance(outcomes[0], BaseException):
+            raise outcomes[0]
+
+        scores_list = []
+        scores_error = None
+
+        if scorer:
+            score_result = outcomes[1]
+            try:
+                if isinstance(score_result, BaseException):
+                    raise score_result
 
-                    # Convert to our format
-                    for _, row in scores_df.head(50).iterrows():
-                        gene_score = GeneScore(
-                            gene_id=row.get("gene_id", ""),
-                            gene_name=row.get("gene_name", "Unknown"),
-                            strand=row.get("strand", "."),
-                            raw_score=float(row.get("raw_score", 0)),
-                            quantile_score=float(row.get("quantile_score", 0)),
-                            tissue=row.get("ontology_curie", tissues[0] if tissues else ""),
-                            interpretation=self._interpret_score(
-                                float(row.get("raw_score", 0)),
-                                float(row.get("quantile_score", 0)),
-                            ),
+                if score_result:
+                    tidy_started = time.perf_counter()
+                    with timing.phase("tidy_scores"):
+                        scores_df = variant_scorers.tidy_scores(
+                            score_result, match_gene_strand=True
+                        )
+                    with timing.phase("gene_scores"):
+                        scores_list = gene_scores_from_tidy(
+                            scores_df,
+                            default_tissue=tissues[0] if tissues else "",
+                            top_k=50,
                         )
-                        scores_list.append(gene_score)
+                    timings["tidy_scores"] = _elapsed_ms(tidy_started)
             except Exception as e:
+                scores_error = str(e) or type(e).__name__
                 logger.warning(f"Could not get scores: {e}")
 
-        # Build summary
+        # Build summary (scores are ordered by |raw_score|, largest first)
         affected_genes = list(set(s.gene_name for s in scores_list[:5]))
         top_effect = ""
         if scores_list:
-            top = max(scores_list, key=lambda x: abs(x.raw_score))
+            top = scores_list[0]
             top_effect = f"{top.interpretation} in {top.gene_name} ({top.tissue})"
 
+        quantiles = np.fromiter(
+            (s.quantile_score for s in scores_list), dtype=np.float64, count=len(scores_list)
+        )
         summary = VariantSummary(
             variant=variant_str,
-            impact_level=self._determine_impact_level(scores_list),
+            impact_level=impact_level(quantiles),
             affected_genes=affected_genes,
             top_effect=top_effect,
             confidence=0.85,  # Could be calculated from model
@@ -253,8 +611,13 @@ class AlphaGenomeService:
             scores=scores_list,
             tracks={},  # Tracks would be serialized here
         )
+        timings["total"] = _elapsed_ms(started)
+        result.metadata["timings_ms"] = timings
+        result.metadata["cache_hit"] = False
+        if scores_error:
+            result.metadata["scores_error"] = scores_error
 
-        return result
+        return result, scores_error is None
 
     async def predict_interval(
         self,
@@ -265,11 +628,232 @@ class AlphaGenomeService:
         outputs: list[OutputType],
         tissues: list[str],
         organism: Organism,
+        resolution: int = DEFAULT_RESOLUTION,
+        aggregation: str = "mean",
+        track_filter: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
-        """Predict for a genomic interval."""
-        logger.info(f"Predicting interval: {chromosome}:{start}-{end}")
+        """
+        Predict for a genomic interval.
+
+        The raw full-resolution arrays are cached; binning to `resolution`
+        and track selection with `track_filter` are applied per request,
+        so every resolution of a region shares one upstream call.
 
-        client = self._get_client(api_key)
+        Raises:
+            ValueError: If the interval has more than
+                `Settings.interval_max_bins` bins at `resolution`
+        """
+        check_bins(end - start, resolution, get_settings().interval_max_bins)
+        raw = await self._predict_interval_raw(
+            api_key, chromosome, start, end, outputs, tissues, organism
+        )
+        with timing.phase("render_tracks"):
+            result = {
+                "interval": raw["interval"],
+                "outputs": {
+                    name: render_output(output, resolution, aggregation, track_filter)
+                    for name, output in raw["outputs"].items()
+                },
+            }
+        if "sliced_from" in raw:
+            result["sliced_from"] = raw["sliced_from"]
+        return result
+
+    async def _predict_interval_raw(
+        self,
+        api_key: str,
+        chromosome: str,
+        start: int,
+        end: int,
+        outputs: list[OutputType],
+        tissues: list[str],
+        organism: Organism,
+    ) -> dict[str, Any]:
+        """
+        Cached native-resolution interval prediction.
+
+        On a cache miss, a query inside a wider cached window with the same
+        outputs and tissues is answered by slicing that window (the result
+        then carries `sliced_from`); only otherwise is AlphaGenome called.
+        """
+        params = {
+            "chromosome": chromosome,
+            "start": start,
+            "end": end,
+            "outputs": sorted(o.value for o in outputs),
+            "tissues": sorted(tissues),
+            "organism": organism.value,
+        }
+        group = (organism.value, chromosome, tuple(params["outputs"]), tuple(params["tissues"]))
+
+        async def compute() -> tuple[dict[str, Any], bool]:
+            sliced = await self._slice_cached_interval(group, start, end)
+            if sliced is not None:
+                record_cache_hit()
+                # Derived from a cached window; not worth a cache entry of its own
+                return sliced, False
+            started = time.perf_counter()
+            result, cacheable = await self._predict_interval_upstream(
+                api_key, chromosome, start, end, outputs, tissues, organism
+            )
+            self.interval_index.record_upstream(started)
+            return result, cacheable
+
+        raw = await self._cached(
+            api_key,
+            "predict_interval_raw",
+            params,
+            compute,
+            result_codec.pack,
+            result_codec.unpack,
+        )
+        if "sliced_from" not in raw and _sliceable(raw):
+            self.interval_index.add(group, start, end, cache_key("predict_interval_raw", params))
+        return raw
+
+    async def _slice_cached_interval(
+        self, group: tuple, start: int, end: int
+    ) -> dict[str, Any] | None:
+        """Answer [start, end) from a cached wider window, if one is indexed."""
+        found = self.interval_index.find(group, start, end)
+        if found is None:
+            return None
+
+        window_start, window_end, key = found
+        started = time.perf_counter()
+        blob = await self.result_cache.get(key)
+        if blob is None:
+            self.interval_index.discard(group, window_start, window_end)
+            return None
+
+        # Decoding a full window is CPU-bound; keep it off the event loop
+        with timing.phase("cache_decode"):
+            sliced = await asyncio.to_thread(_slice_packed_interval, blob, start, end)
+        if sliced is not None:
+            self.interval_index.record_slice(started)
+        return sliced
+
+    async def predict_region_stream(
+        self,
+        api_key: str,
+        chromosome: str,
+        start: int,
+        end: int,
+        outputs: list[OutputType],
+        tissues: list[str],
+        organism: Organism,
+        sequence_length: SequenceLength = SequenceLength.LENGTH_1MB,
+        overlap: int = 131072,
+        resolution: int = DEFAULT_RESOLUTION,
+        aggregation: str = "mean",
+        track_filter: dict[str, Any] | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Predict a region of any size as stitched model windows.
+
+        The region is split into overlapping windows of `sequence_length`
+        (see `region_planner`); each window keeps only its central part,
+        binned like `predict_interval`. Windows run concurrently with a
+        bounded lookahead and are yielded in genomic order, so
+        concatenating the chunks' values gives one contiguous array while
+        only a few windows are ever held in memory.
+
+        Yields:
+            {"event": "start", ...}, one {"event": "chunk", ...} (or
+            {"event": "error", ...}) per window, then {"event": "end", ...}
+        """
+        settings = get_settings()
+        window = SEQUENCE_LENGTH_MAP[sequence_length]
+        align = math.lcm(
+            effective_resolution(resolution, 1),
+            effective_resolution(resolution, NATIVE_ROW_ALIGN),
+        )
+        windows = plan_windows(start, end, window, overlap, align)
+        check_bins(
+            max((w.keep_end - w.keep_start for w in windows), default=0),
+            resolution,
+            settings.interval_max_bins,
+        )
+
+        yield {
+            "event": "start",
+            "interval": {"chromosome": chromosome, "start": start, "end": end},
+            "windows": len(windows),
+            "window_size": window,
+            "resolution": resolution,
+            "aggregation": aggregation,
+        }
+
+        async def predict_window(w: RegionWindow) -> dict[str, Any]:
+            raw = await self._predict_interval_raw(
+                api_key, chromosome, w.window_start, w.window_end, outputs, tissues, organism
+            )
+            return raw["outputs"]
+
+        lookahead = max(1, settings.region_max_concurrency)
+        remaining = iter(windows)
+        in_flight: deque[tuple[RegionWindow, asyncio.Future]] = deque()
+
+        def schedule() -> None:
+            for w in itertools.islice(remaining, lookahead - len(in_flight)):
+                in_flight.append((w, asyncio.ensure_future(predict_window(w))))
+
+        counts = {"completed": 0, "failed": 0}
+        try:
+            schedule()
+            while in_flight:
+                w, task = in_flight.popleft()
+                schedule()
+                try:
+                    raw_outputs = await task
+                    chunk = {
+                        name: render_output(
+                            _keep_rows(raw, w), resolution, aggregation, track_filter
+                        )
+                        for name, raw in raw_outputs.items()
+                    }
+                except Exception as e:
+                    logger.warning(
+                        f"Region window {chromosome}:{w.window_start}-{w.window_end} failed: {e}"
+                    )
+                    counts["failed"] += 1
+                    yield {
+                        "event": "error",
+                        "index": w.index,
+                        "start": w.keep_start,
+                        "end": w.keep_end,
+                        "error": str(e),
+                    }
+                    continue
+
+                counts["completed"] += 1
+                yield {
+                    "event": "chunk",
+                    "index": w.index,
+                    "start": w.keep_start,
+                    "end": w.keep_end,
+                    "window": {"start": w.window_start, "end": w.window_end},
+                    "outputs": chunk,
+                }
+        finally:
+            # Client went away or the stream failed: stop windows in flight
+            for _, task in in_flight:
+                task.cancel()
+
+        yield {"event": "end", **counts}
+
+    async def _predict_interval_upstream(
+        self,
+        api_key: str,
+        chromosome: str,
+        start: int,
+        end: int,
+        outputs: list[OutputType],
+        tissues: list[str],
+        organism: Organism,
+    ) -> tuple[dict[str, Any], bool]:
+        """Uncached interval prediction at native resolution; returns (result, cacheable)."""
+        logger.info(f"Predicting interval: {chromosome}:{start}-{end}")
 
         interval = genome.Interval(
             chromosome=chromosome,
@@ -280,7 +864,9 @@ class AlphaGenomeService:
         ag_outputs = [OUTPUT_TYPE_MAP[o] for o in outputs]
         ag_organism = ORGANISM_MAP[organism]
 
-        output = client.predict_interval(
+        output = await self._call(
+            api_key,
+            "predict_interval",
             interval=interval,
             requested_outputs=ag_outputs,
             ontology_terms=tissues,
@@ -297,16 +883,67 @@ class AlphaGenomeService:
             "outputs": {},
         }
 
-        for output_type in outputs:
-            attr_name = output_type.value.lower()
-            track_data = getattr(output, attr_name, None)
-            if track_data is not None:
-                result["outputs"][output_type.value] = {
-                    "shape": list(track_data.values.shape),
-                    "metadata": track_data.metadata.to_dict(orient="records"),
-                }
+        with timing.phase("serialize_tracks"):
+            for output_type in outputs:
+                attr_name = output_type.value.lower()
+                track_data = getattr(output, attr_name, None)
+                if track_data is not None:
+                    serialized = {
+                        "shape": list(track_data.values.shape),
+                        "metadata": track_data.metadata.to_dict(orient="records"),
+                    }
+                    # Only positional (positions, tracks) data can be binned;
+                    # splice junctions and contact maps keep shape/metadata only
+                    if track_data.values.ndim == 2 and hasattr(track_data, "resolution"):
+                        serialized["values"] = np.asarray(track_data.values, dtype=np.float32)
+                        serialized["resolution"] = int(track_data.resolution)
+                    result["outputs"][output_type.value] = serialized
+
+        self._schedule_tile_ingest(organism, result)
+        return result, True
+
+    def _schedule_tile_ingest(self, organism: Organism, result: dict[str, Any]) -> None:
+        """Add a fresh interval prediction to the tile pyramid in the background."""
+        if self.tile_store is None:
+            return
+        if len(self._tile_ingests) >= TILE_INGEST_MAX_PENDING:
+            self.tile_ingests_skipped += 1
+            return
+        task = asyncio.create_task(self._ingest_tiles(organism, result))
+        self._tile_ingests.add(task)
+        task.add_done_callback(self._tile_ingests.discard)
+
+    async def _ingest_tiles(self, organism: Organism, result: dict[str, Any]) -> None:
+        """Add a fresh interval prediction to the tile pyramid (best effort)."""
+        try:
+            await asyncio.to_thread(self.tile_store.ingest, organism.value, result)
+        except Exception as e:
+            logger.warning(f"Tile ingest failed for {result['interval']}: {e}")
+
+    def _score_params(
+        self,
+        variant_str: str,
+        scorers: list[ScorerType],
+        sequence_length: SequenceLength,
+        organism: Organism,
+    ) -> dict[str, Any]:
+        """Canonical cache parameters for a variant score."""
+        return {
+            "variant": variant_str,
+            "scorers": sorted(s.value for s in scorers),
+            "sequence_length": sequence_length.value,
+            "organism": organism.value,
+        }
 
-        return result
+    def _resolve_scorers(self, scorers: list[ScorerType]) -> list[tuple[str, Any]]:
+        """Resolve each requested scorer once, keeping request order."""
+        resolved: list[tuple[str, Any]] = []
+        for scorer_type in scorers:
+            scorer_name = SCORER_MAP[scorer_type]
+            scorer = variant_scorers.RECOMMENDED_VARIANT_SCORERS.get(scorer_name)
+            if scorer and all(name != scorer_name for name, _ in resolved):
+                resolved.append((scorer_name, scorer))
+        return resolved
 
     async def score_variant(
         self,
@@ -317,53 +954,266 @@ class AlphaGenomeService:
         organism: Organism,
     ) -> list[GeneScore]:
         """Score a variant using specified scorers."""
+        params = self._score_params(variant_str, scorers, sequence_length, organism)
+        return await self._cached(
+            api_key,
+            "score_variant",
+            params,
+            lambda: self._score_variant_upstream(
+                api_key, variant_str, scorers, sequence_length, organism
+            ),
+            result_codec.encode_scores,
+            result_codec.decode_scores,
+        )
+
+    async def _score_variant_upstream(
+        self,
+        api_key: str,
+        variant_str: str,
+        scorers: list[ScorerType],
+        sequence_length: SequenceLength,
+        organism: Organism,
+    ) -> tuple[list[GeneScore], bool]:
+        """Uncached variant scoring; returns (scores, cacheable)."""
         logger.info(f"Scoring variant: {variant_str}")
 
-        client = self._get_client(api_key)
         variant = self._parse_variant(variant_str)
         seq_len = SEQUENCE_LENGTH_MAP[sequence_length]
         interval = variant.reference_interval.resize(seq_len)
         ag_organism = ORGANISM_MAP[organism]
 
-        all_scores = []
+        resolved = self._resolve_scorers(scorers)
 
-        for scorer_type in scorers:
-            scorer_name = SCORER_MAP[scorer_type]
-            scorer = variant_scorers.RECOMMENDED_VARIANT_SCORERS.get(scorer_name)
+        # All scorers go upstream in one call (chunked at the API limit)
+        outcomes: list[Any] = []
+        batch_size = dna_client.MAX_VARIANT_SCORERS_PER_REQUEST
+        for i in range(0, len(resolved), batch_size):
+            outcomes.extend(
+                await self._score_batch(
+                    api_key,
+                    resolved[i:i + batch_size],
+                    interval=interval,
+                    variant=variant,
+                    organism=ag_organism,
+                )
+            )
 
-            if scorer:
-                try:
-                    score_result = client.score_variant(
-                        interval=interval,
-                        variant=variant,
-                        variant_scorers=[scorer],
-                        organism=ag_organism,
-                    )
+        all_scores = []
+        all_succeeded = True
+
+        # Demultiplex: one AnnData per scorer, converted independently
+        for (scorer_name, _), score_result in zip(resolved, outcomes):
+            try:
+                if isinstance(score_result, BaseException):
+                    raise score_result
 
-                    if score_result:
+                if score_result is not None:
+                    with timing.phase("tidy_scores"):
                         scores_df = variant_scorers.tidy_scores(
-                            score_result, match_gene_strand=True
+                            [score_result], match_gene_strand=True
                         )
+                    with timing.phase("gene_scores"):
+                        all_scores.extend(gene_scores_from_tidy(scores_df))
+            except Exception as e:
+                all_succeeded = False
+                logger.warning(f"Error with scorer {scorer_name}: {e}")
+
+        return all_scores, all_succeeded
+
+    async def _score_batch(
+        self,
+        api_key: str,
+        batch: list[tuple[str, Any]],
+        **call_kwargs: Any,
+    ) -> list[Any]:
+        """
+        Score a variant with several scorers in one upstream call.
 
-                        for _, row in scores_df.iterrows():
-                            all_scores.append(
-                                GeneScore(
-                                    gene_id=row.get("gene_id", ""),
-                                    gene_name=row.get("gene_name", "Unknown"),
-                                    strand=row.get("strand", "."),
-                                    raw_score=float(row.get("raw_score", 0)),
-                                    quantile_score=float(row.get("quantile_score", 0)),
-                                    tissue=row.get("ontology_curie", ""),
-                                    interpretation=self._interpret_score(
-                                        float(row.get("raw_score", 0)),
-                                        float(row.get("quantile_score", 0)),
-                                    ),
-                                )
-                            )
+        Returns one entry per scorer: its AnnData, None if the upstream
+        returned nothing, or the exception that scorer failed with. If the
+        batched call fails, each scorer is retried on its own so one bad
+        scorer cannot take the others down with it.
+        """
+        try:
+            results = await self._call(
+                api_key,
+                "score_variant",
+                variant_scorers=[scorer for _, scorer in batch],
+                **call_kwargs,
+            )
+            if len(results) != len(batch):
+                raise ValueError(
+                    f"Expected {len(batch)} score results, got {len(results)}"
+                )
+            return list(results)
+        except Exception as e:
+            if len(batch) == 1:
+                return [e]
+            logger.warning(f"Batched scoring failed, retrying per scorer: {e}")
+
+        singles = await asyncio.gather(
+            *[
+                self._call(
+                    api_key,
+                    "score_variant",
+                    variant_scorers=[scorer],
+                    **call_kwargs,
+                )
+                for _, scorer in batch
+            ],
+            return_exceptions=True,
+        )
+        return [
+            r if isinstance(r, BaseException) else (r[0] if r else None)
+            for r in singles
+        ]
+
+    async def score_variants_stream(
+        self,
+        api_key: str,
+        variants: list[str],
+        scorers: list[ScorerType],
+        sequence_length: SequenceLength,
+        organism: Organism,
+        max_workers: int = 5,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Score many variants, yielding results as they complete.
+
+        Identical variants are scored once; each result carries the
+        `indices` of every input position it answers, so callers can
+        rebuild input order. Cached variants are yielded first, the rest
+        go upstream in chunks through the client's batched
+        `score_variants`, and chunks are yielded in completion order. A
+        failed chunk is retried variant by variant, so one bad record
+        only fails itself.
+
+        Yields:
+            {"event": "start", ...}, one {"event": "result", ...} per
+            unique variant, then {"event": "end", ...}
+        """
+        settings = get_settings()
+        positions: dict[str, list[int]] = {}
+        for index, variant_str in enumerate(variants):
+            positions.setdefault(variant_str, []).append(index)
+
+        yield {"event": "start", "total": len(variants), "unique": len(positions)}
+
+        counts = {"scored": 0, "cached": 0, "failed": 0}
+        keys = {
+            variant_str: cache_key(
+                "score_variant",
+                self._score_params(variant_str, scorers, sequence_length, organism),
+            )
+            for variant_str in positions
+        }
+        blobs = await asyncio.gather(*(self.result_cache.get(key) for key in keys.values()))
+        hits = {
+            variant_str: blob for variant_str, blob in zip(keys, blobs) if blob is not None
+        }
+        pending = [variant_str for variant_str in keys if variant_str not in hits]
+
+        def decode_hits() -> list[tuple[str, list[GeneScore]]]:
+            return [(v, result_codec.decode_scores(blob)) for v, blob in hits.items()]
+
+        record_cache_hit(len(hits))
+        for variant_str, cached_scores in await asyncio.to_thread(decode_hits):
+            counts["cached"] += 1
+            yield _batch_result(variant_str, positions[variant_str], cached_scores, cached=True)
+
+        resolved = self._resolve_scorers(scorers)
+        seq_len = SEQUENCE_LENGTH_MAP[sequence_length]
+        ag_organism = ORGANISM_MAP[organism]
+        chunk_size = settings.batch_score_chunk_size
+
+        async def score_chunk(chunk: list[str]) -> tuple[list[str], Any]:
+            try:
+                parsed = [self._parse_variant(v) for v in chunk]
+                results = await self._call(
+                    api_key,
+                    "score_variants",
+                    intervals=[v.reference_interval.resize(seq_len) for v in parsed],
+                    variants=parsed,
+                    variant_scorers=[scorer for _, scorer in resolved],
+                    organism=ag_organism,
+                    progress_bar=False,
+                    max_workers=max_workers,
+                )
+                return chunk, results
+            except Exception as e:
+                return chunk, e
+
+        tasks = {
+            asyncio.ensure_future(score_chunk(pending[i:i + chunk_size]))
+            for i in range(0, len(pending), chunk_size)
+        }
+        try:
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for next_done in done:
+                    chunk, results = next_done.result()
+
+                    if isinstance(results, Exception) and len(chunk) > 1:
+                        logger.warning(
+                            f"Batch scoring chunk of {len(chunk)} failed, "
+                            f"retrying variant by variant: {results}"
+                        )
+                        tasks |= {asyncio.ensure_future(score_chunk([v])) for v in chunk}
+                        continue
+
+                    async for event in self._chunk_events(
+                        chunk, results, positions, resolved, keys, counts
+                    ):
+                        yield event
+        finally:
+            # Client went away or the stream failed: stop queued chunks
+            for task in tasks:
+                task.cancel()
+
+        yield {"event": "end", **counts}
+
+    async def _chunk_events(
+        self,
+        chunk: list[str],
+        results: Any,
+        positions: dict[str, list[int]],
+        resolved: list[tuple[str, Any]],
+        keys: dict[str, str],
+        counts: dict[str, int],
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Result events for one scored (or failed) chunk; caches complete ones."""
+        if isinstance(results, Exception):
+            logger.warning(f"Batch scoring failed for {chunk[0]}: {results}")
+            for variant_str in chunk:
+                counts["failed"] += 1
+                yield {
+                    "event": "result",
+                    "indices": positions[variant_str],
+                    "variant": variant_str,
+                    "success": False,
+                    "error": str(results),
+                }
+            return
+
+        for variant_str, per_scorer in zip(chunk, results):
+            scores: list[GeneScore] = []
+            complete = True
+            for (scorer_name, _), adata in zip(resolved, per_scorer):
+                try:
+                    scores.extend(
+                        gene_scores_from_tidy(
+                            variant_scorers.tidy_scores([adata], match_gene_strand=True)
+                        )
+                    )
                 except Exception as e:
-                    logger.warning(f"Error with scorer {scorer_name}: {e}")
+                    complete = False
+                    logger.warning(f"Error with scorer {scorer_name} for {variant_str}: {e}")
 
-        return all_scores
+            if complete:
+                blob = await asyncio.to_thread(result_codec.encode_scores, scores)
+                await self.result_cache.set(keys[variant_str], blob)
+            counts["scored"] += 1
+            yield _batch_result(variant_str, positions[variant_str], scores)
 
     async def run_ism(
         self,
@@ -377,10 +1227,14 @@ class AlphaGenomeService:
         sequence_length: SequenceLength,
         organism: Organism,
     ) -> dict[str, Any]:
-        """Run in silico mutagenesis."""
+        """
+        Run in silico mutagenesis.
+
+        Returns the interval, the (ism_width, 4) float32 matrix as a numpy
+        array and its shape; callers choose how to encode the matrix.
+        """
         logger.info(f"Running ISM: {chromosome}:{start}-{end}")
 
-        client = self._get_client(api_key)
         seq_len = SEQUENCE_LENGTH_MAP[sequence_length]
         ag_organism = ORGANISM_MAP[organism]
 
@@ -407,24 +1261,21 @@ class AlphaGenomeService:
         if not scorer:
             raise ValueError(f"Unknown scorer: {scorer_type}")
 
-        # Run ISM
-        variant_scores = client.score_ism_variants(
-            interval=sequence_interval,
+        # Run ISM shard by shard; finished shards survive a failed run
+        shard_results = await self._run_ism_shards(
+            api_key,
+            sequence_interval=sequence_interval,
             ism_interval=ism_interval,
-            variant_scorers=[scorer],
+            scorer=scorer,
+            tissue=tissue,
             organism=ag_organism,
         )
-
-        # Extract scores for specific tissue
-        def extract_tissue_score(adata):
-            if "ontology_curie" in adata.var.columns:
-                mask = adata.var["ontology_curie"] == tissue
-                if mask.any():
-                    return float(adata.X[:, mask].flatten()[0])
-            return 0.0
-
-        scores = [extract_tissue_score(v[0]) for v in variant_scores]
-        variants = [v[0].uns["variant"] for v in variant_scores]
+        scores = np.concatenate([shard_scores for shard_scores, _ in shard_results])
+        variants = [
+            genome.Variant.from_str(variant)
+            for _, shard_variants in shard_results
+            for variant in shard_variants
+        ]
 
         # Create ISM matrix
         ism_matrix = ism.ism_matrix(
@@ -440,10 +1291,91 @@ class AlphaGenomeService:
                 "start": ism_interval.start,
                 "end": ism_interval.end,
             },
-            "ism_matrix": ism_matrix.tolist(),
+            "ism_matrix": ism_matrix,
             "shape": list(ism_matrix.shape),
         }
 
+    async def _run_ism_shards(
+        self,
+        api_key: str,
+        sequence_interval: genome.Interval,
+        ism_interval: genome.Interval,
+        scorer: Any,
+        tissue: str,
+        organism: Any,
+    ) -> list[tuple[np.ndarray, list[str]]]:
+        """
+        Score an ISM window as concurrent position shards.
+
+        Every shard keeps the full sequence context, so the scores match a
+        single score_ism_variants call over the whole window. Shards found
+        in the checkpoint store are not recomputed; all other shards run to
+        completion (and are checkpointed) before the first error is raised.
+
+        Returns:
+            (tissue scores, variant strings) per shard, in position order
+        """
+        # Checkpoint file I/O runs in threads to keep the event loop free
+        await asyncio.to_thread(self.ism_checkpoints.prune)
+        width = max(1, self.ism_shard_width)
+        slots = asyncio.Semaphore(max(1, self.ism_shard_concurrency))
+
+        shards = [
+            genome.Interval(
+                chromosome=ism_interval.chromosome,
+                start=shard_start,
+                end=min(shard_start + width, ism_interval.end),
+            )
+            for shard_start in range(ism_interval.start, ism_interval.end, width)
+        ]
+        keys = [
+            shard_key(
+                {
+                    "organism": organism.name,
+                    "interval": str(sequence_interval),
+                    "shard": str(shard),
+                    "scorer": repr(scorer),
+                    "tissue": tissue,
+                }
+            )
+            for shard in shards
+        ]
+
+        async def run_shard(shard: genome.Interval, key: str) -> tuple[np.ndarray, list[str]]:
+            checkpoint = await asyncio.to_thread(self.ism_checkpoints.load, key)
+            if checkpoint is not None:
+                record_cache_hit(len(checkpoint[1]))
+                return checkpoint
+            async with slots:
+                variant_scores = await self._call(
+                    api_key,
+                    "score_ism_variants",
+                    interval=sequence_interval,
+                    ism_interval=shard,
+                    variant_scorers=[scorer],
+                    organism=organism,
+                )
+            scores = _ism_tissue_scores(variant_scores, tissue)
+            variants = [str(v[0].uns["variant"]) for v in variant_scores]
+            await asyncio.to_thread(self.ism_checkpoints.save, key, scores, variants)
+            return scores, variants
+
+        results = await asyncio.gather(
+            *(run_shard(shard, key) for shard, key in zip(shards, keys)),
+            return_exceptions=True,
+        )
+        failures = [r for r in results if isinstance(r, BaseException)]
+        if failures:
+            done = len(results) - len(failures)
+            logger.warning(
+                f"ISM {ism_interval}: {len(failures)}/{len(shards)} shards failed, "
+                f"{done} checkpointed for retry"
+            )
+            raise failures[0]
+
+        await asyncio.to_thread(self.ism_checkpoints.discard, keys)
+        return results
+
 
 # Singleton instance
 alphagenome_service = AlphaGenomeService()
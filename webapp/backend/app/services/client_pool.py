@@ -0,0 +1,205 @@
+"""
+AlphaGenome Client Pool
+
+Keeps one DnaClient (and its gRPC channel) per API key so that repeated
+requests skip the channel handshake and client setup.
+
+Clients are leased for the duration of a call. A client evicted or
+expired while calls are still running on it is closed only when the last
+of them returns, so no channel is closed under an in-flight RPC.
+
+IMPORTANT: Raw API keys are never used as pool keys. Entries are indexed
+by a SHA-256 fingerprint of the key and live only in process memory.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+from alphagenome.models import dna_client
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint_api_key(api_key: str) -> str:
+    """Return a stable, non-reversible identifier for an API key."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _PoolEntry:
+    client: dna_client.DnaClient
+    created_at: float
+    last_used: float
+    leases: int = 0
+    # Removed from the pool; close once the last lease is returned
+    retired: bool = False
+
+
+class ClientPool:
+    """
+    LRU pool of AlphaGenome clients with idle TTL and a max-size bound.
+
+    Thread-safe: clients are leased from the upstream worker threads.
+    Channels are always closed outside the pool lock.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 64,
+        idle_ttl_seconds: float = 600,
+        factory: Callable[[str], dna_client.DnaClient] = dna_client.create,
+    ):
+        self.max_size = max_size
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self._factory = factory
+        self._entries: OrderedDict[str, _PoolEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._setup_seconds_total = 0.0
+
+    @contextmanager
+    def lease(self, api_key: str) -> Iterator[dna_client.DnaClient]:
+        """Borrow the pooled client for the key for one call."""
+        entry = self._acquire(api_key)
+        try:
+            yield entry.client
+        finally:
+            with self._lock:
+                entry.leases -= 1
+                entry.last_used = time.monotonic()
+                close = entry.retired and entry.leases == 0
+            if close:
+                self._close_client(entry.client)
+
+    def _acquire(self, api_key: str) -> _PoolEntry:
+        """The key's entry with one more lease, creating it on a miss."""
+        key = fingerprint_api_key(api_key)
+        now = time.monotonic()
+
+        with self._lock:
+            stale = self._expire_idle(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.leases += 1
+                entry.last_used = now
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        self._close_all(stale)
+        if entry is not None:
+            return entry
+
+        # Create outside the lock: the channel handshake can take seconds.
+        start = time.monotonic()
+        client = self._factory(api_key)
+        elapsed = time.monotonic() - start
+
+        stale = []
+        with self._lock:
+            self._setup_seconds_total += elapsed
+            entry = self._entries.get(key)
+            if entry is not None:
+                # Another thread won the race; keep its client.
+                stale.append(client)
+                self._entries.move_to_end(key)
+            else:
+                now = time.monotonic()
+                entry = _PoolEntry(client, now, now)
+                self._entries[key] = entry
+                while len(self._entries) > self.max_size:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.evictions += 1
+                    stale += self._retire(evicted)
+            entry.leases += 1
+            entry.last_used = time.monotonic()
+
+        self._close_all(stale)
+        return entry
+
+    @staticmethod
+    def _retire(entry: _PoolEntry) -> list[dna_client.DnaClient]:
+        """
+        Mark a removed entry for closing. Caller holds the lock.
+
+        Returns the client if it can be closed now, i.e. nothing is using
+        it; otherwise the last lease closes it.
+        """
+        entry.retired = True
+        return [entry.client] if entry.leases == 0 else []
+
+    def _expire_idle(self, now: float) -> list[dna_client.DnaClient]:
+        """
+        Drop idle entries (never ones in use). Caller holds the lock.
+
+        Returns the clients to close once the lock is released.
+        """
+        expired = [
+            key
+            for key, entry in self._entries.items()
+            if entry.leases == 0 and now - entry.last_used > self.idle_ttl_seconds
+        ]
+        stale = []
+        for key in expired:
+            entry = self._entries.pop(key)
+            self.expirations += 1
+            stale += self._retire(entry)
+        return stale
+
+    def _close_all(self, clients: list[Any]) -> None:
+        for client in clients:
+            self._close_client(client)
+
+    @staticmethod
+    def _close_client(client: Any) -> None:
+        """Close the client's gRPC channel, ignoring errors."""
+        channel = getattr(client, "_channel", None)
+        close = getattr(channel, "close", None) or getattr(client, "close", None)
+        if close is None:
+            return
+        try:
+            close()
+        except Exception as e:
+            logger.debug(f"Error closing AlphaGenome client: {e}")
+
+    def close(self) -> None:
+        """Close every pooled client. Called on application shutdown."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+            stale = [client for entry in entries for client in self._retire(entry)]
+        self._close_all(stale)
+        if entries:
+            logger.info(f"Closed {len(entries)} pooled AlphaGenome client(s)")
+
+    def stats(self) -> dict[str, Any]:
+        """Pool counters, including the estimated setup time saved by hits."""
+        with self._lock:
+            size = len(self._entries)
+            avg_setup = (
+                self._setup_seconds_total / self.misses if self.misses else 0.0
+            )
+            lookups = self.hits + self.misses
+            return {
+                "size": size,
+                "leased": sum(entry.leases for entry in self._entries.values()),
+                "max_size": self.max_size,
+                "idle_ttl_seconds": self.idle_ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "avg_setup_ms": round(avg_setup * 1000, 2),
+                "setup_ms_saved": round(self.hits * avg_setup * 1000, 2),
+            }
@@ -0,0 +1,65 @@
+"""
+Request Coalescer
+
+Single-flight execution: concurrent callers asking for the same key share
+one in-flight upstream call instead of each spending quota on it.
+
+The shared call runs in its own task, so a caller that disconnects does
+not cancel the work for the others still waiting on it.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class RequestCoalescer:
+    """Share one in-flight awaitable between identical concurrent requests."""
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Task] = {}
+
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.failures = 0
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await the shared result for `key`, starting it if needed.
+
+        Args:
+            key: Canonical request key
+            factory: Creates the awaitable on the first call for the key
+
+        Returns:
+            The shared result. If the shared call fails, every waiter
+            receives the same exception.
+        """
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finished(key, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved even if every waiter went away.
+        if not task.cancelled() and task.exception() is not None:
+            self.failures += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "in_flight": len(self._inflight),
+            "calls": self.calls,
+            "upstream_executions": self.executions,
+            "calls_saved": self.coalesced,
+            "failures": self.failures,
+        }
@@ -12,6 +12,7 @@ Handles conversion of results to various export formats:
 
 import json
 import io
+import time
 from datetime import datetime
 from typing import Any
 
@@ -23,6 +24,8 @@ from ..models import (
     format_as_csv,
     format_as_tsv,
 )
+from .metrics import EXPORT_BYTES, EXPORT_RENDER_SECONDS
+from . import timing
 
 
 class ExportService:
@@ -45,6 +48,16 @@ class ExportService:
         Returns:
             Tuple of (content_bytes, content_type, filename_with_extension)
         """
+        started = time.perf_counter()
+        with timing.phase(f"export_{format.value}"):
+            result = self._render(data, format, filename)
+        EXPORT_RENDER_SECONDS.observe(time.perf_counter() - started, format.value)
+        EXPORT_BYTES.observe(len(result[0]), format.value)
+        return result
+
+    def _render(
+        self, data: dict[str, Any], format: ExportFormat, filename: str
+    ) -> tuple[bytes, str, str]:
         if format == ExportFormat.JSON:
             return self._export_json(data, filename)
         elif format == ExportFormat.CSV:
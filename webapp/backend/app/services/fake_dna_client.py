@@ -0,0 +1,361 @@
+"""
+Fake AlphaGenome Client
+
+Offline stand-in for `dna_client.DnaClient`, selected with
+ALPHAGENOME_BACKEND=fake. It implements the `DnaModel` interface with
+deterministic synthetic data in the same shapes the real API returns:
+
+- TrackData per requested output (per-output resolution and a track
+  catalogue sized like the human model's)
+- AnnData variant scores that `variant_scorers.tidy_scores` accepts, gene
+  centric (genes x tracks) for gene scorers, (1 x tracks) otherwise
+- ISM scores for every alternate base of every position, on a
+  reproducible pseudo-random reference sequence
+- gene-mask interval scores (genes x tracks) for `score_interval`
+
+Every call sleeps for a latency drawn from a configurable distribution,
+so the backend can be load- and performance-tested without network
+access or API quota. Identical requests always return identical data;
+latencies come from one random stream per client, so repeats of a
+request do not all see the same latency.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from typing import Any, Iterable, Sequence
+
+import anndata
+import numpy as np
+import pandas as pd
+from alphagenome.data import genome, track_data
+from alphagenome.models import dna_model, dna_output, variant_scorers
+from alphagenome.models import interval_scorers as interval_scorers_lib
+
+OutputType = dna_output.OutputType
+Organism = dna_model.Organism
+
+# Native resolution (bp per bin) of each output
+RESOLUTIONS = {
+    OutputType.CHIP_HISTONE: 128,
+    OutputType.CHIP_TF: 128,
+    OutputType.CONTACT_MAPS: 2048,
+}
+
+# Tracks per output when no ontology terms are requested (human model sizes)
+CATALOGUE_SIZES = {
+    OutputType.ATAC: 167,
+    OutputType.CAGE: 546,
+    OutputType.DNASE: 305,
+    OutputType.RNA_SEQ: 667,
+    OutputType.CHIP_HISTONE: 1116,
+    OutputType.CHIP_TF: 1617,
+    OutputType.SPLICE_SITES: 4,
+    OutputType.SPLICE_SITE_USAGE: 734,
+    OutputType.SPLICE_JUNCTIONS: 367,
+    OutputType.CONTACT_MAPS: 28,
+    OutputType.PROCAP: 12,
+}
+
+# Stranded outputs get one track per strand for each ontology term
+STRANDED = {OutputType.RNA_SEQ, OutputType.CAGE, OutputType.PROCAP, OutputType.SPLICE_SITE_USAGE}
+
+# Synthetic genes per megabase in gene-centric scores
+GENES_PER_MB = 40
+
+GENE_SCORERS = (
+    variant_scorers.GeneMaskLFCScorer,
+    variant_scorers.GeneMaskActiveScorer,
+    variant_scorers.GeneMaskSplicingScorer,
+    variant_scorers.PolyadenylationScorer,
+    variant_scorers.SpliceJunctionScorer,
+)
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+
+def _seed(*parts: Any) -> int:
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def reference_bases(chromosome: str, start: int, end: int) -> np.ndarray:
+    """Reproducible pseudo-random reference bases for [start, end) as chars."""
+    positions = np.arange(start, end, dtype=np.uint64)
+    mixed = (positions + np.uint64(_seed(chromosome) & 0xFFFFFFFF)) * np.uint64(2654435761)
+    return np.array(list("ACGT"))[((mixed >> np.uint64(13)) % np.uint64(4)).astype(np.int64)]
+
+
+class FakeDnaClient(dna_model.DnaModel):
+    """Deterministic, network-free implementation of the DnaModel API."""
+
+    def __init__(
+        self,
+        seed: int = 0,
+        latency_ms: dict[str, float] | None = None,
+        latency_distribution: str = "lognormal",
+        latency_sigma: float = 0.5,
+    ):
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {latency_distribution}")
+        self.seed = seed
+        self.latency_ms = latency_ms or {}
+        self.latency_distribution = latency_distribution
+        self.latency_sigma = latency_sigma
+        # Seeded once per client; Generators are not thread-safe
+        self._latency_rng = np.random.default_rng(_seed(seed, "latency"))
+        self._latency_lock = threading.Lock()
+
+    # ============ Latency ============
+
+    def _sleep(self, method: str, units: float = 1.0) -> None:
+        """Sleep for `units` draws of the method's latency."""
+        median = self.latency_ms.get(method, 0.0)
+        if median <= 0 or units <= 0:
+            return
+        if self.latency_distribution == "fixed":
+            ms = median
+        else:
+            with self._latency_lock:
+                if self.latency_distribution == "uniform":
+                    ms = self._latency_rng.uniform(0, 2 * median)
+                else:
+                    draw = self._latency_rng.standard_normal()
+                    ms = median * math.exp(self.latency_sigma * draw)
+        time.sleep(ms * units / 1000)
+
+    # ============ Metadata ============
+
+    def _track_metadata(
+        self, output: OutputType, ontology_terms: Iterable[Any] | None
+    ) -> pd.DataFrame:
+        terms = [getattr(t, "ontology_curie", t) for t in ontology_terms or []]
+        strands = ["+", "-"] if output in STRANDED else ["."]
+        if terms:
+            curies = [term for term in terms for _ in strands]
+            track_strands = strands * len(terms)
+        else:
+            count = CATALOGUE_SIZES.get(output, 8)
+            curies = [f"FAKE:{i // len(strands):07d}" for i in range(count)]
+            track_strands = [strands[i % len(strands)] for i in range(count)]
+        return pd.DataFrame(
+            {
+                "name": [f"{curie} synthetic {output.name}" for curie in curies],
+                "strand": track_strands,
+                "ontology_curie": curies,
+                "Assay title": f"synthetic {output.name}",
+                "biosample_name": [f"biosample {curie}" for curie in curies],
+                "biosample_type": "tissue",
+            }
+        )
+
+    def output_metadata(
+        self, organism: Organism = Organism.HOMO_SAPIENS
+    ) -> dna_output.OutputMetadata:
+        return dna_output.OutputMetadata(
+            **{
+                output.name.lower(): self._track_metadata(output, None)
+                for output in CATALOGUE_SIZES
+            }
+        )
+
+    # ============ Predictions ============
+
+    def _track_data(
+        self,
+        interval: genome.Interval,
+        output: OutputType,
+        ontology_terms: Iterable[Any] | None,
+        organism: Organism,
+        variant: genome.Variant | None = None,
+    ) -> track_data.TrackData | None:
+        if output == OutputType.SPLICE_JUNCTIONS:
+            # Junctions are JunctionData, not positional tracks; not simulated
+            return None
+        metadata = self._track_metadata(output, ontology_terms)
+        resolution = RESOLUTIONS.get(output, 1)
+        bins = max(1, interval.width // resolution)
+        rng = np.random.default_rng(
+            _seed(self.seed, organism.name, str(interval), output.name, str(variant))
+        )
+        if output == OutputType.CONTACT_MAPS:
+            shape = (bins, bins, len(metadata))
+        else:
+            shape = (bins, len(metadata))
+        values = rng.standard_exponential(shape, dtype=np.float32)
+        return track_data.TrackData(values, metadata, resolution=resolution, interval=interval)
+
+    def _output(
+        self,
+        interval: genome.Interval,
+        requested_outputs: Iterable[OutputType],
+        ontology_terms: Iterable[Any] | None,
+        organism: Organism,
+        variant: genome.Variant | None = None,
+    ) -> dna_output.Output:
+        terms = list(ontology_terms) if ontology_terms is not None else None
+        return dna_output.Output(
+            **{
+                output.name.lower(): self._track_data(interval, output, terms, organism, variant)
+                for output in requested_outputs
+            }
+        )
+
+    def predict_sequence(
+        self,
+        sequence: str,
+        *,
+        organism: Organism = Organism.HOMO_SAPIENS,
+        requested_outputs: Iterable[OutputType],
+        ontology_terms: Iterable[Any] | None,
+        interval: genome.Interval | None = None,
+    ) -> dna_output.Output:
+        interval = interval or genome.Interval("chr1", 0, len(sequence))
+        self._sleep("predict_interval")
+        return self._output(interval, requested_outputs, ontology_terms, organism)
+
+    def predict_interval(
+        self,
+        interval: genome.Interval,
+        *,
+        organism: Organism = Organism.HOMO_SAPIENS,
+        requested_outputs: Iterable[OutputType],
+        ontology_terms: Iterable[Any] | None,
+    ) -> dna_output.Output:
+        self._sleep("predict_interval")
+        return self._output(interval, requested_outputs, ontology_terms, organism)
+
+    def predict_variant(
+        self,
+        interval: genome.Interval,
+        variant: genome.Variant,
+        *,
+        organism: Organism = Organism.HOMO_SAPIENS,
+        requested_outputs: Iterable[OutputType],
+        ontology_terms: Iterable[Any] | None,
+    ) -> dna_output.VariantOutput:
+        self._sleep("predict_variant")
+        requested = list(requested_outputs)
+        return dna_output.VariantOutput(
+            reference=self._output(interval, requested, ontology_terms, organism),
+            alternate=self._output(interval, requested, ontology_terms, organism, variant),
+        )
+
+    # ============ Scoring ============
+
+    def _genes(self, interval: genome.Interval) -> pd.DataFrame:
+        count = max(1, round(interval.width / 1_000_000 * GENES_PER_MB))
+        rng = np.random.default_rng(_seed(self.seed, "genes", interval.chromosome, interval.start))
+        ids = rng.integers(0, 60000, count)
+        return pd.DataFrame(
+            {
+                "gene_id": [f"ENSG{i:011d}.1" for i in ids],
+                "gene_name": [f"FAKE{i}" for i in ids],
+                "gene_type": "protein_coding",
+                "strand": rng.choice(["+", "-"], count),
+            },
+            index=[str(i) for i in range(count)],
+        )
+
+    def _score(
+        self,
+        interval: genome.Interval,
+        variant: genome.Variant,
+        scorer: Any,
+        organism: Organism,
+    ) -> anndata.AnnData:
+        var = self._track_metadata(scorer.requested_output, None)
+        var.index = var.index.astype(str)
+        if isinstance(scorer, GENE_SCORERS):
+            obs = self._genes(interval)
+        else:
+            obs = pd.DataFrame(index=["0"])
+
+        rng = np.random.default_rng(_seed(self.seed, organism.name, str(variant), str(scorer)))
+        shape = (len(obs), len(var))
+        raw = rng.normal(0.0, 0.05, shape).astype(np.float32)
+        adata = anndata.AnnData(X=raw, obs=obs if isinstance(scorer, GENE_SCORERS) else None, var=var)
+        adata.layers["quantiles"] = rng.uniform(-1.0, 1.0, shape).astype(np.float32)
+        adata.uns["interval"] = interval
+        adata.uns["variant"] = variant
+        adata.uns["variant_scorer"] = scorer
+        return adata
+
+    def score_variant(
+        self,
+        interval: genome.Interval,
+        variant: genome.Variant,
+        variant_scorers: Sequence[Any] = (),
+        *,
+        organism: Organism = Organism.HOMO_SAPIENS,
+        merge_stranded_gene_tracks: bool = True,
+    ) -> list[anndata.AnnData]:
+        scorers = list(variant_scorers) or self._recommended_scorers()
+        self._sleep("score_variant")
+        return [self._score(interval, variant, scorer, organism) for scorer in scorers]
+
+    def score_ism_variants(
+        self,
+        interval: genome.Interval,
+        ism_interval: genome.Interval,
+        variant_scorers: Sequence[Any] = (),
+        *,
+        interval_variant: genome.Variant | None = None,
+        organism: Organism = Organism.HOMO_SAPIENS,
+        progress_bar: bool = False,
+        max_workers: int = 5,
+        merge_stranded_gene_tracks: bool = True,
+    ) -> list[list[anndata.AnnData]]:
+        scorers = list(variant_scorers) or self._recommended_scorers()
+        bases = reference_bases(ism_interval.chromosome, ism_interval.start, ism_interval.end)
+        variants = [
+            genome.Variant(ism_interval.chromosome, ism_interval.start + offset + 1, ref, alt)
+            for offset, ref in enumerate(bases.tolist())
+            for alt in "ACGT"
+            if alt != ref
+        ]
+        # Latency is quoted per 100 ISM variants, spread over the client's workers
+        self._sleep("score_ism_variants", len(variants) / 100 / max(1, max_workers))
+        return [
+            [self._score(interval, variant, scorer, organism) for scorer in scorers]
+            for variant in variants
+        ]
+
+    def score_interval(
+        self,
+        interval: genome.Interval,
+        interval_scorers: Sequence[Any] = (),
+        *,
+        organism: Organism = Organism.HOMO_SAPIENS,
+        merge_stranded_gene_tracks: bool = True,
+    ) -> list[anndata.AnnData]:
+        scorers = list(interval_scorers) or list(
+            interval_scorers_lib.RECOMMENDED_INTERVAL_SCORERS.values()
+        )
+        self._sleep("score_interval")
+        return [self._interval_score(interval, scorer, organism) for scorer in scorers]
+
+    def _interval_score(
+        self, interval: genome.Interval, scorer: Any, organism: Organism
+    ) -> anndata.AnnData:
+        """Gene-mask scores: one row per synthetic gene, one column per track."""
+        var = self._track_metadata(scorer.requested_output, None)
+        var.index = var.index.astype(str)
+        obs = self._genes(interval)
+        rng = np.random.default_rng(_seed(self.seed, organism.name, str(interval), str(scorer)))
+        adata = anndata.AnnData(
+            X=rng.standard_exponential((len(obs), len(var)), dtype=np.float32),
+            obs=obs,
+            var=var,
+        )
+        adata.uns["interval"] = interval
+        adata.uns["interval_scorer"] = scorer
+        return adata
+
+    @staticmethod
+    def _recommended_scorers() -> list[Any]:
+        return [variant_scorers.RECOMMENDED_VARIANT_SCORERS["RNA_SEQ"]]
+
+    def close(self) -> None:
+        """Nothing to release; present so the client pool can close it."""
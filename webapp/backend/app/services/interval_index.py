@@ -0,0 +1,122 @@
+"""
+Cached Interval Index
+
+Remembers which interval predictions are in the result cache so that a
+narrower `predict_interval` query lying entirely inside an already
+predicted window can be answered by slicing the cached array instead of
+calling AlphaGenome again.
+
+Entries are grouped by (organism, chromosome, outputs, tissues) and then
+by window width. Within one width the windows are kept sorted by start,
+so the only candidate container is the last window starting at or before
+the query (found with a binary search): O(log n) per distinct width, and
+the service only predicts a handful of widths.
+
+The index lives in process memory and only points at cache entries; an
+entry whose cache value has expired is dropped on its next lookup.
+"""
+
+import bisect
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class IntervalIndex:
+    """Per-chromosome sorted index of cached interval predictions."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        # group -> width -> (sorted starts, cache keys in the same order)
+        self._groups: dict[Hashable, dict[int, tuple[list[int], list[str]]]] = {}
+        # Insertion order, for evicting the oldest entries
+        self._order: OrderedDict[tuple[Hashable, int, int], None] = OrderedDict()
+
+        self.lookups = 0
+        self.slice_hits = 0
+        self.stale = 0
+        self.upstream_calls = 0
+        self._slice_ms_total = 0.0
+        self._upstream_ms_total = 0.0
+
+    def add(self, group: Hashable, start: int, end: int, key: str) -> None:
+        """Register a cached prediction of [start, end) under `group`."""
+        width = end - start
+        starts, keys = self._groups.setdefault(group, {}).setdefault(width, ([], []))
+        i = bisect.bisect_left(starts, start)
+        if i < len(starts) and starts[i] == start:
+            keys[i] = key
+            self._order.move_to_end((group, width, start))
+            return
+
+        starts.insert(i, start)
+        keys.insert(i, key)
+        self._order[(group, width, start)] = None
+        while len(self._order) > self.max_entries:
+            old_group, old_width, old_start = next(iter(self._order))
+            self._remove(old_group, old_width, old_start)
+
+    def find(self, group: Hashable, start: int, end: int) -> tuple[int, int, str] | None:
+        """
+        A cached window containing [start, end), as (start, end, cache key).
+
+        Exact matches are not returned; those are served by the cache directly.
+        """
+        self.lookups += 1
+        best: tuple[int, int, str] | None = None
+        for width, (starts, keys) in self._groups.get(group, {}).items():
+            if width <= end - start:
+                continue
+            i = bisect.bisect_right(starts, start) - 1
+            if i >= 0 and starts[i] + width >= end:
+                # Prefer the narrowest container: least data to decode
+                if best is None or width < best[1] - best[0]:
+                    best = (starts[i], starts[i] + width, keys[i])
+        return best
+
+    def discard(self, group: Hashable, start: int, end: int) -> None:
+        """Drop an entry whose cached value is gone."""
+        self.stale += 1
+        self._remove(group, end - start, start)
+
+    def _remove(self, group: Hashable, width: int, start: int) -> None:
+        self._order.pop((group, width, start), None)
+        widths = self._groups.get(group)
+        if not widths or width not in widths:
+            return
+        starts, keys = widths[width]
+        i = bisect.bisect_left(starts, start)
+        if i < len(starts) and starts[i] == start:
+            del starts[i]
+            del keys[i]
+        if not starts:
+            del widths[width]
+            if not widths:
+                del self._groups[group]
+
+    def record_slice(self, started: float) -> None:
+        """Count a query answered by slicing; `started` is a perf_counter reading."""
+        self.slice_hits += 1
+        self._slice_ms_total += (time.perf_counter() - started) * 1000
+
+    def record_upstream(self, started: float) -> None:
+        """Count a query that needed an upstream prediction."""
+        self.upstream_calls += 1
+        self._upstream_ms_total += (time.perf_counter() - started) * 1000
+
+    def stats(self) -> dict[str, Any]:
+        answered = self.slice_hits + self.upstream_calls
+        avg_slice = self._slice_ms_total / self.slice_hits if self.slice_hits else 0.0
+        avg_upstream = (
+            self._upstream_ms_total / self.upstream_calls if self.upstream_calls else 0.0
+        )
+        return {
+            "entries": len(self._order),
+            "lookups": self.lookups,
+            "slice_hits": self.slice_hits,
+            "upstream_calls": self.upstream_calls,
+            "stale": self.stale,
+            "slice_hit_rate": round(self.slice_hits / answered, 4) if answered else 0.0,
+            "avg_slice_ms": round(avg_slice, 2),
+            "avg_upstream_ms": round(avg_upstream, 2),
+        }
@@ -0,0 +1,97 @@
+"""
+ISM Shard Checkpoints
+
+Local-disk store for finished ISM shards. Each shard holds the tissue
+scores and variant strings for a slice of the ISM window, so a retried or
+resumed ISM run only recomputes the shards that are missing.
+
+Checkpoints contain model outputs only (no API keys) and are keyed by a
+hash of everything that determines the shard's result. Methods do
+blocking file I/O; async callers run them in a thread.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Iterable
+
+import numpy as np
+
+from .result_cache import ALPHAGENOME_VERSION
+
+logger = logging.getLogger(__name__)
+
+
+def shard_key(params: dict[str, Any]) -> str:
+    """Stable checkpoint key for one ISM shard."""
+    payload = {"alphagenome": ALPHAGENOME_VERSION, "params": params}
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ISMCheckpointStore:
+    """One .npz file per finished shard under `directory`."""
+
+    def __init__(self, directory: str, ttl_seconds: int = 86400):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.writes = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npz"
+
+    def load(self, key: str) -> tuple[np.ndarray, list[str]] | None:
+        """(scores, variant strings) for a checkpointed shard, or None."""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                scores = data["scores"]
+                variants = data["variants"].tolist()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable ISM checkpoint {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+        self.hits += 1
+        return scores, variants
+
+    def save(self, key: str, scores: np.ndarray, variants: list[str]) -> None:
+        """Write a shard atomically; failures are logged, not raised."""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Unique per writer: shards of identical runs may save concurrently
+            tmp = self.directory / f"{key}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp.npz"
+            np.savez(tmp, scores=scores, variants=np.array(variants, dtype=str))
+            os.replace(tmp, self._path(key))
+            self.writes += 1
+        except OSError as e:
+            logger.warning(f"Could not write ISM checkpoint {key}: {e}")
+
+    def discard(self, keys: Iterable[str]) -> None:
+        """Remove checkpoints once the full ISM result has been assembled."""
+        for key in keys:
+            self._path(key).unlink(missing_ok=True)
+
+    def prune(self) -> int:
+        """Delete checkpoints older than the TTL; returns how many were removed."""
+        if not self.directory.is_dir():
+            return 0
+        cutoff = time.time() - self.ttl_seconds
+        removed = 0
+        for path in self.directory.glob("*.npz"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def stats(self) -> dict[str, Any]:
+        return {"hits": self.hits, "writes": self.writes}
@@ -0,0 +1,358 @@
+"""
+Job Service
+
+Runs long operations (ISM, batch scoring) outside the HTTP request and
+keeps their state and results in a database, so a proxy timeout or a
+closed browser tab no longer throws the work away.
+
+IMPORTANT: API keys are NOT persisted. A job holds the key in memory only
+while it runs; the database stores a SHA-256 fingerprint so that only the
+submitting key can read or cancel the job.
+
+Several workers may share one database. Each job is leased by the worker
+that runs it, which renews a heartbeat while the job is queued or
+running; jobs whose lease expired (their worker died) are marked
+"interrupted" by whichever worker notices. Cancelling a job owned by
+another worker sets a flag that its owner polls. Once a job reaches a
+finished state it is never overwritten.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import (
+    Boolean, DateTime, LargeBinary, String, Text, select, update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from ..config import get_settings
+from . import result_codec
+from .client_pool import fingerprint_api_key
+
+logger = logging.getLogger(__name__)
+
+JobRunner = Callable[[str, dict[str, Any]], Awaitable[Any]]
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+INTERRUPTED = "interrupted"
+
+FINISHED_STATES = {SUCCEEDED, FAILED, CANCELLED, INTERRUPTED}
+ACTIVE_STATES = [QUEUED, RUNNING]
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class JobRecord(_Base):
+    """Persistent job state."""
+
+    __tablename__ = "jobs"
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(32))
+    status: Mapped[str] = mapped_column(String(16), index=True)
+    owner: Mapped[str] = mapped_column(String(64), index=True)
+    params: Mapped[str] = mapped_column(Text)
+    result: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Lease: the worker running the job and its last heartbeat
+    worker_id: Mapped[str | None] = mapped_column(String(32), nullable=True, index=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    cancel_requested: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "params": json.loads(self.params),
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobService:
+    """Durable job queue with bounded worker concurrency."""
+
+    def __init__(self, database_url: str, max_concurrency: int = 2, lease_seconds: float = 60):
+        self.database_url = database_url
+        self.max_concurrency = max_concurrency
+        self.lease_seconds = lease_seconds
+        self.worker_id = uuid.uuid4().hex
+        self._engine = None
+        self._sessions: async_sessionmaker[AsyncSession] | None = None
+        self._runners: dict[str, JobRunner] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._slots: asyncio.Semaphore | None = None
+        self._heartbeat: asyncio.Task | None = None
+        self._closing = False
+
+    def register(self, kind: str, runner: JobRunner) -> None:
+        """Register the coroutine that executes jobs of `kind`."""
+        self._runners[kind] = runner
+
+    async def start(self) -> None:
+        """Create tables, interrupt jobs with expired leases and start heartbeating."""
+        if self.database_url.startswith("sqlite"):
+            path = self.database_url.split(":///", 1)[-1]
+            if path and path != ":memory:":
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._engine = create_async_engine(self.database_url)
+        self._sessions = async_sessionmaker(self._engine, expire_on_commit=False)
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._engine.begin() as conn:
+            await conn.run_sync(_Base.metadata.create_all)
+
+        await self._recover_expired()
+        self._closing = False
+        self._heartbeat = asyncio.create_task(self._heartbeat_loop())
+
+    async def close(self) -> None:
+        """Stop running jobs (recorded as interrupted) and dispose of the engine."""
+        self._closing = True
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            await asyncio.gather(self._heartbeat, return_exceptions=True)
+            self._heartbeat = None
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+
+    # ============ Leases ============
+
+    async def _heartbeat_loop(self) -> None:
+        """Renew this worker's leases, honour cancel flags, recover dead workers' jobs."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await self._renew_leases()
+                await self._poll_cancellations()
+                await self._recover_expired()
+            except Exception as e:
+                logger.warning(f"Job heartbeat failed: {e}")
+
+    async def _renew_leases(self) -> None:
+        if not self._tasks:
+            return
+        async with self._sessions() as session:
+            await session.execute(
+                update(JobRecord)
+                .where(
+                    JobRecord.worker_id == self.worker_id,
+                    JobRecord.status.in_(ACTIVE_STATES),
+                )
+                .values(heartbeat_at=datetime.utcnow())
+            )
+            await session.commit()
+
+    async def _poll_cancellations(self) -> None:
+        """Cancel local jobs that another worker was asked to cancel."""
+        if not self._tasks:
+            return
+        async with self._sessions() as session:
+            flagged = await session.scalars(
+                select(JobRecord.id).where(
+                    JobRecord.id.in_(list(self._tasks)),
+                    JobRecord.cancel_requested.is_(True),
+                )
+            )
+            job_ids = list(flagged)
+        for job_id in job_ids:
+            task = self._tasks.get(job_id)
+            if task is not None:
+                logger.info(f"Cancelling job {job_id} on request from another worker")
+                task.cancel()
+
+    async def _recover_expired(self) -> None:
+        """Mark queued/running jobs whose worker stopped heartbeating as interrupted."""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.lease_seconds)
+        async with self._sessions() as session:
+            orphaned = await session.execute(
+                update(JobRecord)
+                .where(
+                    JobRecord.status.in_(ACTIVE_STATES),
+                    (JobRecord.heartbeat_at < cutoff) | JobRecord.heartbeat_at.is_(None),
+                )
+                .values(
+                    status=INTERRUPTED,
+                    error="Server stopped before the job finished; please resubmit",
+                    finished_at=datetime.utcnow(),
+                )
+            )
+            await session.commit()
+        if orphaned.rowcount:
+            logger.info(f"Marked {orphaned.rowcount} orphaned job(s) as interrupted")
+
+    # ============ Jobs ============
+
+    async def submit(self, api_key: str, kind: str, params: dict[str, Any]) -> dict[str, Any]:
+        """
+        Persist a new job and schedule it.
+
+        Args:
+            api_key: User's AlphaGenome API key (kept in memory only)
+            kind: Registered job kind
+            params: JSON-serializable job parameters
+
+        Returns:
+            Job status dict
+        """
+        if kind not in self._runners:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        record = JobRecord(
+            id=uuid.uuid4().hex,
+            kind=kind,
+            status=QUEUED,
+            owner=fingerprint_api_key(api_key),
+            params=json.dumps(params, default=str),
+            created_at=datetime.utcnow(),
+            worker_id=self.worker_id,
+            heartbeat_at=datetime.utcnow(),
+            cancel_requested=False,
+        )
+        async with self._sessions() as session:
+            session.add(record)
+            await session.commit()
+
+        task = asyncio.create_task(self._run(record.id, api_key, kind, params))
+        self._tasks[record.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(record.id, None))
+        return record.to_dict()
+
+    async def _run(self, job_id: str, api_key: str, kind: str, params: dict[str, Any]) -> None:
+        try:
+            async with self._slots:
+                started = await self._update(
+                    job_id, [QUEUED], status=RUNNING, started_at=datetime.utcnow()
+                )
+                if not started:
+                    return  # cancelled or interrupted while queued
+                result = await self._runners[kind](api_key, params)
+                packed = await asyncio.to_thread(result_codec.pack, result)
+                await self._update(
+                    job_id,
+                    [RUNNING],
+                    status=SUCCEEDED,
+                    result=packed,
+                    finished_at=datetime.utcnow(),
+                )
+        except asyncio.CancelledError:
+            if self._closing:
+                await self._update(
+                    job_id,
+                    ACTIVE_STATES,
+                    status=INTERRUPTED,
+                    error="Server shut down before the job finished; please resubmit",
+                    finished_at=datetime.utcnow(),
+                )
+            else:
+                await self._update(
+                    job_id, ACTIVE_STATES, status=CANCELLED, finished_at=datetime.utcnow()
+                )
+            raise
+        except Exception as e:
+            logger.exception(f"Job {job_id} ({kind}) failed: {e}")
+            await self._update(
+                job_id, ACTIVE_STATES, status=FAILED, error=str(e), finished_at=datetime.utcnow()
+            )
+
+    async def _update(self, job_id: str, from_states: list[str], **values: Any) -> bool:
+        """
+        Move a job on from one of `from_states`; False if it was not in one.
+
+        The state guard is what keeps finished jobs final: a job cancelled
+        or interrupted elsewhere is never overwritten by its runner.
+        """
+        async with self._sessions() as session:
+            updated = await session.execute(
+                update(JobRecord)
+                .where(JobRecord.id == job_id, JobRecord.status.in_(from_states))
+                .values(**values)
+            )
+            await session.commit()
+        return updated.rowcount > 0
+
+    async def _load(self, job_id: str, api_key: str) -> JobRecord | None:
+        async with self._sessions() as session:
+            record = await session.scalar(select(JobRecord).where(JobRecord.id == job_id))
+        if record is None or record.owner != fingerprint_api_key(api_key):
+            return None
+        return record
+
+    async def get(self, job_id: str, api_key: str) -> dict[str, Any] | None:
+        """Job status, or None if it does not exist for this key."""
+        record = await self._load(job_id, api_key)
+        return record.to_dict() if record else None
+
+    async def get_result(self, job_id: str, api_key: str) -> tuple[dict[str, Any], Any] | None:
+        """(status, result) for a job; result is None until it succeeds."""
+        record = await self._load(job_id, api_key)
+        if record is None:
+            return None
+        result = None
+        if record.result:
+            result = await asyncio.to_thread(result_codec.unpack, record.result)
+        return record.to_dict(), result
+
+    async def cancel(self, job_id: str, api_key: str) -> dict[str, Any] | None:
+        """
+        Cancel a queued or running job; finished jobs are left as-is.
+
+        A job running on another worker is marked cancelled right away
+        and flagged; its worker stops it at the next heartbeat.
+        """
+        record = await self._load(job_id, api_key)
+        if record is None:
+            return None
+        task = self._tasks.get(job_id)
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        elif record.status not in FINISHED_STATES:
+            await self._update(
+                job_id,
+                ACTIVE_STATES,
+                status=CANCELLED,
+                cancel_requested=True,
+                finished_at=datetime.utcnow(),
+            )
+        return await self.get(job_id, api_key)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "active": len(self._tasks),
+            "max_concurrency": self.max_concurrency,
+            "lease_seconds": self.lease_seconds,
+        }
+
+
+# Singleton instance
+_settings = get_settings()
+job_service = JobService(
+    _settings.job_database_url, _settings.job_max_concurrency, _settings.job_lease_seconds
+)
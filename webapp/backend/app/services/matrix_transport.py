@@ -0,0 +1,122 @@
+"""
+Matrix Transport
+
+Encodings for numeric matrices (currently the ISM matrix) that avoid
+turning every element into a boxed Python float inside JSON.
+
+- JSON lists: the original format, kept as the default
+- JSON base64: raw little-endian float32 bytes in a string field
+- application/x-npy: a NumPy .npy file (header + raw buffer)
+- Arrow IPC stream: one FixedSizeList<float32> column, one row per position
+
+The binary encodings hand the array's own buffer to the response, so no
+per-element work is done in Python.
+"""
+
+import base64
+import io
+from typing import Any
+
+import numpy as np
+
+JSON_MEDIA_TYPE = "application/json"
+NPY_MEDIA_TYPE = "application/x-npy"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+MATRIX_MEDIA_TYPES = (JSON_MEDIA_TYPE, NPY_MEDIA_TYPE, ARROW_MEDIA_TYPE)
+
+
+def negotiate_media_type(accept: str | None) -> str:
+    """
+    Pick the matrix media type from an Accept header.
+
+    Honours q-values; wildcards, missing headers and unsupported types
+    fall back to JSON so existing clients keep working.
+    """
+    if not accept:
+        return JSON_MEDIA_TYPE
+
+    best, best_q = JSON_MEDIA_TYPE, 0.0
+    for position, entry in enumerate(accept.split(",")):
+        media_type, *params = [part.strip() for part in entry.split(";")]
+        if media_type.lower() not in MATRIX_MEDIA_TYPES:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > best_q:
+            best, best_q = media_type.lower(), q
+    return best
+
+
+def as_float32(matrix: np.ndarray) -> np.ndarray:
+    """C-contiguous little-endian float32 view of `matrix` (copies only if needed)."""
+    return np.ascontiguousarray(matrix, dtype="<f4")
+
+
+def _byte_view(matrix: np.ndarray) -> memoryview:
+    return memoryview(matrix).cast("B")
+
+
+def encode_matrix_json(matrix: np.ndarray, encoding: str = "list") -> dict[str, Any]:
+    """
+    JSON fields for a matrix.
+
+    Args:
+        matrix: 2D array
+        encoding: "list" for nested lists of floats, "base64" for raw
+            float32 bytes in `ism_matrix_b64`
+
+    Returns:
+        Dict with the matrix field(s) plus `shape` (and `dtype` for base64)
+    """
+    matrix = as_float32(matrix)
+    if encoding == "base64":
+        return {
+            "ism_matrix_b64": base64.b64encode(_byte_view(matrix)).decode("ascii"),
+            "dtype": "float32",
+            "shape": list(matrix.shape),
+        }
+    return {"ism_matrix": matrix.tolist(), "shape": list(matrix.shape)}
+
+
+def npy_chunks(matrix: np.ndarray) -> list[bytes | memoryview]:
+    """The .npy header followed by a zero-copy view of the data buffer."""
+    matrix = as_float32(matrix)
+    header = io.BytesIO()
+    np.lib.format.write_array_header_1_0(
+        header, np.lib.format.header_data_from_array_1_0(matrix)
+    )
+    return [header.getvalue(), _byte_view(matrix)]
+
+
+def arrow_stream(
+    matrix: np.ndarray,
+    columns: str = "ACGT",
+    metadata: dict[str, str] | None = None,
+) -> memoryview:
+    """
+    Serialize a (rows, len(columns)) matrix as an Arrow IPC stream.
+
+    Requires pyarrow; raises ImportError when it is not installed.
+    """
+    import pyarrow as pa
+
+    matrix = as_float32(matrix)
+    # pa.array over a contiguous float32 buffer wraps it without copying
+    values = pa.FixedSizeListArray.from_arrays(pa.array(matrix.reshape(-1)), matrix.shape[1])
+    schema = pa.schema(
+        [pa.field("scores", values.type)],
+        metadata={"columns": columns, **(metadata or {})},
+    )
+    batch = pa.record_batch([values], schema=schema)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        writer.write_batch(batch)
+    return memoryview(sink.getvalue())
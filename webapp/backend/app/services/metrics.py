@@ -0,0 +1,347 @@
+"""
+Metrics
+
+Counters, gauges and histograms rendered in the Prometheus text exposition
+format for `GET /metrics`.
+
+Values live in plain dicts keyed by label values and are updated without
+locks: every update happens on the event loop thread (request handling,
+upstream call bookkeeping, export rendering), so an observation costs a
+dict lookup and, for histograms, a bisect over the bucket bounds.
+
+Counters that services already keep for `/stats` (cache hits, queue
+depth, breaker decisions, ...) are not duplicated; `runtime_samples`
+turns a `/stats` snapshot into metric families at scrape time.
+"""
+
+import bisect
+import math
+from typing import Any, Iterable
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300,
+)
+SIZE_BUCKETS = tuple(float(4 ** i) for i in range(4, 15))  # 256 B .. 256 MiB
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[Any]) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+
+class Counter(_Metric):
+    """Monotonic counter."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labelvalues: Any, amount: float = 1) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self) -> list[str]:
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+            for k, v in self._values.items()
+        ]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labelvalues: Any, amount: float = 1) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def dec(self, *labelvalues: Any, amount: float = 1) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0) - amount
+
+    def render(self) -> list[str]:
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+            for k, v in self._values.items()
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last is +Inf), sum]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labelvalues: Any) -> None:
+        series = self._series.get(labelvalues)
+        if series is None:
+            series = [[0] * (len(self.buckets) + 1), 0.0]
+            self._series[labelvalues] = series
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        names = self.labelnames + ("le",)
+        for labelvalues, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                labels = _format_labels(names, labelvalues + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics rendered together."""
+
+    def __init__(self, prefix: str = "alphagenome_explorer"):
+        self.prefix = prefix
+        self._metrics: list[_Metric] = []
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(f"{self.prefix}_{name}", documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(f"{self.prefix}_{name}", documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(
+            Histogram(f"{self.prefix}_{name}", documentation, labelnames, buckets)
+        )
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self, stats: dict[str, Any] | None = None) -> str:
+        """Exposition text for all metrics, plus families derived from `stats`."""
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines += metric.render()
+        if stats is not None:
+            lines += runtime_samples(self.prefix, stats)
+        return "\n".join(lines) + "\n"
+
+
+# ============ Scrape-time families from /stats ============
+
+def _family(
+    name: str,
+    kind: str,
+    documentation: str,
+    samples: list[tuple[dict[str, Any], float | None]],
+) -> list[str]:
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        if value is None:
+            continue
+        lines.append(f"{name}{_format_labels(labels.keys(), labels.values())} {_format_value(value)}")
+    return lines
+
+
+def runtime_samples(prefix: str, stats: dict[str, Any]) -> list[str]:
+    """Metric families for the counters in a `/stats` snapshot."""
+    lines: list[str] = []
+
+    cache = stats.get("result_cache") or {}
+    if cache:
+        lines += _family(
+            f"{prefix}_result_cache_lookups_total", "counter",
+            "Result cache lookups by outcome.",
+            [({"result": "hit"}, cache["hits"]), ({"result": "miss"}, cache["misses"])],
+        )
+        lines += _family(
+            f"{prefix}_result_cache_hit_ratio", "gauge",
+            "Share of result cache lookups served from the cache.",
+            [({}, cache["hit_ratio"])],
+        )
+        lines += _family(
+            f"{prefix}_result_cache_written_bytes_total", "counter",
+            "Bytes written to the result cache.",
+            [({}, cache["bytes_written"])],
+        )
+
+    pool = stats.get("client_pool") or {}
+    if pool:
+        lines += _family(
+            f"{prefix}_client_pool_hit_ratio", "gauge",
+            "Share of requests reusing a pooled AlphaGenome client.",
+            [({}, pool["hit_ratio"])],
+        )
+        lines += _family(
+            f"{prefix}_client_pool_size", "gauge",
+            "Pooled AlphaGenome clients.",
+            [({}, pool["size"])],
+        )
+
+    slicing = stats.get("interval_slicing") or {}
+    if slicing:
+        lines += _family(
+            f"{prefix}_interval_slice_hit_ratio", "gauge",
+            "Share of interval queries answered by slicing a cached window.",
+            [({}, slicing["slice_hit_rate"])],
+        )
+
+    endpoints = (stats.get("upstream") or {}).get("endpoints", {})
+    lines += _family(
+        f"{prefix}_upstream_in_flight", "gauge",
+        "Upstream calls running in the thread pool.",
+        [({"method": m}, s["running"]) for m, s in endpoints.items()],
+    )
+    lines += _family(
+        f"{prefix}_upstream_queued", "gauge",
+        "Upstream calls waiting for their method's concurrency cap.",
+        [({"method": m}, s["waiting"]) for m, s in endpoints.items()],
+    )
+
+    lines += _family(
+        f"{prefix}_upstream_abandoned", "gauge",
+        "Upstream calls still running after their caller gave up (timeout, lost hedge).",
+        [({"method": m}, s["abandoned"]) for m, s in endpoints.items()],
+    )
+
+    resilience = (stats.get("resilience") or {}).get("endpoints", {})
+    decisions = (
+        "attempts", "retries", "retries_exhausted", "non_retryable",
+        "attempt_timeouts", "hedges", "hedges_won", "short_circuited", "circuit_opened",
+    )
+    lines += _family(
+        f"{prefix}_upstream_decisions_total", "counter",
+        "Retry, hedging and circuit-breaker decisions per upstream method.",
+        [
+            ({"method": m, "decision": d}, s[d])
+            for m, s in resilience.items()
+            for d in decisions
+        ],
+    )
+    lines += _family(
+        f"{prefix}_upstream_circuit_open", "gauge",
+        "1 while the method's circuit breaker is open or half-open.",
+        [({"method": m}, float(s["circuit"] != "closed")) for m, s in resilience.items()],
+    )
+
+    limits = stats.get("rate_limits") or {}
+    if limits:
+        lines += _family(
+            f"{prefix}_rate_limit_admitted_total", "counter",
+            "Requests admitted by the rate limiter.",
+            [({}, limits["admitted"])],
+        )
+        lines += _family(
+            f"{prefix}_rate_limit_rejected_total", "counter",
+            "Requests rejected by the rate limiter, by exhausted bucket.",
+            [({"bucket": b}, n) for b, n in limits["limited"].items()],
+        )
+
+    store = stats.get("result_store") or {}
+    if store:
+        lines += _family(
+            f"{prefix}_result_store_entries", "gauge",
+            "Results kept for on-demand exports.",
+            [({}, store["entries"])],
+        )
+
+    jobs = stats.get("jobs") or {}
+    if jobs:
+        lines += _family(
+            f"{prefix}_jobs_active", "gauge",
+            "Background jobs running.",
+            [({}, jobs["active"])],
+        )
+    return lines
+
+
+# ============ Metric definitions ============
+
+metrics = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_FLIGHT = metrics.gauge(
+    "http_requests_in_flight",
+    "HTTP requests being handled.",
+    ("method",),
+)
+HTTP_REQUEST_BYTES = metrics.histogram(
+    "http_request_size_bytes",
+    "HTTP request body size by route template.",
+    ("method", "route"),
+    SIZE_BUCKETS,
+)
+HTTP_RESPONSE_BYTES = metrics.histogram(
+    "http_response_size_bytes",
+    "HTTP response body size by route template.",
+    ("method", "route"),
+    SIZE_BUCKETS,
+)
+UPSTREAM_CALL_SECONDS = metrics.histogram(
+    "upstream_call_duration_seconds",
+    "AlphaGenome call latency per attempt, including pool queueing.",
+    ("method", "outcome"),
+)
+EXPORT_RENDER_SECONDS = metrics.histogram(
+    "export_render_duration_seconds",
+    "Export rendering time by format.",
+    ("format",),
+)
+EXPORT_BYTES = metrics.histogram(
+    "export_size_bytes",
+    "Rendered export size by format.",
+    ("format",),
+    SIZE_BUCKETS,
+)
@@ -0,0 +1,290 @@
+"""
+Profiler
+
+On-demand profiling of live requests and memory-growth tracking.
+
+- `cprofile`: deterministic profile of the event loop thread, saved as a
+  pstats file. While enabled it also sees other requests interleaved on
+  the loop, so profile on a quiet instance when possible.
+- `sample`: a background thread samples the stacks of the event loop and
+  upstream worker threads every few milliseconds and saves them as
+  collapsed stacks (`frame;frame;frame count`), the input format of
+  flamegraph.pl, speedscope and similar tools.
+
+Profiles are written to `Settings.profile_dir` and listed and served by
+the admin routes. `MemoryTracker` wraps `tracemalloc` to diff successive
+snapshots, e.g. before and after a batch of ISM runs or exports.
+"""
+
+import cProfile
+import hmac
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from ..config import get_settings
+
+PROFILE_MODES = ("cprofile", "sample")
+PROFILE_SUFFIXES = {"cprofile": ".prof", "sample": ".collapsed"}
+
+# Threads sampled besides the one running the request
+SAMPLED_THREAD_PREFIX = "alphagenome-upstream"
+
+
+def is_admin(token: str | None) -> bool:
+    """Whether `token` matches the configured admin token (never if unset)."""
+    expected = get_settings().admin_token
+    if not expected or not token:
+        return False
+    return hmac.compare_digest(token.encode(), expected.encode())
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _idle_worker(frame) -> bool:
+    """A pool thread blocked waiting for work (its leaf frame is the worker loop)."""
+    return frame.f_code.co_name == "_worker" and frame.f_code.co_filename.endswith(
+        os.path.join("concurrent", "futures", "thread.py")
+    )
+
+
+class SamplingProfiler:
+    """Collapsed-stack sampler for the calling thread and upstream workers."""
+
+    def __init__(self, interval_ms: float = 5):
+        self.interval = interval_ms / 1000
+        self.samples: Counter[str] = Counter()
+        self._target = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="request-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        names = {}
+        while not self._stop.wait(self.interval):
+            names.update({t.ident: t.name for t in threading.enumerate()})
+            for ident, frame in sys._current_frames().items():
+                name = names.get(ident, "")
+                if ident != self._target and not name.startswith(SAMPLED_THREAD_PREFIX):
+                    continue
+                if ident != self._target and _idle_worker(frame):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                root = "event-loop" if ident == self._target else SAMPLED_THREAD_PREFIX
+                self.samples[";".join([root] + stack[::-1])] += 1
+
+    def collapsed(self) -> bytes:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.items()).encode()
+
+
+class ProfileStore:
+    """Saved request profiles in a directory, newest first."""
+
+    def __init__(self, directory: str, max_profiles: int = 100):
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+
+    @staticmethod
+    def new_id() -> str:
+        return f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+    def save(self, profile_id: str, mode: str, data: bytes, label: str) -> None:
+        """Write a profile under `profile_id` (from `new_id`)."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{profile_id}{PROFILE_SUFFIXES[mode]}"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        (self.directory / f"{profile_id}.txt").write_text(label)
+        self._prune()
+
+    def _profiles(self) -> list[Path]:
+        paths = [
+            p for p in self.directory.glob("*")
+            if p.suffix in PROFILE_SUFFIXES.values()
+        ] if self.directory.exists() else []
+        return sorted(paths, key=lambda p: p.name, reverse=True)
+
+    def _prune(self) -> None:
+        for path in self._profiles()[self.max_profiles:]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".txt").unlink(missing_ok=True)
+
+    def list(self) -> list[dict[str, Any]]:
+        profiles = []
+        for path in self._profiles():
+            label = path.with_suffix(".txt")
+            profiles.append(
+                {
+                    "profile_id": path.stem,
+                    "mode": "cprofile" if path.suffix == ".prof" else "sample",
+                    "request": label.read_text() if label.exists() else "",
+                    "size_bytes": path.stat().st_size,
+                }
+            )
+        return profiles
+
+    def path(self, profile_id: str) -> Path | None:
+        if not profile_id.replace("-", "").isalnum():
+            return None
+        for suffix in PROFILE_SUFFIXES.values():
+            path = self.directory / f"{profile_id}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+
+def pstats_text(path: Path, limit: int = 50, sort: str = "cumulative") -> str:
+    """Human-readable top functions of a saved cProfile."""
+    out = io.StringIO()
+    stats = pstats.Stats(str(path), stream=out)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+class RequestProfile:
+    """Profile one request in `mode` ("cprofile" or "sample")."""
+
+    def __init__(self, mode: str, interval_ms: float = 5):
+        self.mode = mode
+        self._profile = cProfile.Profile() if mode == "cprofile" else None
+        self._sampler = SamplingProfiler(interval_ms) if mode == "sample" else None
+
+    def __enter__(self) -> "RequestProfile":
+        if self._profile is not None:
+            self._profile.enable()
+        else:
+            self._sampler.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._profile is not None:
+            self._profile.disable()
+        else:
+            self._sampler.stop()
+
+    def dump(self) -> bytes:
+        if self._profile is not None:
+            # Same bytes Profile.dump_stats writes, without a temp file
+            self._profile.create_stats()
+            return marshal.dumps(self._profile.stats)
+        return self._sampler.collapsed()
+
+
+def _location(stat, key_type: str) -> str | list[str]:
+    if key_type == "traceback":
+        return stat.traceback.format()
+    return str(stat.traceback)  # "file:line" of the allocation site
+
+
+class MemoryTracker:
+    """tracemalloc snapshots diffed against the previous one."""
+
+    def __init__(self):
+        self._previous: tracemalloc.Snapshot | None = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 10) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self._previous = tracemalloc.take_snapshot()
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        self._previous = None
+
+    def diff(
+        self,
+        top: int = 25,
+        key_type: str = "lineno",
+        path_filter: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Allocation growth since the previous snapshot (or `start`).
+
+        Args:
+            top: Number of entries to return, largest growth first
+            key_type: "lineno", "filename" or "traceback"
+            path_filter: Only count allocations made with a file whose path
+                contains this string on the stack (e.g. "export_service")
+        """
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not running")
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ]
+        )
+        previous = self._previous
+        self._previous = snapshot
+        if path_filter:
+            path_filter_glob = f"*{path_filter}*"
+            only = [tracemalloc.Filter(True, path_filter_glob, all_frames=True)]
+            snapshot = snapshot.filter_traces(only)
+            if previous is not None:
+                previous = previous.filter_traces(only)
+
+        if previous is None:
+            entries = [
+                {
+                    "location": _location(stat, key_type),
+                    "size_bytes": stat.size,
+                    "count": stat.count,
+                }
+                for stat in snapshot.statistics(key_type)[:top]
+            ]
+        else:
+            entries = [
+                {
+                    "location": _location(stat, key_type),
+                    "size_diff_bytes": stat.size_diff,
+                    "size_bytes": stat.size,
+                    "count_diff": stat.count_diff,
+                    "count": stat.count,
+                }
+                for stat in snapshot.compare_to(previous, key_type)[:top]
+            ]
+
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "compared_to_previous": previous is not None,
+            "traced_bytes": current,
+            "peak_traced_bytes": peak,
+            "key_type": key_type,
+            "path_filter": path_filter,
+            "entries": entries,
+        }
+
+
+# Singleton instances
+_settings = get_settings()
+profile_store = ProfileStore(_settings.profile_dir, _settings.profile_max_saved)
+memory_tracker = MemoryTracker()
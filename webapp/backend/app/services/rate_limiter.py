@@ -0,0 +1,374 @@
+"""
+Rate Limiter
+
+Token buckets per caller, keyed by a hash of the X-API-Key header (or the
+client address for anonymous requests).
+
+Every API request takes one token from the "requests" bucket. Prediction
+endpoints also take their cost in upstream predictions (an ISM run costs
+3 per mutated bp) from the "predictions" bucket, which refills per minute,
+and from the "daily" bucket, which keeps a key under the upstream daily
+quota. A request is admitted only if every bucket it draws from can pay;
+otherwise nothing is taken and the caller is told how long to wait. Tile
+reads take their token from a separate "tiles" bucket instead, so panning
+a genome browser does not use up the request budget.
+
+A request costing more than a bucket's capacity is admitted once that
+bucket is full and leaves it in debt, so large batches are paced rather
+than rejected outright.
+
+The cost is an estimate taken before the request runs. Predictions it
+was charged for but then served from the result cache (or an ISM
+checkpoint) are reported with `record_cache_hit` and refunded to the
+prediction and daily buckets once the request finishes.
+
+Buckets live in Redis when `Settings.redis_url` is set (shared by all
+workers, updated atomically by a Lua script) and in process memory
+otherwise. Redis errors never fail a request: the local buckets are used
+instead.
+"""
+
+import logging
+import math
+import time
+from collections import OrderedDict
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Any
+
+from ..config import get_settings
+from .client_pool import fingerprint_api_key
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Bucket:
+    """A token bucket: `capacity` tokens, refilled at `refill_per_second`."""
+    name: str
+    capacity: float
+    refill_per_second: float
+
+
+@dataclass
+class Decision:
+    """Outcome of one admission check."""
+    allowed: bool
+    # Bucket name -> tokens left (after this request, if admitted)
+    remaining: dict[str, float]
+    retry_after: float = 0.0
+    limited_by: str | None = None
+
+
+def _refill(bucket: Bucket, tokens: float, elapsed: float) -> float:
+    return min(bucket.capacity, tokens + max(0.0, elapsed) * bucket.refill_per_second)
+
+
+def _full_refill_seconds(bucket: Bucket) -> int:
+    return math.ceil(bucket.capacity / bucket.refill_per_second) + 60
+
+
+# ============ Cache refunds ============
+
+class CacheSavings:
+    """Predictions a request was charged for but served from cache."""
+
+    def __init__(self):
+        self.predictions = 0.0
+
+
+_savings: ContextVar[CacheSavings | None] = ContextVar("rate_limit_savings", default=None)
+
+
+def track_savings() -> tuple[CacheSavings, Token]:
+    """Start collecting cache savings for the current request."""
+    savings = CacheSavings()
+    return savings, _savings.set(savings)
+
+
+def finish_savings(token: Token) -> None:
+    _savings.reset(token)
+
+
+def record_cache_hit(predictions: float = 1) -> None:
+    """Note `predictions` the current request got from cache (no-op outside one)."""
+    savings = _savings.get()
+    if savings is not None:
+        savings.predictions += predictions
+
+
+class MemoryBucketStore:
+    """Bucket state in process memory, bounded by least-recent use."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        # (bucket name, identity) -> (tokens, updated at)
+        self._state: OrderedDict[tuple[str, str], tuple[float, float]] = OrderedDict()
+
+    async def take(self, identity: str, charges: list[tuple[Bucket, float]]) -> Decision:
+        now = time.monotonic()
+        levels = []
+        decision = Decision(allowed=True, remaining={})
+        for bucket, cost in charges:
+            saved = self._state.get((bucket.name, identity))
+            tokens = bucket.capacity if saved is None else _refill(bucket, saved[0], now - saved[1])
+            levels.append(tokens)
+            required = min(cost, bucket.capacity)
+            if tokens < required:
+                decision.allowed = False
+                wait = (required - tokens) / bucket.refill_per_second
+                if wait > decision.retry_after:
+                    decision.retry_after = wait
+                    decision.limited_by = bucket.name
+
+        for (bucket, cost), tokens in zip(charges, levels):
+            if decision.allowed:
+                tokens -= cost
+            key = (bucket.name, identity)
+            self._state[key] = (tokens, now)
+            self._state.move_to_end(key)
+            decision.remaining[bucket.name] = tokens
+
+        while len(self._state) > self.max_entries:
+            self._state.popitem(last=False)
+        return decision
+
+    async def refund(self, identity: str, charges: list[tuple[Bucket, float]]) -> None:
+        now = time.monotonic()
+        for bucket, amount in charges:
+            saved = self._state.get((bucket.name, identity))
+            if saved is not None:
+                tokens = _refill(bucket, saved[0], now - saved[1])
+                self._state[(bucket.name, identity)] = (min(bucket.capacity, tokens + amount), now)
+
+    async def close(self) -> None:
+        self._state.clear()
+
+
+# KEYS: one hash per bucket. ARGV: now, then capacity, refill/s, cost and
+# expiry per bucket. Returns allowed, index of the limiting bucket (0 if
+# none), retry-after and each bucket's tokens; numbers as strings so Redis
+# does not truncate them to integers.
+_TAKE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local levels = {}
+local allowed = 1
+local limited_by = 0
+local retry_after = 0
+for i, key in ipairs(KEYS) do
+    local base = 2 + (i - 1) * 4
+    local capacity = tonumber(ARGV[base])
+    local rate = tonumber(ARGV[base + 1])
+    local cost = tonumber(ARGV[base + 2])
+    local saved = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = capacity
+    if saved[1] then
+        tokens = math.min(capacity, tonumber(saved[1]) + math.max(0, now - tonumber(saved[2])) * rate)
+    end
+    local required = math.min(cost, capacity)
+    if tokens < required then
+        allowed = 0
+        local wait = (required - tokens) / rate
+        if wait > retry_after then
+            retry_after = wait
+            limited_by = i
+        end
+    end
+    levels[i] = tokens
+end
+local result = {allowed, limited_by, tostring(retry_after)}
+for i, key in ipairs(KEYS) do
+    local base = 2 + (i - 1) * 4
+    if allowed == 1 then
+        levels[i] = levels[i] - tonumber(ARGV[base + 2])
+    end
+    redis.call('HSET', key, 'tokens', tostring(levels[i]), 'ts', ARGV[1])
+    redis.call('EXPIRE', key, tonumber(ARGV[base + 3]))
+    result[#result + 1] = tostring(levels[i])
+end
+return result
+"""
+
+# KEYS: one hash per bucket. ARGV: capacity and amount per bucket. Adds
+# the amount to buckets that exist, up to capacity.
+_REFUND_SCRIPT = """
+for i, key in ipairs(KEYS) do
+    local base = 1 + (i - 1) * 2
+    local tokens = redis.call('HGET', key, 'tokens')
+    if tokens then
+        local capacity = tonumber(ARGV[base])
+        local refunded = math.min(capacity, tonumber(tokens) + tonumber(ARGV[base + 1]))
+        redis.call('HSET', key, 'tokens', tostring(refunded))
+    end
+end
+return 1
+"""
+
+
+class RedisBucketStore:
+    """Bucket state in Redis, shared by all workers."""
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(url)
+        self._take = self._client.register_script(_TAKE_SCRIPT)
+        self._refund = self._client.register_script(_REFUND_SCRIPT)
+
+    async def take(self, identity: str, charges: list[tuple[Bucket, float]]) -> Decision:
+        keys = [f"ag:ratelimit:{bucket.name}:{identity}" for bucket, _ in charges]
+        args: list[Any] = [time.time()]
+        for bucket, cost in charges:
+            args += [bucket.capacity, bucket.refill_per_second, cost, _full_refill_seconds(bucket)]
+
+        allowed, limited_by, retry_after, *levels = await self._take(keys=keys, args=args)
+        return Decision(
+            allowed=bool(int(allowed)),
+            remaining={
+                bucket.name: float(level) for (bucket, _), level in zip(charges, levels)
+            },
+            retry_after=float(retry_after),
+            limited_by=charges[int(limited_by) - 1][0].name if int(limited_by) else None,
+        )
+
+    async def refund(self, identity: str, charges: list[tuple[Bucket, float]]) -> None:
+        keys = [f"ag:ratelimit:{bucket.name}:{identity}" for bucket, _ in charges]
+        args: list[Any] = []
+        for bucket, amount in charges:
+            args += [bucket.capacity, amount]
+        await self._refund(keys=keys, args=args)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class RateLimiter:
+    """Admission control front-end with Redis primary and local fallback."""
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        predictions_per_minute: int,
+        prediction_burst: int,
+        predictions_per_day: int = 0,
+        redis_url: str | None = None,
+        tiles_per_minute: int = 1200,
+    ):
+        self.requests = Bucket("requests", requests_per_minute, requests_per_minute / 60)
+        self.tiles = Bucket("tiles", tiles_per_minute, tiles_per_minute / 60)
+        self.predictions = Bucket("predictions", prediction_burst, predictions_per_minute / 60)
+        self.daily = (
+            Bucket("daily", predictions_per_day, predictions_per_day / 86400)
+            if predictions_per_day > 0
+            else None
+        )
+
+        self._memory = MemoryBucketStore()
+        self._redis: RedisBucketStore | None = None
+        if redis_url:
+            try:
+                self._redis = RedisBucketStore(redis_url)
+            except ImportError:
+                logger.warning("redis package not installed; using in-process rate limits")
+
+        self.admitted = 0
+        self.limited: dict[str, int] = {}
+        self.refunded = 0.0
+        self.errors = 0
+
+    @property
+    def backend(self) -> str:
+        return self._redis.name if self._redis else self._memory.name
+
+    @staticmethod
+    def identity(api_key: str | None, client_host: str | None) -> str:
+        """Bucket owner: the hashed API key, else the client address."""
+        if api_key:
+            return f"key:{fingerprint_api_key(api_key)[:32]}"
+        return f"ip:{client_host or 'unknown'}"
+
+    def charges(self, cost: float, base: Bucket | None = None) -> list[tuple[Bucket, float]]:
+        """
+        Buckets a request of `cost` upstream predictions draws from.
+
+        `base` is the bucket paying the request itself (default: requests).
+        """
+        charges = [(base or self.requests, 1.0)]
+        if cost > 0:
+            charges.append((self.predictions, cost))
+            if self.daily is not None:
+                charges.append((self.daily, cost))
+        return charges
+
+    async def check(self, identity: str, cost: float = 0, base: Bucket | None = None) -> Decision:
+        """Admit or reject one request, taking its tokens if admitted."""
+        charges = self.charges(cost, base)
+        if self._redis is not None:
+            try:
+                decision = await self._redis.take(identity, charges)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Redis rate limit check failed, using local buckets: {e}")
+                decision = await self._memory.take(identity, charges)
+        else:
+            decision = await self._memory.take(identity, charges)
+
+        if decision.allowed:
+            self.admitted += 1
+        else:
+            self.limited[decision.limited_by] = self.limited.get(decision.limited_by, 0) + 1
+        return decision
+
+    async def refund(self, identity: str, predictions: float) -> None:
+        """Return `predictions` to the prediction (and daily) buckets."""
+        if predictions <= 0:
+            return
+        charges = self.charges(predictions)[1:]
+        if self._redis is not None:
+            try:
+                await self._redis.refund(identity, charges)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Redis rate limit refund failed, using local buckets: {e}")
+                await self._memory.refund(identity, charges)
+        else:
+            await self._memory.refund(identity, charges)
+        self.refunded += predictions
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            try:
+                await self._redis.close()
+            except Exception as e:
+                logger.debug(f"Error closing Redis rate limiter: {e}")
+        await self._memory.close()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "requests_per_minute": self.requests.capacity,
+            "tiles_per_minute": self.tiles.capacity,
+            "prediction_burst": self.predictions.capacity,
+            "predictions_per_minute": round(self.predictions.refill_per_second * 60, 2),
+            "predictions_per_day": self.daily.capacity if self.daily else None,
+            "admitted": self.admitted,
+            "limited": dict(self.limited),
+            "refunded_predictions": self.refunded,
+            "errors": self.errors,
+        }
+
+
+# Singleton instance
+_settings = get_settings()
+rate_limiter = RateLimiter(
+    requests_per_minute=_settings.rate_limit_per_minute,
+    predictions_per_minute=_settings.rate_limit_predictions_per_minute,
+    prediction_burst=_settings.rate_limit_prediction_burst,
+    predictions_per_day=_settings.rate_limit_predictions_per_day,
+    redis_url=_settings.redis_url,
+    tiles_per_minute=_settings.rate_limit_tiles_per_minute,
+)
@@ -0,0 +1,84 @@
+"""
+Region Planner
+
+Splits a region larger than the model window into overlapping model
+windows. Predictions near a window's edges see less sequence context, so
+each window contributes only its central part; the kept parts tile the
+region exactly and can be stitched end to end.
+
+    region      |--------------------------------------------|
+    window 0  |-----[keep 0]-----|
+    window 1                |-----[keep 1]-----|
+    window 2                              |-----[keep 2]-----|
+"""
+
+from dataclasses import dataclass
+
+# Row alignment for outputs predicted at 128bp (ChIP); kept parts start
+# on a multiple of this within their window so native bins are not split
+NATIVE_ROW_ALIGN = 128
+
+
+@dataclass(frozen=True)
+class RegionWindow:
+    """One model window and the part of it kept in the stitched output."""
+    index: int
+    window_start: int
+    window_end: int
+    keep_start: int
+    keep_end: int
+
+    @property
+    def keep_offset(self) -> int:
+        """Position of the kept part relative to the window start."""
+        return self.keep_start - self.window_start
+
+
+def plan_windows(
+    start: int,
+    end: int,
+    window: int,
+    overlap: int,
+    align: int = 1,
+) -> list[RegionWindow]:
+    """
+    Plan model windows covering [start, end).
+
+    Args:
+        start: Region start (0-based)
+        end: Region end (exclusive)
+        window: Model window width in bp
+        overlap: Total overlap between neighbouring windows; half of it is
+            discarded at each edge of every window
+        align: Kept parts (except the last) are a multiple of this many bp,
+            so output bins never straddle two windows
+
+    Returns:
+        Windows in genomic order
+    """
+    if end <= start:
+        raise ValueError("Region end must be greater than start")
+
+    margin = (overlap // 2) // NATIVE_ROW_ALIGN * NATIVE_ROW_ALIGN
+    step = (window - 2 * margin) // align * align
+    if step <= 0:
+        raise ValueError(
+            f"Overlap {overlap} and alignment {align} leave no usable part of a {window}bp window"
+        )
+
+    windows: list[RegionWindow] = []
+    for index, keep_start in enumerate(range(start, end, step)):
+        window_start = keep_start - margin
+        if window_start < 0:
+            # Near the chromosome start: shift right, keeping native bins aligned
+            window_start = keep_start % NATIVE_ROW_ALIGN
+        windows.append(
+            RegionWindow(
+                index=index,
+                window_start=window_start,
+                window_end=window_start + window,
+                keep_start=keep_start,
+                keep_end=min(keep_start + step, end),
+            )
+        )
+    return windows
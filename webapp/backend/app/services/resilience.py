@@ -0,0 +1,352 @@
+"""
+Upstream Resilience
+
+Wraps every AlphaGenome call with:
+
+- Retries of transient failures the client does not already retry (gRPC
+  DEADLINE_EXCEEDED, ABORTED and connection errors) with exponential
+  backoff and full jitter. `DnaClient` retries UNAVAILABLE and
+  RESOURCE_EXHAUSTED itself, so those fail here at once, as does anything
+  else (bad arguments, invalid API key, ...).
+- Optional hedging: if an attempt is still running after the endpoint's
+  recent latency percentile, a duplicate is started and the first success
+  wins.
+- A circuit breaker per endpoint that counts only server-side failures
+  (UNAVAILABLE, DEADLINE_EXCEEDED, ABORTED, connection errors, attempt
+  timeouts): after enough in a row calls fail fast with `CircuitOpenError`
+  until a cool-down has passed, then a single probe call decides whether
+  to close it again. Errors caused by one caller (bad key, exhausted
+  quota, bad arguments) neither open nor reset it.
+
+Attempts run in the upstream thread pool, where a blocking call cannot be
+interrupted: a timed-out or losing hedge attempt is abandoned, and its
+worker thread stays busy until the gRPC call returns. Timed-out attempts
+are therefore not retried, which would pile more calls on an upstream
+that is still working on the first one.
+
+All state is only touched from the event loop thread, so no locking.
+"""
+
+import asyncio
+import logging
+import math
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, TypeVar
+
+import grpc
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# UNAVAILABLE and RESOURCE_EXHAUSTED are retried by DnaClient's own retry
+RETRYABLE_GRPC_CODES = frozenset(
+    {
+        grpc.StatusCode.DEADLINE_EXCEEDED,
+        grpc.StatusCode.ABORTED,
+    }
+)
+
+# Failures of the upstream service itself, as opposed to of one request
+SERVER_FAILURE_GRPC_CODES = RETRYABLE_GRPC_CODES | {grpc.StatusCode.UNAVAILABLE}
+
+
+class CircuitOpenError(RuntimeError):
+    """The upstream endpoint is failing; calls are refused until it recovers."""
+
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(
+            f"AlphaGenome {endpoint} is temporarily unavailable; "
+            f"retry in {math.ceil(retry_after)}s"
+        )
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class AttemptTimeoutError(TimeoutError):
+    """An attempt outlived the attempt timeout; its thread may still be running."""
+
+
+def _grpc_code(error: BaseException) -> grpc.StatusCode | None:
+    return error.code() if callable(getattr(error, "code", None)) else None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether `error` is a transient upstream failure worth retrying here."""
+    if isinstance(error, grpc.RpcError):
+        return _grpc_code(error) in RETRYABLE_GRPC_CODES
+    return isinstance(error, ConnectionError)
+
+
+def is_server_failure(error: BaseException) -> bool:
+    """Whether `error` says the upstream service is unhealthy (for the breaker)."""
+    if isinstance(error, grpc.RpcError):
+        return _grpc_code(error) in SERVER_FAILURE_GRPC_CODES
+    return isinstance(error, (ConnectionError, AttemptTimeoutError))
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff before retry number `attempt` (1-based)."""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opened = 0
+        self._probing = False
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now."""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_seconds:
+                return False
+            self.state = self.HALF_OPEN
+            self._probing = False
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def retry_after(self) -> float:
+        return max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._probing = False
+        self.state = self.CLOSED
+
+    def record_neutral(self) -> None:
+        """A call that says nothing about upstream health ended; free the probe."""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.opened += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class _EndpointState:
+    """Breaker, recent latencies and decision counters for one endpoint."""
+
+    def __init__(self, breaker: CircuitBreaker, window: int):
+        self.breaker = breaker
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.retries_exhausted = 0
+        self.non_retryable = 0
+        self.attempt_timeouts = 0
+        self.hedges = 0
+        self.hedges_won = 0
+        self.short_circuited = 0
+
+    def percentile(self, q: float) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def as_dict(self) -> dict[str, Any]:
+        p50 = self.percentile(0.5)
+        p95 = self.percentile(0.95)
+        return {
+            "circuit": self.breaker.state,
+            "circuit_opened": self.breaker.opened,
+            "consecutive_failures": self.breaker.failures,
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "retries_exhausted": self.retries_exhausted,
+            "non_retryable": self.non_retryable,
+            "attempt_timeouts": self.attempt_timeouts,
+            "hedges": self.hedges,
+            "hedges_won": self.hedges_won,
+            "short_circuited": self.short_circuited,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+
+class ResilientCaller:
+    """Retry, hedging and circuit-breaking policy for upstream calls."""
+
+    def __init__(
+        self,
+        attempt_timeout: float = 300,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 10,
+        hedge_methods: list[str] | None = None,
+        hedge_percentile: float = 0.95,
+        hedge_min_samples: int = 20,
+        breaker_failure_threshold: int = 5,
+        breaker_reset_seconds: float = 30,
+        latency_window: int = 200,
+    ):
+        self.attempt_timeout = attempt_timeout
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge_methods = frozenset(hedge_methods or ())
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker_failure_threshold = breaker_failure_threshold
+        self.breaker_reset_seconds = breaker_reset_seconds
+        self.latency_window = latency_window
+        self._endpoints: dict[str, _EndpointState] = {}
+
+    def _endpoint(self, endpoint: str) -> _EndpointState:
+        state = self._endpoints.get(endpoint)
+        if state is None:
+            state = _EndpointState(
+                CircuitBreaker(self.breaker_failure_threshold, self.breaker_reset_seconds),
+                self.latency_window,
+            )
+            self._endpoints[endpoint] = state
+        return state
+
+    async def call(self, endpoint: str, attempt: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `attempt` under the endpoint's retry, hedging and breaker policy.
+
+        Args:
+            endpoint: Upstream method name (one breaker per name)
+            attempt: Starts one upstream attempt; called again for each
+                retry or hedge, so it must be safe to repeat
+
+        Raises:
+            CircuitOpenError: The endpoint's circuit is open
+            Exception: The last attempt's error once retries are exhausted,
+                or the first non-retryable error
+        """
+        state = self._endpoint(endpoint)
+        state.calls += 1
+        for number in range(1, self.max_attempts + 1):
+            if not state.breaker.allow():
+                state.short_circuited += 1
+                raise CircuitOpenError(endpoint, state.breaker.retry_after())
+
+            try:
+                result = await self._attempt(endpoint, state, attempt)
+            except asyncio.CancelledError:
+                # No outcome (caller went away, outer timeout, job cancel);
+                # free a half-open probe so the next call can probe again
+                state.breaker.record_neutral()
+                raise
+            except Exception as e:
+                if is_server_failure(e):
+                    state.breaker.record_failure()
+                else:
+                    # Bad key, quota or arguments: one caller's problem
+                    state.breaker.record_neutral()
+                if not is_retryable(e):
+                    state.non_retryable += 1
+                    raise
+                if number == self.max_attempts or state.breaker.state != CircuitBreaker.CLOSED:
+                    state.retries_exhausted += 1
+                    raise
+                delay = backoff_delay(number, self.base_delay, self.max_delay)
+                state.retries += 1
+                logger.warning(
+                    f"{endpoint} attempt {number} failed ({type(e).__name__}: {e}); "
+                    f"retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+            else:
+                state.breaker.record_success()
+                return result
+
+    def _hedge_delay(self, endpoint: str, state: _EndpointState) -> float | None:
+        if endpoint not in self.hedge_methods or len(state.latencies) < self.hedge_min_samples:
+            return None
+        return state.percentile(self.hedge_percentile)
+
+    async def _attempt(
+        self,
+        endpoint: str,
+        state: _EndpointState,
+        attempt: Callable[[], Awaitable[T]],
+    ) -> T:
+        state.attempts += 1
+        started = time.monotonic()
+        hedge_after = self._hedge_delay(endpoint, state)
+        try:
+            if hedge_after is None:
+                result = await asyncio.wait_for(attempt(), self.attempt_timeout)
+            else:
+                result = await self._hedged(state, attempt, hedge_after)
+        except asyncio.TimeoutError:
+            state.attempt_timeouts += 1
+            raise AttemptTimeoutError(
+                f"{endpoint} attempt timed out after {self.attempt_timeout:g}s"
+            ) from None
+        state.latencies.append(time.monotonic() - started)
+        return result
+
+    async def _hedged(
+        self,
+        state: _EndpointState,
+        attempt: Callable[[], Awaitable[T]],
+        hedge_after: float,
+    ) -> T:
+        """Run `attempt`, racing a duplicate once it is slower than `hedge_after`."""
+        deadline = time.monotonic() + self.attempt_timeout
+        primary = asyncio.ensure_future(attempt())
+        pending = {primary}
+        hedge = None
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_after)
+            if not done:
+                state.hedges += 1
+                hedge = asyncio.ensure_future(attempt())
+                pending.add(hedge)
+
+            error: BaseException | None = None
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            state.hedges_won += 1
+                        return task.result()
+                    error = task.exception()
+                if not pending:
+                    raise error
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    raise asyncio.TimeoutError()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_attempts": self.max_attempts,
+            "attempt_timeout_seconds": self.attempt_timeout,
+            "hedge_methods": sorted(self.hedge_methods),
+            "endpoints": {name: s.as_dict() for name, s in self._endpoints.items()},
+        }
@@ -0,0 +1,215 @@
+"""
+Result Cache
+
+Content-addressed cache for prediction and scoring results.
+
+Keys are a SHA-256 over the canonical request parameters plus the
+installed alphagenome package version, so results computed by an older
+model client are never served after an upgrade. Values are opaque bytes
+produced by `result_codec`.
+
+Redis is used when `Settings.redis_url` is set and reachable; otherwise
+results live in an in-process LRU bounded by entry count and total bytes.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from importlib import metadata
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def _alphagenome_version() -> str:
+    try:
+        return metadata.version("alphagenome")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+ALPHAGENOME_VERSION = _alphagenome_version()
+
+
+def cache_key(kind: str, params: dict[str, Any]) -> str:
+    """
+    Build a canonical cache key.
+
+    Args:
+        kind: Result kind (e.g. "predict_variant")
+        params: Request parameters; lists should already be sorted
+
+    Returns:
+        Key of the form "ag:<kind>:<sha256>"
+    """
+    payload = {"kind": kind, "alphagenome": ALPHAGENOME_VERSION, "params": params}
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return f"ag:{kind}:{digest}"
+
+
+class MemoryCacheBackend:
+    """
+    LRU with per-entry expiry, bounded by entry count and total bytes.
+
+    Values larger than `max_entry_bytes` are not cached at all, so one
+    full-resolution prediction cannot flush everything else.
+    """
+
+    name = "memory"
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 512 * 1024 * 1024,
+        max_entry_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self.size_bytes = 0
+        self.skipped = 0
+
+    def _drop(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self.size_bytes -= len(value)
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        if key in self._entries:
+            self._drop(key)
+        if len(value) > self.max_entry_bytes:
+            self.skipped += 1
+            return
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self.size_bytes += len(value)
+        while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+
+    async def close(self) -> None:
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """Redis-backed cache shared by all workers."""
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        await self._client.set(key, value, ex=ttl_seconds)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class ResultCache:
+    """
+    Cache front-end with Redis primary and in-process LRU fallback.
+
+    Redis errors never fail a request: the operation is retried against
+    the local LRU and counted in `errors`.
+    """
+
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        ttl_seconds: int = 86400,
+        max_memory_entries: int = 1024,
+        max_memory_bytes: int = 512 * 1024 * 1024,
+        max_entry_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self._memory = MemoryCacheBackend(max_memory_entries, max_memory_bytes, max_entry_bytes)
+        self._redis: RedisCacheBackend | None = None
+
+        if redis_url:
+            try:
+                self._redis = RedisCacheBackend(redis_url)
+            except ImportError:
+                logger.warning("redis package not installed; using in-process cache")
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.bytes_written = 0
+
+    @property
+    def backend(self) -> str:
+        return self._redis.name if self._redis else self._memory.name
+
+    async def get(self, key: str) -> bytes | None:
+        value = None
+        if self._redis is not None:
+            try:
+                value = await self._redis.get(key)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Redis cache read failed, using local cache: {e}")
+                value = await self._memory.get(key)
+        else:
+            value = await self._memory.get(key)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        self.bytes_written += len(value)
+        if self._redis is not None:
+            try:
+                await self._redis.set(key, value, self.ttl_seconds)
+                return
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Redis cache write failed, using local cache: {e}")
+        await self._memory.set(key, value, self.ttl_seconds)
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            try:
+                await self._redis.close()
+            except Exception as e:
+                logger.debug(f"Error closing Redis cache: {e}")
+        await self._memory.close()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "ttl_seconds": self.ttl_seconds,
+            "local_entries": len(self._memory),
+            "local_bytes": self._memory.size_bytes,
+            "local_skipped_too_large": self._memory.skipped,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "errors": self.errors,
+            "bytes_written": self.bytes_written,
+        }
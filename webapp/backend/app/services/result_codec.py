@@ -0,0 +1,162 @@
+"""
+Result Codec
+
+Compact binary encoding for cached prediction results.
+
+Layout:
+    b"AGC2" | uint32 header length | zlib(header JSON) | array buffers
+
+The header holds the plain-Python part of the value; numpy arrays are
+replaced by placeholders and stored as little-endian buffers after it.
+Float buffers are stored raw: zlib saves only ~10% on model outputs but
+costs seconds on full-resolution tracks. Other buffers are compressed.
+Score tables are stored column-wise, so the numeric columns cost 8 bytes
+per row instead of a JSON float each.
+
+Packing and unpacking large results is CPU-bound; callers on the event
+loop run them in a thread.
+"""
+
+import json
+import struct
+import zlib
+from typing import Any
+
+import numpy as np
+
+from ..models import GeneScore, PredictionResult
+
+_MAGIC = b"AGC2"
+_ARRAY_TAG = "__ndarray__"
+
+_SCORE_TEXT_FIELDS = ("gene_id", "gene_name", "strand", "tissue", "interpretation")
+_SCORE_FLOAT_FIELDS = ("raw_score", "quantile_score")
+
+
+def pack(value: Any) -> bytes:
+    """Encode a JSON-like tree whose leaves may be numpy arrays."""
+    buffers: list[bytes] = []
+    compressed: list[bool] = []
+
+    def strip(node: Any) -> Any:
+        if isinstance(node, np.ndarray):
+            array = np.ascontiguousarray(node)
+            if array.dtype.byteorder == ">":
+                array = array.astype(array.dtype.newbyteorder("<"))
+            raw = array.tobytes()
+            compress = array.dtype.kind != "f"
+            buffers.append(zlib.compress(raw, 6) if compress else raw)
+            compressed.append(compress)
+            return {
+                _ARRAY_TAG: len(buffers) - 1,
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+            }
+        if isinstance(node, dict):
+            return {k: strip(v) for k, v in node.items()}
+        if isinstance(node, (list, tuple)):
+            return [strip(v) for v in node]
+        if isinstance(node, np.generic):
+            return node.item()
+        return node
+
+    tree = strip(value)
+    header = zlib.compress(
+        json.dumps(
+            {"tree": tree, "sizes": [len(b) for b in buffers], "compressed": compressed},
+            separators=(",", ":"),
+            default=str,
+        ).encode("utf-8"),
+        6,
+    )
+    return b"".join([_MAGIC, struct.pack("<I", len(header)), header, *buffers])
+
+
+def unpack(blob: bytes) -> Any:
+    """Decode a value produced by `pack`."""
+    if blob[:4] != _MAGIC:
+        raise ValueError("Not an AlphaGenome Explorer cache payload")
+    (header_len,) = struct.unpack_from("<I", blob, 4)
+    offset = 8 + header_len
+    header = json.loads(zlib.decompress(blob[8:offset]))
+    data = memoryview(blob)
+
+    buffers: list[bytes | memoryview] = []
+    for size, compress in zip(header["sizes"], header["compressed"]):
+        buffer = data[offset:offset + size]
+        buffers.append(zlib.decompress(buffer) if compress else buffer)
+        offset += size
+
+    def restore(node: Any) -> Any:
+        if isinstance(node, dict):
+            if _ARRAY_TAG in node:
+                buffer = buffers[node[_ARRAY_TAG]]
+                return np.frombuffer(buffer, dtype=np.dtype(node["dtype"])).reshape(
+                    node["shape"]
+                )
+            return {k: restore(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [restore(v) for v in node]
+        return node
+
+    return restore(header["tree"])
+
+
+# ============ Typed helpers ============
+
+def scores_to_columns(scores: list[GeneScore]) -> dict[str, Any]:
+    """Column-wise representation of a score table."""
+    columns: dict[str, Any] = {
+        field: [getattr(s, field) for s in scores] for field in _SCORE_TEXT_FIELDS
+    }
+    for field in _SCORE_FLOAT_FIELDS:
+        columns[field] = np.fromiter(
+            (getattr(s, field) for s in scores), dtype=np.float64, count=len(scores)
+        )
+    return columns
+
+
+def scores_from_columns(columns: dict[str, Any]) -> list[GeneScore]:
+    """Rebuild GeneScore objects without re-running validation."""
+    floats = [columns[field].tolist() for field in _SCORE_FLOAT_FIELDS]
+    texts = [columns[field] for field in _SCORE_TEXT_FIELDS]
+    return [
+        GeneScore.model_construct(
+            gene_id=gene_id,
+            gene_name=gene_name,
+            strand=strand,
+            tissue=tissue,
+            interpretation=interpretation,
+            raw_score=raw_score,
+            quantile_score=quantile_score,
+        )
+        for gene_id, gene_name, strand, tissue, interpretation, raw_score, quantile_score
+        in zip(*texts, *floats)
+    ]
+
+
+def encode_scores(scores: list[GeneScore]) -> bytes:
+    """Encode a score list (score_variant results)."""
+    return pack({"scores": scores_to_columns(scores)})
+
+
+def decode_scores(blob: bytes) -> list[GeneScore]:
+    """Decode a score list produced by `encode_scores`."""
+    return scores_from_columns(unpack(blob)["scores"])
+
+
+def encode_prediction(result: PredictionResult) -> bytes:
+    """Encode a PredictionResult with its score table stored column-wise."""
+    envelope = result.model_dump(mode="json", exclude={"scores"})
+    envelope["scores"] = scores_to_columns(result.scores)
+    return pack(envelope)
+
+
+def decode_prediction(blob: bytes) -> PredictionResult:
+    """Decode a PredictionResult produced by `encode_prediction`."""
+    envelope = unpack(blob)
+    scores = scores_from_columns(envelope.pop("scores"))
+    result = PredictionResult.model_validate(envelope)
+    result.scores = scores
+    return result
+
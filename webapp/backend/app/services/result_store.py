@@ -0,0 +1,319 @@
+"""
+Result Store
+
+Finished results kept server-side under a random `result_id`, so export
+formats and AI analyses can be produced from the stored object instead of
+the client uploading the whole result again.
+
+The result objects themselves live in a bounded in-process LRU, exactly
+as the route produced them (models, numpy arrays), so storing costs no
+serialization on the request path. Each result is also copied to a shared
+tier in the background: Redis when `Settings.redis_url` is set and
+reachable, otherwise a directory on disk. The copy is encoded with
+`result_codec` in a thread, so arrays (ISM matrices) are stored as raw
+buffers rather than JSON or base64. Results stored by another worker, or
+evicted locally, are read back from there as plain dicts with numpy
+arrays. Every tier drops entries after the TTL.
+
+`as_data` turns a stored value into the plain structure exports expect;
+it is only called when an export or AI analysis reads the result.
+"""
+
+import asyncio
+import logging
+import os
+import secrets
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from ..config import get_settings
+from ..models import ExportFormat
+from . import result_codec
+
+logger = logging.getLogger(__name__)
+
+EXPORT_URL = "/api/export/results/{result_id}?format={format}"
+
+# Prune expired files from the disk tier every this many writes
+DISK_PRUNE_EVERY = 100
+
+
+class StoredResult(NamedTuple):
+    kind: str
+    value: Any
+
+
+def as_data(value: Any) -> Any:
+    """
+    A stored value as the plain dict/list structure exports expect.
+
+    CPU-bound for large results (an ISM matrix becomes nested lists);
+    async callers run it in a thread.
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, dict):
+        return {k: as_data(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [as_data(v) for v in value]
+    return value
+
+
+def _shareable(value: Any) -> Any:
+    """Models dumped to JSON types; arrays kept for `result_codec`."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, dict):
+        return {k: _shareable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_shareable(v) for v in value]
+    return value
+
+
+def _encode(result: StoredResult) -> bytes:
+    return result_codec.pack({"kind": result.kind, "value": _shareable(result.value)})
+
+
+def _decode(raw: bytes) -> StoredResult:
+    payload = result_codec.unpack(raw)
+    return StoredResult(payload["kind"], payload["value"])
+
+
+def _valid_id(result_id: str) -> bool:
+    # secrets.token_urlsafe alphabet; also keeps IDs safe as file names
+    return 0 < len(result_id) <= 64 and result_id.replace("-", "").replace("_", "").isalnum()
+
+
+class DiskResultBackend:
+    """One file per result; expiry by modification time."""
+
+    name = "disk"
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._writes = 0
+
+    def _path(self, result_id: str) -> Path:
+        return self.directory / f"{result_id}.agc"
+
+    def _get(self, result_id: str, ttl_seconds: int) -> bytes | None:
+        path = self._path(result_id)
+        try:
+            if path.stat().st_mtime + ttl_seconds < time.time():
+                path.unlink(missing_ok=True)
+                return None
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _set(self, result_id: str, value: bytes, ttl_seconds: int) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(result_id)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(value)
+        os.replace(tmp, path)
+        self._writes += 1
+        if self._writes % DISK_PRUNE_EVERY == 0:
+            self._prune(ttl_seconds)
+
+    def _prune(self, ttl_seconds: int) -> None:
+        cutoff = time.time() - ttl_seconds
+        for path in self.directory.glob("*.agc"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
+            except FileNotFoundError:
+                pass
+
+    async def get(self, result_id: str, ttl_seconds: int) -> bytes | None:
+        return await asyncio.to_thread(self._get, result_id, ttl_seconds)
+
+    async def set(self, result_id: str, value: bytes, ttl_seconds: int) -> None:
+        await asyncio.to_thread(self._set, result_id, value, ttl_seconds)
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisResultBackend:
+    """Results shared by all workers through Redis."""
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(url)
+
+    @staticmethod
+    def _key(result_id: str) -> str:
+        return f"ag:result:{result_id}"
+
+    async def get(self, result_id: str, ttl_seconds: int) -> bytes | None:
+        return await self._client.get(self._key(result_id))
+
+    async def set(self, result_id: str, value: bytes, ttl_seconds: int) -> None:
+        await self._client.set(self._key(result_id), value, ex=ttl_seconds)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class ResultStore:
+    """
+    In-process LRU of result objects in front of a shared Redis/disk tier.
+
+    Shared-tier writes run in the background and their errors never fail
+    a request: the result stays available from this process and the
+    error is counted in `errors`.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = 3600,
+        max_entries: int = 256,
+        redis_url: str | None = None,
+        directory: str | None = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, StoredResult]] = OrderedDict()
+        self._shared: RedisResultBackend | DiskResultBackend | None = None
+        self._writes: set[asyncio.Task] = set()
+
+        if redis_url:
+            try:
+                self._shared = RedisResultBackend(redis_url)
+            except ImportError:
+                logger.warning("redis package not installed; storing results on disk")
+        if self._shared is None and directory:
+            self._shared = DiskResultBackend(directory)
+
+        self.stored = 0
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def backend(self) -> str:
+        return self._shared.name if self._shared else "memory"
+
+    def _remember(self, result_id: str, result: StoredResult, expires_at: float) -> None:
+        self._entries[result_id] = (expires_at, result)
+        self._entries.move_to_end(result_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def put(self, kind: str, value: Any) -> str:
+        """
+        Store `value` and return its new result ID.
+
+        `value` is kept as is and must not be modified afterwards; the
+        shared-tier copy is written in the background.
+        """
+        result_id = secrets.token_urlsafe(12)
+        result = StoredResult(kind, value)
+        self._remember(result_id, result, time.monotonic() + self.ttl_seconds)
+        self.stored += 1
+
+        if self._shared is not None:
+            task = asyncio.create_task(self._write_shared(result_id, result))
+            self._writes.add(task)
+            task.add_done_callback(self._writes.discard)
+        return result_id
+
+    async def _write_shared(self, result_id: str, result: StoredResult) -> None:
+        try:
+            encoded = await asyncio.to_thread(_encode, result)
+            await self._shared.set(result_id, encoded, self.ttl_seconds)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Could not write result {result_id} to {self.backend}: {e}")
+
+    async def get(self, result_id: str) -> StoredResult | None:
+        """
+        The stored result, or None if unknown or expired.
+
+        Results from this process come back as the original objects;
+        results read from the shared tier as plain dicts and lists.
+        """
+        if not _valid_id(result_id):
+            self.misses += 1
+            return None
+
+        entry = self._entries.get(result_id)
+        if entry is not None:
+            if entry[0] >= time.monotonic():
+                self._entries.move_to_end(result_id)
+                self.hits += 1
+                return entry[1]
+            del self._entries[result_id]
+
+        raw = None
+        if self._shared is not None:
+            try:
+                raw = await self._shared.get(result_id, self.ttl_seconds)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Could not read result {result_id} from {self.backend}: {e}")
+        if raw is None:
+            self.misses += 1
+            return None
+
+        result = await asyncio.to_thread(_decode, raw)
+        # Kept locally for up to another TTL; the shared copy expires on time
+        self._remember(result_id, result, time.monotonic() + self.ttl_seconds)
+        self.shared_hits += 1
+        return result
+
+    async def close(self) -> None:
+        await asyncio.gather(*self._writes, return_exceptions=True)
+        if self._shared is not None:
+            try:
+                await self._shared.close()
+            except Exception as e:
+                logger.debug(f"Error closing result store: {e}")
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "ttl_seconds": self.ttl_seconds,
+            "entries": len(self._entries),
+            "stored": self.stored,
+            "pending_writes": len(self._writes),
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
+
+
+def export_links(result_id: str, ttl_seconds: int) -> dict[str, Any]:
+    """Export download links for a stored result, one per format."""
+    return {
+        "result_id": result_id,
+        "expires_in_seconds": ttl_seconds,
+        "formats": {
+            fmt.value: EXPORT_URL.format(result_id=result_id, format=fmt.value)
+            for fmt in ExportFormat
+        },
+    }
+
+
+# Singleton instance
+_settings = get_settings()
+result_store = ResultStore(
+    _settings.result_store_ttl_seconds,
+    _settings.result_store_max_entries,
+    redis_url=_settings.redis_url,
+    directory=_settings.result_store_dir or None,
+)
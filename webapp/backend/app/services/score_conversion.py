@@ -0,0 +1,148 @@
+"""
+Score Conversion
+
+Columnar conversion of `variant_scorers.tidy_scores` DataFrames into
+GeneScore models.
+
+An RNA_SEQ score over a 1MB window yields tens of thousands of
+gene x track rows, so interpretation, impact level and top-k selection
+are computed with numpy over whole columns instead of per row, and the
+models are built with `model_construct` (the values are already typed).
+"""
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from ..models import GeneScore
+
+# Quantile thresholds shared by interpretation strength and impact level
+STRONG_QUANTILE = 0.95
+MODERATE_QUANTILE = 0.80
+WEAK_QUANTILE = 0.60
+
+# Below this absolute raw score a variant is reported as having no effect
+NO_EFFECT_THRESHOLD = 0.01
+
+_STRENGTHS = ("Strong", "Moderate", "Weak", "Minimal")
+# Index = strength * 2 + (raw_score > 0); last entry is the no-effect label
+_INTERPRETATIONS = np.array(
+    [f"{strength} {direction}" for strength in _STRENGTHS for direction in ("decrease", "increase")]
+    + ["No significant effect"],
+    dtype=object,
+)
+_NO_EFFECT = len(_INTERPRETATIONS) - 1
+
+_IMPACT_LEVELS = ("HIGH", "MODERATE", "LOW", "MODIFIER")
+
+
+def _strength_index(quantile: np.ndarray) -> np.ndarray:
+    return np.select(
+        [quantile > STRONG_QUANTILE, quantile > MODERATE_QUANTILE, quantile > WEAK_QUANTILE],
+        [0, 1, 2],
+        default=3,
+    )
+
+
+def interpret_scores(raw: np.ndarray, quantile: np.ndarray) -> np.ndarray:
+    """
+    Human-readable interpretation for every score at once.
+
+    Returns an object array of shared label strings such as
+    "Strong increase" or "No significant effect".
+    """
+    codes = _strength_index(quantile) * 2 + (raw > 0)
+    codes = np.where(np.abs(raw) < NO_EFFECT_THRESHOLD, _NO_EFFECT, codes)
+    return _INTERPRETATIONS[codes]
+
+
+def impact_level(quantile: np.ndarray) -> str:
+    """Overall impact level from the highest quantile score."""
+    if quantile.size == 0:
+        return "MODIFIER"
+    return _IMPACT_LEVELS[int(_strength_index(np.max(quantile)))]
+
+
+def top_k_indices(raw: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest |raw| scores, largest first."""
+    magnitude = np.abs(raw)
+    if k < magnitude.size:
+        candidates = np.argpartition(-magnitude, k - 1)[:k]
+    else:
+        candidates = np.arange(magnitude.size)
+    return candidates[np.argsort(-magnitude[candidates], kind="stable")]
+
+
+def _text_column(df: pd.DataFrame, names: tuple[str, ...], default: str) -> np.ndarray:
+    """First present column among `names` as an object array, nulls -> default."""
+    for name in names:
+        if name in df.columns:
+            column = df[name]
+            return column.where(column.notna(), default).to_numpy(dtype=object)
+    return np.full(len(df), default, dtype=object)
+
+
+def _float_column(df: pd.DataFrame, name: str) -> np.ndarray:
+    if name in df.columns:
+        return df[name].to_numpy(dtype=np.float64, na_value=0.0)
+    return np.zeros(len(df), dtype=np.float64)
+
+
+def gene_scores_from_tidy(
+    scores_df: pd.DataFrame | None,
+    default_tissue: str = "",
+    top_k: int | None = None,
+) -> list[GeneScore]:
+    """
+    Convert a tidy scores DataFrame into GeneScore models.
+
+    Args:
+        scores_df: Output of `variant_scorers.tidy_scores` (may be None)
+        default_tissue: Tissue used when a row has no ontology_curie
+        top_k: Keep only the k rows with the largest |raw_score|,
+            ordered by magnitude. None keeps every row in input order.
+
+    Returns:
+        List of GeneScore objects
+    """
+    if scores_df is None or scores_df.empty:
+        return []
+
+    raw = _float_column(scores_df, "raw_score")
+    quantile = _float_column(scores_df, "quantile_score")
+    columns: dict[str, Any] = {
+        "gene_id": _text_column(scores_df, ("gene_id",), ""),
+        "gene_name": _text_column(scores_df, ("gene_name",), "Unknown"),
+        "strand": _text_column(scores_df, ("strand", "gene_strand"), "."),
+        "tissue": _text_column(scores_df, ("ontology_curie",), default_tissue),
+    }
+
+    if top_k is not None:
+        selected = top_k_indices(raw, top_k)
+        raw, quantile = raw[selected], quantile[selected]
+        columns = {name: values[selected] for name, values in columns.items()}
+
+    interpretations = interpret_scores(raw, quantile)
+
+    construct = GeneScore.model_construct
+    return [
+        construct(
+            gene_id=gene_id,
+            gene_name=gene_name,
+            strand=strand,
+            raw_score=raw_score,
+            quantile_score=quantile_score,
+            tissue=tissue,
+            interpretation=interpretation,
+        )
+        for gene_id, gene_name, strand, tissue, raw_score, quantile_score, interpretation in zip(
+            columns["gene_id"].tolist(),
+            columns["gene_name"].tolist(),
+            columns["strand"].tolist(),
+            columns["tissue"].tolist(),
+            raw.tolist(),
+            quantile.tolist(),
+            interpretations.tolist(),
+        )
+    ]
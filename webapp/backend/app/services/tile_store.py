@@ -0,0 +1,313 @@
+"""
+Tile Pyramid Store
+
+Multi-resolution tiles of predicted tracks for genome-browser panning and
+zooming. Every interval prediction is downsampled once into a zoom pyramid
+(e.g. 1bp -> 16bp -> 256bp -> 4kb, each level the mean of the one below)
+and written into fixed-size tiles on the global genome grid:
+
+    <dir>/<organism>/<chrom>/<output>/<ontology>/<resolution>/<tile>.npy
+
+Each tile is a float32 `.npy` file of shape [tile_bins, tracks] opened as
+a memory map, so later windows fill in missing bins in place and reads
+never load more than the requested tile. Bins no prediction has covered
+yet are NaN. Only bins fully inside a predicted window are written.
+
+The store is bounded: tiles not rewritten within the TTL are dropped, and
+once the tiles exceed `max_bytes` the least recently used are evicted.
+Ingesting does blocking file I/O; async callers run it in a thread.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .tracks import bin_positions
+
+logger = logging.getLogger(__name__)
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]")
+
+# Tracks without an ontology term are grouped under this name
+NO_ONTOLOGY = "none"
+
+# Chromosomes tiles are kept for, per organism
+CHROMOSOMES = {
+    "HOMO_SAPIENS": frozenset([f"chr{i}" for i in range(1, 23)] + ["chrX", "chrY"]),
+    "MUS_MUSCULUS": frozenset([f"chr{i}" for i in range(1, 20)] + ["chrX", "chrY"]),
+}
+
+
+def _safe(part: str) -> str:
+    safe = _UNSAFE.sub("_", part)
+    if safe in ("", ".", ".."):
+        raise ValueError(f"Invalid tile key: {part!r}")
+    return safe
+
+
+def is_known_chromosome(organism: str, chromosome: str) -> bool:
+    """Whether tiles can exist for `chromosome` of `organism`."""
+    return chromosome in CHROMOSOMES.get(organism, ())
+
+
+def zoom_levels_for(native: int, levels: list[int]) -> list[int]:
+    """Configured zoom levels usable for data at `native` resolution."""
+    usable: list[int] = []
+    for level in sorted(set(levels)):
+        base = usable[-1] if usable else native
+        if level >= native and level % base == 0:
+            usable.append(level)
+    return usable
+
+
+class TileStore:
+    """Memory-mapped tile pyramid on local disk, bounded by size and age."""
+
+    def __init__(
+        self,
+        directory: str,
+        tile_bins: int = 1024,
+        zoom_levels: list[int] | None = None,
+        max_bytes: int = 2 * 1024**3,
+        ttl_seconds: int = 7 * 86400,
+    ):
+        self.directory = Path(directory)
+        self.tile_bins = tile_bins
+        self.zoom_levels = sorted(zoom_levels or [1, 16, 256, 4096])
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._create_lock = threading.Lock()
+        # Tile path -> (size, written at), least recently used first;
+        # loaded from disk on first use
+        self._index: OrderedDict[Path, tuple[int, float]] | None = None
+        self._index_lock = threading.Lock()
+        self._bytes = 0
+        self.tiles_written = 0
+        self.tiles_served = 0
+        self.tiles_evicted = 0
+
+    # ============ Paths ============
+
+    def _group_dir(self, organism: str, chromosome: str, output: str, ontology: str) -> Path:
+        return self.directory / _safe(organism) / _safe(chromosome) / _safe(output) / _safe(ontology)
+
+    def _tile_path(self, group: Path, resolution: int, tile: int) -> Path:
+        return group / str(resolution) / f"{tile}.npy"
+
+    # ============ Size and age limits ============
+
+    def _load_index(self) -> OrderedDict[Path, tuple[int, float]]:
+        """The tile index; built from the files on disk, oldest first."""
+        if self._index is None:
+            found = []
+            for path in self.directory.glob("*/*/*/*/*/*.npy"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                found.append((stat.st_mtime, path, stat.st_size))
+            found.sort()
+            self._index = OrderedDict((path, (size, mtime)) for mtime, path, size in found)
+            self._bytes = sum(size for size, _ in self._index.values())
+        return self._index
+
+    def _record(self, path: Path) -> None:
+        """Note a tile (re)write as its most recent use."""
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return
+        with self._index_lock:
+            index = self._load_index()
+            previous = index.pop(path, None)
+            self._bytes += size - (previous[0] if previous else 0)
+            index[path] = (size, time.time())
+
+    def _touch(self, path: Path) -> bool:
+        """Mark a tile as used; False (and the tile dropped) if it expired."""
+        with self._index_lock:
+            index = self._load_index()
+            entry = index.get(path)
+            if entry is None:
+                return True
+            if entry[1] + self.ttl_seconds >= time.time():
+                index.move_to_end(path)
+                return True
+            self._drop(path)
+        return False
+
+    def _drop(self, path: Path) -> None:
+        """Delete one tile; the caller holds `_index_lock`."""
+        entry = self._index.pop(path, None) if self._index is not None else None
+        if entry is not None:
+            self._bytes -= entry[0]
+        path.unlink(missing_ok=True)
+        self.tiles_evicted += 1
+
+    def _enforce_limits(self) -> None:
+        """Drop expired tiles, then least recently used ones above `max_bytes`."""
+        cutoff = time.time() - self.ttl_seconds
+        with self._index_lock:
+            index = self._load_index()
+            for path in [p for p, (_, written) in index.items() if written < cutoff]:
+                self._drop(path)
+            while self._bytes > self.max_bytes and index:
+                self._drop(next(iter(index)))
+
+    # ============ Ingest ============
+
+    def ingest(self, organism: str, prediction: dict[str, Any]) -> int:
+        """
+        Add a raw interval prediction to the pyramid.
+
+        Args:
+            organism: Organism name used in tile keys
+            prediction: Raw `predict_interval` result with native-resolution
+                "values", "resolution" and "metadata" per output
+
+        Returns:
+            Number of tiles written
+        """
+        interval = prediction["interval"]
+        written = 0
+        for output, raw in prediction["outputs"].items():
+            values = raw.get("values")
+            native = raw.get("resolution", 1)
+            if (
+                values is None
+                or interval["start"] % native
+                or not is_known_chromosome(organism, interval["chromosome"])
+            ):
+                continue
+
+            ontologies = np.array(
+                [m.get("ontology_curie") or NO_ONTOLOGY for m in raw["metadata"]], dtype=object
+            )
+            for ontology in dict.fromkeys(ontologies.tolist()):
+                mask = ontologies == ontology
+                group = self._group_dir(organism, interval["chromosome"], output, ontology)
+                tracks = [m for m, keep in zip(raw["metadata"], mask) if keep]
+                self._ensure_tracks(group, tracks)
+                written += self._ingest_pyramid(
+                    group, values[:, mask], native, interval["start"] // native
+                )
+
+        self.tiles_written += written
+        if written:
+            self._enforce_limits()
+        return written
+
+    def _ensure_tracks(self, group: Path, tracks: list[dict[str, Any]]) -> None:
+        """Record the group's track metadata; reset the group if it changed."""
+        path = group / "tracks.json"
+        names = [t.get("name") for t in tracks]
+        with self._create_lock:
+            if path.exists():
+                stored = json.loads(path.read_text())
+                if [t.get("name") for t in stored] == names:
+                    return
+                logger.warning(f"Track set changed for {group}; discarding its tiles")
+                with self._index_lock:
+                    self._load_index()
+                    for tile in group.glob("*/*.npy"):
+                        self._drop(tile)
+            group.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(tracks, default=str))
+
+    def _ingest_pyramid(self, group: Path, values: np.ndarray, native: int, first_bin: int) -> int:
+        """Write every zoom level, each downsampled from the previous one."""
+        written = 0
+        level_values, level_first, level_resolution = values, first_bin, native
+        for resolution in zoom_levels_for(native, self.zoom_levels):
+            ratio = resolution // level_resolution
+            # Drop leading bins until the coarser grid is aligned
+            skip = (-level_first) % ratio
+            usable = (len(level_values) - skip) // ratio * ratio
+            if usable <= 0:
+                break
+            level_values = bin_positions(level_values[skip:skip + usable], ratio, "mean")
+            level_first = (level_first + skip) // ratio
+            level_resolution = resolution
+            written += self._write_bins(group, resolution, level_first, level_values)
+        return written
+
+    def _write_bins(self, group: Path, resolution: int, first_bin: int, bins: np.ndarray) -> int:
+        written = 0
+        bin_index = first_bin
+        end_bin = first_bin + len(bins)
+        while bin_index < end_bin:
+            tile, offset = divmod(bin_index, self.tile_bins)
+            count = min(self.tile_bins - offset, end_bin - bin_index)
+            tile_map = self._open_for_write(
+                self._tile_path(group, resolution, tile), bins.shape[1]
+            )
+            row = bin_index - first_bin
+            tile_map[offset:offset + count] = bins[row:row + count]
+            tile_map.flush()
+            del tile_map
+            self._record(self._tile_path(group, resolution, tile))
+            bin_index += count
+            written += 1
+        return written
+
+    def _open_for_write(self, path: Path, num_tracks: int) -> np.memmap:
+        with self._create_lock:
+            if path.exists():
+                return np.lib.format.open_memmap(path, mode="r+")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tile_map = np.lib.format.open_memmap(
+                path, mode="w+", dtype=np.float32, shape=(self.tile_bins, num_tracks)
+            )
+            tile_map[:] = np.nan
+            return tile_map
+
+    # ============ Read ============
+
+    def read_tile(
+        self, organism: str, chromosome: str, output: str, ontology: str, resolution: int, tile: int
+    ) -> tuple[np.ndarray, list[dict[str, Any]]] | None:
+        """
+        (values, track metadata) for one tile, or None if never written
+        (or evicted).
+
+        `values` is a read-only memory map of shape [tile_bins, tracks];
+        bins not covered by any prediction are NaN.
+
+        Raises:
+            ValueError: If a key part is not a valid path component
+        """
+        group = self._group_dir(organism, chromosome, output, ontology)
+        path = self._tile_path(group, resolution, tile)
+        if not self._touch(path):
+            return None
+        try:
+            values = np.lib.format.open_memmap(path, mode="r")
+            tracks = json.loads((group / "tracks.json").read_text())
+        except FileNotFoundError:
+            return None
+        self.tiles_served += 1
+        return values, tracks
+
+    def tile_bounds(self, resolution: int, tile: int) -> tuple[int, int]:
+        """Genomic [start, end) covered by a tile."""
+        span = resolution * self.tile_bins
+        return tile * span, (tile + 1) * span
+
+    def stats(self) -> dict[str, Any]:
+        with self._index_lock:
+            tiles = len(self._index) if self._index is not None else None
+        return {
+            "tiles": tiles,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "tiles_written": self.tiles_written,
+            "tiles_served": self.tiles_served,
+            "tiles_evicted": self.tiles_evicted,
+        }
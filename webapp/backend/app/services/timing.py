@@ -0,0 +1,90 @@
+"""
+Request Timing
+
+Request-scoped phase timings, reported in the `Server-Timing` response
+header (and visible in the browser's network panel).
+
+The middleware opens a `RequestTimings` for each request in a context
+variable; code anywhere below it (routers, `AlphaGenomeService`, export
+rendering) wraps work in `phase(name)` or calls `record(name, ms)`.
+Tasks spawned by the request inherit the context, so concurrent upstream
+calls are attributed to the request that started them. Outside a request
+both are no-ops.
+
+Phases may overlap (prediction and scoring run concurrently), so their
+durations need not add up to `total`. A phase entered several times is
+reported once with its summed duration and a count.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Iterator
+
+
+class RequestTimings:
+    """Named phase durations for one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        # phase name -> [total ms, count], in first-seen order
+        self.phases: dict[str, list[float]] = {}
+
+    def add(self, name: str, ms: float) -> None:
+        entry = self.phases.get(name)
+        if entry is None:
+            self.phases[name] = [ms, 1]
+        else:
+            entry[0] += ms
+            entry[1] += 1
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def header(self) -> str:
+        """`Server-Timing` header value, ending with the total so far."""
+        metrics = []
+        for name, (ms, count) in self.phases.items():
+            desc = f';desc="x{count:g}"' if count > 1 else ""
+            metrics.append(f"{name};dur={ms:.1f}{desc}")
+        metrics.append(f"total;dur={self.total_ms():.1f}")
+        return ", ".join(metrics)
+
+    def breakdown(self) -> str:
+        """Phases as `name=12.3ms` pairs, longest first, for logs."""
+        ordered = sorted(self.phases.items(), key=lambda item: -item[1][0])
+        return ", ".join(f"{name}={ms:.1f}ms" for name, (ms, _) in ordered)
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def start() -> tuple[RequestTimings, Token]:
+    """Begin timing a request in the current context."""
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def finish(token: Token) -> None:
+    _current.reset(token)
+
+
+def record(name: str, ms: float) -> None:
+    """Add `ms` to phase `name` of the current request, if any."""
+    timings = _current.get()
+    if timings is not None:
+        timings.add(name, ms)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time the enclosed block as phase `name` of the current request."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, (time.perf_counter() - started) * 1000)
@@ -0,0 +1,144 @@
+"""
+Track Rendering
+
+Turns raw `(positions, tracks)` prediction arrays into compact, plottable
+track data: optional track selection by metadata, then server-side
+binning to the requested resolution with a reshape + mean/max.
+
+A 1MB RNA_SEQ prediction at 1bp is ~1M rows per track; at 2kb it is 512,
+which is what a genome browser view needs anyway.
+"""
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+AGGREGATIONS = ("mean", "max")
+
+# Default bin size (bp) for interval predictions
+DEFAULT_RESOLUTION = 128
+
+
+def effective_resolution(requested: int, native: int) -> int:
+    """
+    Nearest resolution that is a whole multiple of the native one.
+
+    Requests finer than the native resolution get the native resolution;
+    others are rounded down to a multiple of it.
+    """
+    native = max(1, native)
+    return max(1, requested // native) * native
+
+
+def check_bins(length: int, resolution: int, max_bins: int) -> None:
+    """
+    Reject requests whose track values would exceed `max_bins` rows.
+
+    The estimate uses the requested resolution, before any rounding to a
+    coarser native one, so it can be checked before predicting.
+    """
+    bins = -(-length // max(1, resolution))
+    if bins > max_bins:
+        raise ValueError(
+            f"Too many bins: {length}bp at {resolution}bp resolution is {bins} bins "
+            f"(maximum {max_bins}). Use a coarser resolution, or read full-resolution "
+            "tracks from /api/tiles."
+        )
+
+
+def bin_positions(values: np.ndarray, factor: int, aggregation: str = "mean") -> np.ndarray:
+    """
+    Aggregate every `factor` consecutive rows of a (positions, tracks) array.
+
+    A trailing partial bin is aggregated over the rows it has.
+
+    Args:
+        values: 2D array [positions, tracks]
+        factor: Rows per output bin
+        aggregation: "mean" or "max"
+
+    Returns:
+        float32 array [ceil(positions / factor), tracks]
+    """
+    if aggregation not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation: {aggregation}")
+    if factor <= 1:
+        return np.asarray(values, dtype=np.float32)
+
+    reduce = np.mean if aggregation == "mean" else np.max
+    positions, num_tracks = values.shape
+    full = positions - positions % factor
+
+    binned = reduce(values[:full].reshape(-1, factor, num_tracks), axis=1)
+    if full < positions:
+        tail = reduce(values[full:], axis=0, keepdims=True)
+        binned = np.concatenate([binned, tail])
+    return binned.astype(np.float32, copy=False)
+
+
+def track_mask(metadata: pd.DataFrame, track_filter: dict[str, Any] | None) -> np.ndarray:
+    """
+    Boolean mask of tracks whose metadata matches every filter entry.
+
+    Each entry maps a metadata column to an allowed value or list of
+    values, compared as strings, e.g. {"strand": "+", "biosample_type":
+    ["tissue", "primary_cell"]}.
+    """
+    mask = np.ones(len(metadata), dtype=bool)
+    if not track_filter:
+        return mask
+
+    for column, allowed in track_filter.items():
+        if column not in metadata.columns:
+            raise ValueError(
+                f"Unknown track metadata column: {column}. "
+                f"Available: {', '.join(map(str, metadata.columns))}"
+            )
+        allowed_values = [allowed] if isinstance(allowed, str) else list(allowed)
+        mask &= metadata[column].astype(str).isin([str(v) for v in allowed_values]).to_numpy()
+    return mask
+
+
+def render_output(
+    raw: dict[str, Any],
+    resolution: int,
+    aggregation: str = "mean",
+    track_filter: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    JSON-ready track data for one output from its raw prediction.
+
+    Args:
+        raw: {"values": ndarray [positions, tracks], "resolution": native bp,
+            "metadata": list of per-track dicts}; entries without values
+            (e.g. splice junctions, contact maps) only report shape/metadata
+        resolution: Requested bin size in bp
+        aggregation: "mean" or "max"
+        track_filter: Metadata predicate, see `track_mask`
+
+    Returns:
+        Dict shaped like TrackData: values, metadata, resolution, plus shape
+    """
+    values = raw.get("values")
+    if values is None:
+        return {"shape": raw["shape"], "metadata": raw["metadata"]}
+
+    metadata = pd.DataFrame.from_records(raw["metadata"])
+    mask = track_mask(metadata, track_filter)
+    if not mask.all():
+        values = values[:, mask]
+        metadata = metadata[mask]
+
+    native = raw.get("resolution", 1)
+    out_resolution = effective_resolution(resolution, native)
+    binned = bin_positions(values, out_resolution // native, aggregation)
+
+    return {
+        "shape": list(binned.shape),
+        "native_shape": list(raw["shape"]),
+        "resolution": out_resolution,
+        "aggregation": aggregation,
+        "metadata": metadata.to_dict(orient="records"),
+        "values": binned.tolist(),
+    }
@@ -0,0 +1,191 @@
+"""
+Upstream Executor
+
+The AlphaGenome client is synchronous (gRPC). Running its calls directly
+inside `async def` handlers blocks the event loop, so every upstream call
+goes through a dedicated thread pool instead.
+
+Each endpoint (predict_variant, score_variant, ...) has its own
+concurrency cap so one kind of workload cannot take every worker.
+
+A slot is held until the worker thread finishes, not until the caller
+stops waiting: a call abandoned by a timeout or a losing hedge keeps its
+thread busy, so it keeps counting against the cap and as running.
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _EndpointStats:
+    """Queue-depth and throughput counters for one endpoint."""
+
+    __slots__ = (
+        "limit", "waiting", "running", "abandoned",
+        "submitted", "completed", "failed", "cancelled",
+    )
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.waiting = 0
+        self.running = 0
+        # Running calls whose caller stopped waiting (timeout, lost hedge)
+        self.abandoned = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "limit": self.limit,
+            "waiting": self.waiting,
+            "running": self.running,
+            "abandoned": self.abandoned,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+        }
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable[..., Any], *args: Any) -> None:
+    """Schedule `callback` on the loop from any thread."""
+    try:
+        loop.call_soon_threadsafe(callback, *args)
+    except RuntimeError:
+        pass  # loop closed during shutdown
+
+
+def _unabandon(stats: _EndpointStats) -> None:
+    stats.abandoned -= 1
+
+
+class UpstreamExecutor:
+    """
+    Thread pool for blocking AlphaGenome calls with per-endpoint caps.
+
+    Counters are only mutated from the event loop thread (worker
+    completions are handed back with `call_soon_threadsafe`), so they
+    need no locking.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 32,
+        endpoint_limits: dict[str, int] | None = None,
+        default_limit: int = 8,
+    ):
+        self.max_workers = max_workers
+        self.default_limit = default_limit
+        self._endpoint_limits = dict(endpoint_limits or {})
+        if sum(self._endpoint_limits.values()) > max_workers:
+            logger.warning(
+                f"Upstream concurrency caps sum to {sum(self._endpoint_limits.values())}, "
+                f"more than the {max_workers} workers; calls will queue inside the pool"
+            )
+        self._executor: ThreadPoolExecutor | None = None
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._stats: dict[str, _EndpointStats] = {}
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The underlying thread pool, created lazily."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="alphagenome-upstream",
+            )
+        return self._executor
+
+    def _endpoint(self, endpoint: str) -> tuple[asyncio.Semaphore, _EndpointStats]:
+        semaphore = self._semaphores.get(endpoint)
+        if semaphore is None:
+            limit = self._endpoint_limits.get(endpoint, self.default_limit)
+            semaphore = asyncio.Semaphore(limit)
+            self._semaphores[endpoint] = semaphore
+            self._stats.setdefault(endpoint, _EndpointStats(limit))
+        return semaphore, self._stats[endpoint]
+
+    async def run(
+        self,
+        endpoint: str,
+        fn: Callable[..., T],
+        *args: Any,
+        **kwargs: Any,
+    ) -> T:
+        """
+        Run a blocking callable in the pool under the endpoint's cap.
+
+        Args:
+            endpoint: Name used for the concurrency cap and metrics
+            fn: Blocking callable
+            *args, **kwargs: Passed through to fn
+
+        Returns:
+            Whatever fn returns; exceptions propagate unchanged.
+        """
+        semaphore, stats = self._endpoint(endpoint)
+        stats.submitted += 1
+        stats.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            stats.waiting -= 1
+
+        loop = asyncio.get_running_loop()
+        stats.running += 1
+        try:
+            future = self.executor.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            stats.running -= 1
+            semaphore.release()
+            raise
+
+        def finished(done: Future) -> None:
+            stats.running -= 1
+            if done.cancelled():
+                stats.cancelled += 1
+            elif done.exception() is not None:
+                stats.failed += 1
+            else:
+                stats.completed += 1
+            semaphore.release()
+
+        # Runs in the worker thread (or here, if cancelled while queued)
+        future.add_done_callback(lambda done: _call_soon(loop, finished, done))
+        try:
+            # Cancelling the wrapper cancels the pool future if it has not
+            # started; a running call finishes and then frees its slot.
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if future.running():
+                stats.abandoned += 1
+                future.add_done_callback(lambda _: _call_soon(loop, _unabandon, stats))
+            raise
+
+    def stats(self) -> dict[str, Any]:
+        """Executor-wide and per-endpoint queue depth."""
+        endpoints = {name: s.as_dict() for name, s in self._stats.items()}
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": sum(s.running for s in self._stats.values()),
+            "abandoned": sum(s.abandoned for s in self._stats.values()),
+            "queued": sum(s.waiting for s in self._stats.values()),
+            "endpoints": endpoints,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the pool; running calls finish in the background."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        # Semaphores are bound to the event loop that used them.
+        self._semaphores.clear()
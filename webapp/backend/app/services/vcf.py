@@ -0,0 +1,57 @@
+"""
+VCF Parsing
+
+Minimal reader that turns VCF records into the variant notation used
+across the API (chr22:36201698:A>C).
+"""
+
+import re
+from typing import Iterable
+
+_ALLELE = re.compile(r"^[ACGTN]+$", re.IGNORECASE)
+_CHROMOSOME = re.compile(r"^chr[\dXY]+$", re.IGNORECASE)
+
+
+def parse_vcf_variants(lines: Iterable[str]) -> tuple[list[str], int]:
+    """
+    Extract variants from VCF text.
+
+    Multi-allelic records yield one variant per ALT allele. Symbolic or
+    breakend alleles (<DEL>, *, N[chr1:1[), contigs other than chr1-22/X/Y
+    and malformed records are skipped.
+
+    Args:
+        lines: VCF lines (header lines are ignored)
+
+    Returns:
+        Tuple of (variants, skipped_record_count)
+    """
+    variants: list[str] = []
+    skipped = 0
+
+    for line in lines:
+        if not line.strip() or line.startswith("#"):
+            continue
+
+        fields = line.rstrip("\r\n").split("\t")
+        if len(fields) < 5:
+            skipped += 1
+            continue
+
+        chrom, pos, _, ref, alts = fields[:5]
+        if not pos.isdigit() or not _ALLELE.match(ref):
+            skipped += 1
+            continue
+        if not chrom.lower().startswith("chr"):
+            chrom = f"chr{chrom}"
+        if not _CHROMOSOME.match(chrom):
+            skipped += 1
+            continue
+
+        usable = [alt for alt in alts.split(",") if _ALLELE.match(alt)]
+        if not usable:
+            skipped += 1
+            continue
+        variants.extend(f"{chrom}:{pos}:{ref}>{alt}" for alt in usable)
+
+    return variants, skipped
@@ -0,0 +1 @@
+"""Backend performance benchmarks."""
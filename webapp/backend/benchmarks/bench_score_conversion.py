@@ -0,0 +1,120 @@
+"""
+Micro-benchmark: tidy scores -> GeneScore conversion
+
+Compares the original per-row `iterrows()` loop against the columnar
+path in `app.services.score_conversion` on a synthetic tidy_scores
+DataFrame shaped like an RNA_SEQ score over a 1MB window.
+
+Usage (from webapp/backend):
+    python -m benchmarks.bench_score_conversion --rows 30000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.models import GeneScore
+from app.services.score_conversion import gene_scores_from_tidy
+
+
+def make_tidy_scores(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic DataFrame with the columns tidy_scores produces."""
+    rng = np.random.default_rng(seed)
+    genes = rows // 60 + 1
+    gene_idx = rng.integers(0, genes, rows)
+    return pd.DataFrame(
+        {
+            "variant_id": "chr22:36201698:A>C",
+            "scored_interval": "chr22:35677410-36725986",
+            "gene_id": [f"ENSG{i:011d}" for i in gene_idx],
+            "gene_name": [f"GENE{i}" for i in gene_idx],
+            "gene_type": "protein_coding",
+            "gene_strand": rng.choice(["+", "-"], rows),
+            "output_type": "RNA_SEQ",
+            "variant_scorer": "GeneMaskLFCScorer(requested_output=RNA_SEQ)",
+            "track_name": [f"UBERON:{i % 667:07d} total RNA-seq" for i in range(rows)],
+            "track_strand": ".",
+            "ontology_curie": [f"UBERON:{i % 667:07d}" for i in range(rows)],
+            "raw_score": rng.normal(0, 0.05, rows),
+            "quantile_score": rng.uniform(0, 1, rows),
+        }
+    )
+
+
+# ============ Original implementation (baseline) ============
+
+def _interpret_score(raw_score: float, quantile: float) -> str:
+    if abs(raw_score) < 0.01:
+        return "No significant effect"
+    direction = "increase" if raw_score > 0 else "decrease"
+    if quantile > 0.95:
+        strength = "Strong"
+    elif quantile > 0.80:
+        strength = "Moderate"
+    elif quantile > 0.60:
+        strength = "Weak"
+    else:
+        strength = "Minimal"
+    return f"{strength} {direction}"
+
+
+def legacy_convert(scores_df: pd.DataFrame) -> list[GeneScore]:
+    scores = []
+    for _, row in scores_df.iterrows():
+        scores.append(
+            GeneScore(
+                gene_id=row.get("gene_id", ""),
+                gene_name=row.get("gene_name", "Unknown"),
+                strand=row.get("strand", "."),
+                raw_score=float(row.get("raw_score", 0)),
+                quantile_score=float(row.get("quantile_score", 0)),
+                tissue=row.get("ontology_curie", ""),
+                interpretation=_interpret_score(
+                    float(row.get("raw_score", 0)),
+                    float(row.get("quantile_score", 0)),
+                ),
+            )
+        )
+    return scores
+
+
+# ============ Harness ============
+
+def best_of(fn, repeat: int) -> float:
+    """Best wall-clock time in seconds over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=30000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_tidy_scores(args.rows)
+
+    legacy = legacy_convert(df)
+    columnar = gene_scores_from_tidy(df)
+    assert [(s.gene_id, s.raw_score, s.interpretation) for s in legacy] == [
+        (s.gene_id, s.raw_score, s.interpretation) for s in columnar
+    ], "columnar conversion does not match the per-row loop"
+
+    legacy_s = best_of(lambda: legacy_convert(df), args.repeat)
+    columnar_s = best_of(lambda: gene_scores_from_tidy(df), args.repeat)
+    top_k_s = best_of(lambda: gene_scores_from_tidy(df, top_k=50), args.repeat)
+
+    print(f"rows: {args.rows}")
+    print(f"iterrows loop:        {legacy_s * 1000:10.1f} ms")
+    print(f"columnar (all rows):  {columnar_s * 1000:10.1f} ms  ({legacy_s / columnar_s:.1f}x)")
+    print(f"columnar (top 50):    {top_k_s * 1000:10.1f} ms  ({legacy_s / top_k_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
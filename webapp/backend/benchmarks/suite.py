@@ -0,0 +1,357 @@
+"""
+Benchmark suite: prediction and export hot paths
+
+Drives AlphaGenomeService, the FastAPI routers and ExportService end to end
+against the fake AlphaGenome backend with zero simulated latency, so the
+timings are the backend's own overhead. Results are written as JSON; with
+--compare, every case is checked against a stored baseline and the run
+fails if any case regressed.
+
+Groups:
+    score_conversion  tidy scores -> GeneScore (all rows and top 50)
+    variant_parsing   variant strings and VCF records
+    ism               run_ism through the service, ISM matrix encodings
+    export            JSON/CSV/XLSX/PDF/VCF via ExportService
+    api               FastAPI routes (cold and cached) via TestClient
+
+Usage (from webapp/backend):
+    python -m benchmarks.suite --output benchmarks/results/baseline.json
+    python -m benchmarks.suite --compare benchmarks/results/baseline.json
+    python -m benchmarks.suite --only export,api --sizes 10,1000
+"""
+
+import os
+import tempfile
+
+# Configure the app before any module reads its settings: never call the
+# real API, and keep caches, tiles, checkpoints and jobs out of ./data
+_WORKDIR = tempfile.mkdtemp(prefix="ag-bench-")
+os.environ["ALPHAGENOME_BACKEND"] = "fake"
+os.environ["FAKE_LATENCY_MS"] = "{}"
+os.environ["REDIS_URL"] = ""
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ.setdefault("TILE_STORE_DIR", os.path.join(_WORKDIR, "tiles"))
+os.environ.setdefault("ISM_CHECKPOINT_DIR", os.path.join(_WORKDIR, "ism"))
+os.environ.setdefault("RESULT_STORE_DIR", os.path.join(_WORKDIR, "results"))
+os.environ.setdefault("JOB_DATABASE_URL", f"sqlite+aiosqlite:///{_WORKDIR}/jobs.db")
+
+import argparse
+import asyncio
+import atexit
+import importlib.util
+import itertools
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from app.models import ExportFormat, Organism, ScorerType, SequenceLength
+from app.services import matrix_transport
+from app.services.alphagenome_service import alphagenome_service
+from app.services.export_service import export_service
+from app.services.score_conversion import gene_scores_from_tidy
+from app.services.vcf import parse_vcf_variants
+
+from .bench_score_conversion import make_tidy_scores
+
+Case = tuple[str, dict[str, Any], Callable[[], Any]]
+
+GROUPS: dict[str, Callable[[argparse.Namespace], Iterator[Case]]] = {}
+
+
+def group(name: str):
+    """Register a generator of (name, params, fn) benchmark cases."""
+    def register(fn: Callable[[argparse.Namespace], Iterator[Case]]):
+        GROUPS[name] = fn
+        return fn
+    return register
+
+
+def _variants(count: int) -> list[str]:
+    bases = "ACGT"
+    return [
+        f"chr{i % 22 + 1}:{1_000_000 + i * 37}:{bases[i % 4]}>{bases[(i + 1) % 4]}"
+        for i in range(count)
+    ]
+
+
+# ============ Cases ============
+
+@group("score_conversion")
+def score_conversion_cases(args: argparse.Namespace) -> Iterator[Case]:
+    for rows in args.sizes:
+        df = make_tidy_scores(rows)
+        yield "score_conversion.all_rows", {"rows": rows}, lambda df=df: gene_scores_from_tidy(df)
+        yield "score_conversion.top_50", {"rows": rows}, lambda df=df: gene_scores_from_tidy(
+            df, top_k=50
+        )
+
+
+@group("variant_parsing")
+def variant_parsing_cases(args: argparse.Namespace) -> Iterator[Case]:
+    for count in args.sizes:
+        variants = _variants(count)
+        vcf = ["##fileformat=VCFv4.2", "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO"] + [
+            "\t".join([v.split(":")[0], v.split(":")[1], ".", v[-3], v[-1], ".", "PASS", "."])
+            for v in variants
+        ]
+        yield "variant_parsing.strings", {"variants": count}, lambda variants=variants: [
+            alphagenome_service._parse_variant(v) for v in variants
+        ]
+        yield "variant_parsing.vcf", {"records": count}, lambda vcf=vcf: parse_vcf_variants(vcf)
+
+
+@group("ism")
+def ism_cases(args: argparse.Namespace) -> Iterator[Case]:
+    for width in (64, 256, 1000):
+        yield "ism.run_ism", {"ism_width": width}, lambda width=width: asyncio.run(
+            alphagenome_service.run_ism(
+                api_key="benchmark",
+                chromosome="chr22",
+                start=36_201_000,
+                end=36_202_000,
+                ism_width=width,
+                scorer_type=ScorerType.DNASE,
+                tissue="EFO:0002067",
+                sequence_length=SequenceLength.LENGTH_16KB,
+                organism=Organism.HUMAN,
+            )
+        )
+
+    matrix = np.random.default_rng(0).normal(size=(1000, 4)).astype(np.float32)
+    for encoding in ("list", "base64"):
+        yield "ism.encode_json", {"encoding": encoding, "ism_width": 1000}, (
+            lambda encoding=encoding: json.dumps(
+                matrix_transport.encode_matrix_json(matrix, encoding)
+            )
+        )
+    yield "ism.encode_npy", {"ism_width": 1000}, lambda: matrix_transport.npy_chunks(matrix)
+
+
+def _export_data(rows: int) -> dict[str, Any]:
+    rng = np.random.default_rng(rows)
+    raw = rng.normal(0, 0.05, rows)
+    return {
+        "request_params": {"variant": "chr22:36201698:A>C", "organism": "HOMO_SAPIENS"},
+        "summary": {
+            "variant": "chr22:36201698:A>C",
+            "impact_level": "MODERATE",
+            "affected_genes": ["APOL1", "APOL2"],
+            "top_effect": "Moderate increase in APOL1 (UBERON:0001157)",
+            "confidence": 0.85,
+        },
+        "scores": [
+            {
+                "gene_id": f"ENSG{i:011d}",
+                "gene_name": f"GENE{i}",
+                "strand": "+-"[i % 2],
+                "raw_score": float(raw[i]),
+                "quantile_score": float((i % 100) / 100),
+                "tissue": f"UBERON:{i % 667:07d}",
+                "interpretation": "Moderate increase",
+            }
+            for i in range(rows)
+        ],
+    }
+
+
+@group("export")
+def export_cases(args: argparse.Namespace) -> Iterator[Case]:
+    formats = [ExportFormat.JSON, ExportFormat.CSV, ExportFormat.EXCEL, ExportFormat.PDF, ExportFormat.VCF]
+    missing = {
+        ExportFormat.EXCEL: "openpyxl",
+        ExportFormat.PDF: "reportlab",
+    }
+    for rows in args.sizes:
+        data = _export_data(rows)
+        for fmt in formats:
+            params: dict[str, Any] = {"rows": rows}
+            dependency = missing.get(fmt)
+            if dependency and importlib.util.find_spec(dependency) is None:
+                params["fallback"] = f"{dependency} not installed"
+            yield f"export.{fmt.value}", params, (
+                lambda data=data, fmt=fmt: export_service.export(data, fmt)
+            )
+
+
+@group("api")
+def api_cases(args: argparse.Namespace) -> Iterator[Case]:
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    client = TestClient(app)
+    client.__enter__()  # run the lifespan (job service) for the whole group
+    atexit.register(client.__exit__, None, None, None)
+    headers = {"X-API-Key": "benchmark"}
+    positions = itertools.count(36_201_698)
+
+    def post(path: str, body: dict[str, Any]) -> Any:
+        response = client.post(path, json=body, headers=headers)
+        response.raise_for_status()
+        return response.content
+
+    def cold_variant() -> Any:
+        return post("/api/predict/variant", {"variant": f"chr22:{next(positions)}:A>C"})
+
+    yield "api.predict_variant.cold", {}, cold_variant
+    yield "api.predict_variant.cached", {}, lambda: post(
+        "/api/predict/variant", {"variant": "chr22:36201698:A>C"}
+    )
+    yield "api.score.cold", {"scorers": 2}, lambda: post(
+        "/api/predict/score",
+        {"variant": f"chr22:{next(positions)}:A>C", "scorers": ["RNA_SEQ", "DNASE"]},
+    )
+
+    def cold_interval() -> Any:
+        start = next(positions) % 300 * 131072
+        return post(
+            "/api/predict/interval",
+            {
+                "chromosome": "chr22",
+                "start": start,
+                "end": start + 131072,
+                "outputs": ["RNA_SEQ", "DNASE"],
+            },
+        )
+
+    yield "api.predict_interval.cold", {"width": 131072, "resolution": 128}, cold_interval
+    yield "api.ism", {"ism_width": 256}, lambda: post(
+        "/api/predict/ism", {"chromosome": "chr22", "start": 36_201_000, "end": 36_202_000}
+    )
+    for rows in args.sizes:
+        data = _export_data(rows)
+        for fmt in ("json", "csv"):
+            yield f"api.export.{fmt}", {"rows": rows}, (
+                lambda data=data, fmt=fmt: post(
+                    "/api/export/download", {"data": data, "format": fmt}
+                )
+            )
+
+
+# ============ Harness ============
+
+def measure(fn: Callable[[], Any], repeat: int, budget_seconds: float) -> list[float]:
+    """Run `fn` up to `repeat` times (at least once) within the time budget."""
+    timings: list[float] = []
+    spent = 0.0
+    while len(timings) < repeat and (not timings or spent < budget_seconds):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed * 1000)
+        spent += elapsed
+    return timings
+
+
+def case_id(name: str, params: dict[str, Any]) -> str:
+    keyed = {k: v for k, v in params.items() if k != "fallback"}
+    if not keyed:
+        return name
+    return f"{name}[{','.join(f'{k}={v}' for k, v in keyed.items())}]"
+
+
+def environment() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    results = []
+    for name in args.only:
+        for case, params, fn in GROUPS[name](args):
+            timings = measure(fn, args.repeat, args.budget)
+            result = {
+                "id": case_id(case, params),
+                "group": name,
+                "name": case,
+                "params": params,
+                "runs": len(timings),
+                "min_ms": round(min(timings), 3),
+                "median_ms": round(statistics.median(timings), 3),
+                "mean_ms": round(statistics.fmean(timings), 3),
+            }
+            results.append(result)
+            print(f"{result['id']:<60} {result['median_ms']:>12.3f} ms  (n={result['runs']})")
+    return {"environment": environment(), "settings": vars(args), "results": results}
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float, min_delta_ms: float) -> bool:
+    """Print a comparison table; returns True if any case regressed."""
+    before = {r["id"]: r for r in baseline["results"]}
+    regressed = False
+    print(f"\n{'case':<60} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for result in current["results"]:
+        old = before.get(result["id"])
+        if old is None:
+            print(f"{result['id']:<60} {'-':>12} {result['median_ms']:>12.3f} {'new':>8}")
+            continue
+        ratio = result["median_ms"] / old["median_ms"] if old["median_ms"] else float("inf")
+        delta = result["median_ms"] - old["median_ms"]
+        status = ""
+        if ratio > 1 + threshold and delta > min_delta_ms:
+            status = "  REGRESSION"
+            regressed = True
+        elif ratio < 1 - threshold and -delta > min_delta_ms:
+            status = "  improved"
+        print(
+            f"{result['id']:<60} {old['median_ms']:>12.3f} {result['median_ms']:>12.3f} "
+            f"{ratio:>7.2f}x{status}"
+        )
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--only", default=",".join(GROUPS), help="Comma-separated groups")
+    parser.add_argument("--sizes", default="10,1000,100000", help="Row counts for sized cases")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case")
+    parser.add_argument("--budget", type=float, default=10.0, help="Max seconds per case")
+    parser.add_argument("--output", default="benchmarks/results/latest.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="Baseline results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown ratio")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore smaller slowdowns")
+    args = parser.parse_args()
+    args.only = [name.strip() for name in args.only.split(",") if name.strip()]
+    args.sizes = [int(size) for size in args.sizes.split(",")]
+    unknown = set(args.only) - set(GROUPS)
+    if unknown:
+        parser.error(f"Unknown groups: {', '.join(sorted(unknown))}")
+
+    logging.disable(logging.INFO)
+    report = run(args)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if compare(report, baseline, args.threshold, args.min_delta_ms):
+            print("\nPerformance regressions detected")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+"""
+Test configuration.
+
+Settings are read once at import time, so the environment is set here,
+before any test imports the app: the fake AlphaGenome backend, no Redis,
+and every on-disk store in a temporary directory.
+"""
+
+import os
+import tempfile
+
+_WORKDIR = tempfile.mkdtemp(prefix="ag-test-")
+os.environ["ALPHAGENOME_BACKEND"] = "fake"
+os.environ["FAKE_LATENCY_MS"] = "{}"
+os.environ["REDIS_URL"] = ""
+os.environ["TILE_STORE_DIR"] = os.path.join(_WORKDIR, "tiles")
+os.environ["ISM_CHECKPOINT_DIR"] = os.path.join(_WORKDIR, "ism")
+os.environ["RESULT_STORE_DIR"] = os.path.join(_WORKDIR, "results")
+os.environ["JOB_DATABASE_URL"] = f"sqlite+aiosqlite:///{_WORKDIR}/jobs.db"
@@ -0,0 +1,68 @@
+"""Tests for single-flight request coalescing."""
+
+import asyncio
+
+import pytest
+
+from app.services.coalescer import RequestCoalescer
+
+
+def test_concurrent_identical_requests_share_one_call():
+    coalescer = RequestCoalescer()
+    executions: list[str] = []
+
+    def factory(key: str):
+        async def call():
+            executions.append(key)
+            await asyncio.sleep(0.01)
+            return key.upper()
+
+        return call
+
+    async def run():
+        return await asyncio.gather(
+            *(coalescer.run(k, factory(k)) for k in ["a", "a", "a", "b"])
+        )
+
+    assert asyncio.run(run()) == ["A", "A", "A", "B"]
+    assert sorted(executions) == ["a", "b"]
+    stats = coalescer.stats()
+    assert stats["upstream_executions"] == 2
+    assert stats["calls_saved"] == 2
+    assert stats["in_flight"] == 0
+
+
+def test_failures_reach_every_waiter():
+    coalescer = RequestCoalescer()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream")
+
+    async def run():
+        return await asyncio.gather(
+            coalescer.run("k", boom), coalescer.run("k", boom), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert coalescer.stats()["failures"] == 1
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_call():
+    coalescer = RequestCoalescer()
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def run():
+        first = asyncio.ensure_future(coalescer.run("k", slow))
+        second = asyncio.ensure_future(coalescer.run("k", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "done"
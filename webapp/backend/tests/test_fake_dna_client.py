@@ -0,0 +1,36 @@
+"""Tests for the offline fake AlphaGenome backend."""
+
+import numpy as np
+from alphagenome.data import genome
+from alphagenome.models import dna_output, interval_scorers
+
+from app.services.fake_dna_client import FakeDnaClient
+
+INTERVAL = genome.Interval("chr22", 35677410, 36725986)
+
+
+def test_score_interval_returns_gene_by_track_scores():
+    scores = FakeDnaClient().score_interval(INTERVAL)
+
+    assert len(scores) == len(interval_scorers.RECOMMENDED_INTERVAL_SCORERS)
+    adata = scores[0]
+    assert adata.n_obs > 0 and adata.n_vars > 0
+    assert {"gene_id", "gene_name", "strand"} <= set(adata.obs.columns)
+    assert adata.uns["interval"] == INTERVAL
+    assert adata.uns["interval_scorer"].requested_output == dna_output.OutputType.RNA_SEQ
+
+
+def test_score_interval_is_deterministic():
+    first = FakeDnaClient().score_interval(INTERVAL)[0].X
+    second = FakeDnaClient().score_interval(INTERVAL)[0].X
+    np.testing.assert_array_equal(first, second)
+
+
+def test_latency_varies_between_identical_requests(monkeypatch):
+    slept: list[float] = []
+    monkeypatch.setattr("app.services.fake_dna_client.time.sleep", slept.append)
+    client = FakeDnaClient(latency_ms={"predict_interval": 10})
+
+    for _ in range(5):
+        client.predict_interval(INTERVAL, requested_outputs=[], ontology_terms=None)
+    assert len(set(slept)) == 5
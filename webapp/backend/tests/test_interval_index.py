@@ -0,0 +1,43 @@
+"""Tests for the index of cached interval windows."""
+
+from app.services.interval_index import IntervalIndex
+
+GROUP = ("HOMO_SAPIENS", "chr22", ("RNA_SEQ",), ("UBERON:0001157",))
+
+
+def test_finds_a_containing_window():
+    index = IntervalIndex()
+    index.add(GROUP, 1_000, 2_000, "a")
+    index.add(GROUP, 5_000, 6_000, "b")
+
+    assert index.find(GROUP, 1_200, 1_800) == (1_000, 2_000, "a")
+    assert index.find(GROUP, 5_000, 6_000 - 1) == (5_000, 6_000, "b")
+    assert index.find(GROUP, 1_800, 2_200) is None
+    assert index.find(("other",), 1_200, 1_800) is None
+
+
+def test_exact_matches_are_left_to_the_cache():
+    index = IntervalIndex()
+    index.add(GROUP, 1_000, 2_000, "a")
+    assert index.find(GROUP, 1_000, 2_000) is None
+
+
+def test_prefers_the_narrowest_container():
+    index = IntervalIndex()
+    index.add(GROUP, 0, 10_000, "wide")
+    index.add(GROUP, 1_000, 3_000, "narrow")
+    assert index.find(GROUP, 1_500, 2_500)[2] == "narrow"
+
+
+def test_discard_and_eviction():
+    index = IntervalIndex(max_entries=2)
+    index.add(GROUP, 0, 1_000, "a")
+    index.add(GROUP, 2_000, 3_000, "b")
+    index.add(GROUP, 4_000, 5_000, "c")
+
+    assert index.find(GROUP, 100, 200) is None  # oldest evicted
+    assert index.find(GROUP, 2_100, 2_200)[2] == "b"
+
+    index.discard(GROUP, 2_000, 3_000)
+    assert index.find(GROUP, 2_100, 2_200) is None
+    assert index.stats()["entries"] == 1
@@ -0,0 +1,90 @@
+"""Tests for token-bucket admission and cache refunds."""
+
+import asyncio
+
+from app.services.rate_limiter import (
+    RateLimiter,
+    finish_savings,
+    record_cache_hit,
+    track_savings,
+)
+
+
+def limiter() -> RateLimiter:
+    return RateLimiter(
+        requests_per_minute=60,
+        predictions_per_minute=60,
+        prediction_burst=10,
+        predictions_per_day=100,
+    )
+
+
+def test_rejects_when_a_bucket_cannot_pay():
+    rl = limiter()
+
+    async def run():
+        first = await rl.check("key:a", cost=8)
+        second = await rl.check("key:a", cost=8)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first.allowed
+    assert not second.allowed
+    assert second.limited_by == "predictions"
+    assert second.retry_after > 0
+    # Nothing is taken from a rejected request
+    assert second.remaining["requests"] >= 58
+
+
+def test_refund_restores_prediction_and_daily_tokens():
+    rl = limiter()
+
+    async def run():
+        await rl.check("key:a", cost=8)
+        await rl.refund("key:a", 8)
+        return await rl.check("key:a", cost=8)
+
+    decision = asyncio.run(run())
+    assert decision.allowed
+    assert round(decision.remaining["daily"]) == 92
+    assert rl.stats()["refunded_predictions"] == 8
+
+
+def test_refund_never_exceeds_capacity():
+    rl = limiter()
+
+    async def run():
+        await rl.check("key:a", cost=1)
+        await rl.refund("key:a", 50)
+        return await rl.check("key:a", cost=0)
+
+    asyncio.run(run())
+    assert rl._memory._state[("predictions", "key:a")][0] <= 10
+
+
+def test_cache_hits_are_collected_per_request():
+    record_cache_hit(5)  # outside a request: ignored
+
+    savings, token = track_savings()
+    try:
+        record_cache_hit()
+        record_cache_hit(2)
+    finally:
+        finish_savings(token)
+    record_cache_hit(5)
+
+    assert savings.predictions == 3
+
+
+def test_tile_reads_use_their_own_bucket():
+    rl = RateLimiter(1, 60, 10, tiles_per_minute=100)
+
+    async def run():
+        await rl.check("key:a")
+        tile = await rl.check("key:a", base=rl.tiles)
+        request = await rl.check("key:a")
+        return tile, request
+
+    tile, request = asyncio.run(run())
+    assert tile.allowed
+    assert not request.allowed
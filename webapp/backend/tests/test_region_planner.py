@@ -0,0 +1,53 @@
+"""Tests for splitting regions into overlapping model windows."""
+
+import pytest
+
+from app.services.region_planner import NATIVE_ROW_ALIGN, plan_windows
+
+WINDOW = 1 << 20
+
+
+@pytest.mark.parametrize(
+    "start, end, overlap, align",
+    [
+        (0, 5_000_000, 131072, 1),
+        (35_000_000, 37_000_001, 131072, 2048),
+        (1_000, 2_000, 0, 1),
+        (10_000_000, 10_000_000 + WINDOW, 262144, 128),
+    ],
+)
+def test_kept_parts_tile_the_region(start, end, overlap, align):
+    windows = plan_windows(start, end, WINDOW, overlap, align)
+
+    assert windows[0].keep_start == start
+    assert windows[-1].keep_end == end
+    for previous, current in zip(windows, windows[1:]):
+        assert current.keep_start == previous.keep_end
+    for index, w in enumerate(windows):
+        assert w.index == index
+        assert w.window_end - w.window_start == WINDOW
+        assert w.window_start <= w.keep_start < w.keep_end <= w.window_end
+        assert w.window_start >= 0
+        assert w.keep_offset % NATIVE_ROW_ALIGN == 0 or w.window_start == 0
+
+
+def test_kept_parts_respect_alignment():
+    windows = plan_windows(0, 10_000_000, WINDOW, 131072, 2048)
+    for w in windows[:-1]:
+        assert (w.keep_end - w.keep_start) % 2048 == 0
+
+
+def test_margins_discard_half_the_overlap():
+    windows = plan_windows(5_000_000, 8_000_000, WINDOW, 131072)
+    assert windows[1].keep_offset == 131072 // 2
+
+
+@pytest.mark.parametrize("start, end", [(10, 10), (10, 5)])
+def test_empty_region_is_rejected(start, end):
+    with pytest.raises(ValueError):
+        plan_windows(start, end, WINDOW, 0)
+
+
+def test_overlap_wider_than_window_is_rejected():
+    with pytest.raises(ValueError):
+        plan_windows(0, 100, 16384, 16384)
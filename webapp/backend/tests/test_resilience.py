@@ -0,0 +1,111 @@
+"""Tests for upstream retries and the circuit breaker."""
+
+import asyncio
+
+import grpc
+import pytest
+
+from app.services.resilience import (
+    AttemptTimeoutError,
+    CircuitBreaker,
+    CircuitOpenError,
+    ResilientCaller,
+)
+
+
+class FakeRpcError(grpc.RpcError):
+    def __init__(self, code: grpc.StatusCode):
+        self._code = code
+
+    def code(self) -> grpc.StatusCode:
+        return self._code
+
+
+def failing(code: grpc.StatusCode, calls: list[int]):
+    async def attempt():
+        calls.append(1)
+        raise FakeRpcError(code)
+
+    return attempt
+
+
+async def ok():
+    return "ok"
+
+
+def caller(**kwargs) -> ResilientCaller:
+    defaults = {"base_delay": 0, "max_delay": 0, "breaker_failure_threshold": 2}
+    return ResilientCaller(**{**defaults, **kwargs})
+
+
+def test_retries_transient_errors_until_exhausted():
+    calls: list[int] = []
+    resilient = caller(max_attempts=3, breaker_failure_threshold=10)
+
+    with pytest.raises(FakeRpcError):
+        asyncio.run(resilient.call("m", failing(grpc.StatusCode.ABORTED, calls)))
+    assert len(calls) == 3
+
+
+def test_does_not_retry_what_the_client_retries():
+    for code in (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.RESOURCE_EXHAUSTED):
+        calls: list[int] = []
+        with pytest.raises(FakeRpcError):
+            asyncio.run(caller(max_attempts=3).call("m", failing(code, calls)))
+        assert len(calls) == 1
+
+
+def test_timed_out_attempt_is_not_retried():
+    calls: list[int] = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(1)
+
+    with pytest.raises(AttemptTimeoutError):
+        asyncio.run(caller(attempt_timeout=0.01, max_attempts=3).call("m", slow))
+    assert len(calls) == 1
+
+
+def test_client_errors_neither_open_nor_reset_the_breaker():
+    resilient = caller(max_attempts=1)
+
+    async def run():
+        for code in (
+            grpc.StatusCode.UNAVAILABLE,
+            grpc.StatusCode.INVALID_ARGUMENT,
+            grpc.StatusCode.RESOURCE_EXHAUSTED,
+            grpc.StatusCode.UNAVAILABLE,
+        ):
+            with pytest.raises(FakeRpcError):
+                await resilient.call("m", failing(code, []))
+        with pytest.raises(CircuitOpenError):
+            await resilient.call("m", ok)
+
+    asyncio.run(run())
+    assert resilient.stats()["endpoints"]["m"]["circuit"] == CircuitBreaker.OPEN
+
+
+def test_cancelled_half_open_probe_releases_the_breaker():
+    resilient = caller(max_attempts=1, breaker_failure_threshold=1, breaker_reset_seconds=0)
+
+    async def run():
+        with pytest.raises(FakeRpcError):
+            await resilient.call("m", failing(grpc.StatusCode.UNAVAILABLE, []))
+
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.sleep(60)
+
+        probe = asyncio.ensure_future(resilient.call("m", hang))
+        await started.wait()
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        return await resilient.call("m", ok)
+
+    assert asyncio.run(run()) == "ok"
+    assert resilient.stats()["endpoints"]["m"]["circuit"] == CircuitBreaker.CLOSED
@@ -0,0 +1,58 @@
+"""Round-trip tests for the binary result codec."""
+
+import numpy as np
+import pytest
+
+from app.models import GeneScore
+from app.services import result_codec
+
+
+def test_nested_values_round_trip():
+    value = {
+        "interval": {"chromosome": "chr22", "start": 1, "end": 3},
+        "outputs": {
+            "RNA_SEQ": {
+                "values": np.random.default_rng(0).random((64, 5), dtype=np.float32),
+                "resolution": 1,
+                "metadata": [{"name": "t", "strand": "+"}],
+            },
+        },
+        "counts": np.arange(10, dtype=np.int64),
+        "scalar": np.float64(0.5),
+        "tuple": (1, 2),
+    }
+    decoded = result_codec.unpack(result_codec.pack(value))
+
+    np.testing.assert_array_equal(
+        decoded["outputs"]["RNA_SEQ"]["values"], value["outputs"]["RNA_SEQ"]["values"]
+    )
+    assert decoded["outputs"]["RNA_SEQ"]["values"].dtype == np.float32
+    np.testing.assert_array_equal(decoded["counts"], value["counts"])
+    assert decoded["outputs"]["RNA_SEQ"]["metadata"] == [{"name": "t", "strand": "+"}]
+    assert decoded["interval"] == value["interval"]
+    assert decoded["scalar"] == 0.5
+    assert decoded["tuple"] == [1, 2]
+
+
+def test_big_endian_and_non_contiguous_arrays():
+    matrix = np.arange(12, dtype=">f8").reshape(3, 4)[:, ::2]
+    decoded = result_codec.unpack(result_codec.pack({"m": matrix}))["m"]
+    np.testing.assert_array_equal(decoded, matrix)
+    assert decoded.shape == (3, 2)
+
+
+def test_scores_round_trip():
+    scores = [
+        GeneScore(
+            gene_id=f"ENSG{i}", gene_name=f"G{i}", strand="+", raw_score=i / 3,
+            quantile_score=-i / 7, tissue="UBERON:0001157", interpretation="x",
+        )
+        for i in range(20)
+    ]
+    assert result_codec.decode_scores(result_codec.encode_scores(scores)) == scores
+    assert result_codec.decode_scores(result_codec.encode_scores([])) == []
+
+
+def test_rejects_foreign_payloads():
+    with pytest.raises(ValueError):
+        result_codec.unpack(b"not a payload")
@@ -0,0 +1,71 @@
+"""Tests for the on-disk tile pyramid."""
+
+import numpy as np
+import pytest
+
+from app.services.tile_store import TileStore, zoom_levels_for
+
+METADATA = [
+    {"name": "a", "strand": "+", "ontology_curie": "UBERON:0001157"},
+    {"name": "b", "strand": "-", "ontology_curie": "UBERON:0001157"},
+    {"name": "c", "strand": "+", "ontology_curie": None},
+]
+
+
+def prediction(start: int, length: int, chromosome: str = "chr22") -> dict:
+    values = np.arange(length * 3, dtype=np.float32).reshape(length, 3)
+    return {
+        "interval": {"chromosome": chromosome, "start": start, "end": start + length},
+        "outputs": {"RNA_SEQ": {"values": values, "resolution": 1, "metadata": METADATA}},
+    }
+
+
+def store(tmp_path, **kwargs) -> TileStore:
+    return TileStore(str(tmp_path), tile_bins=64, zoom_levels=[1, 16], **kwargs)
+
+
+def test_ingested_bins_are_read_back_at_every_zoom(tmp_path):
+    tiles = store(tmp_path)
+    raw = prediction(64, 256)
+    assert tiles.ingest("HOMO_SAPIENS", raw) > 0
+
+    values, tracks = tiles.read_tile("HOMO_SAPIENS", "chr22", "RNA_SEQ", "UBERON:0001157", 1, 1)
+    assert [t["name"] for t in tracks] == ["a", "b"]
+    np.testing.assert_array_equal(values, raw["outputs"]["RNA_SEQ"]["values"][:64, :2])
+
+    # Tile 0 at 16bp covers [0, 1024): bins 4..19 come from the prediction
+    coarse, _ = tiles.read_tile("HOMO_SAPIENS", "chr22", "RNA_SEQ", "none", 16, 0)
+    assert np.isnan(coarse[:4]).all() and np.isnan(coarse[20:]).all()
+    expected = raw["outputs"]["RNA_SEQ"]["values"][:, 2].reshape(16, 16).mean(axis=1)
+    np.testing.assert_allclose(coarse[4:20, 0], expected)
+
+
+def test_unknown_chromosomes_and_tiles(tmp_path):
+    tiles = store(tmp_path)
+    assert tiles.ingest("HOMO_SAPIENS", prediction(0, 64, chromosome="chrUn")) == 0
+    assert tiles.read_tile("HOMO_SAPIENS", "chr22", "RNA_SEQ", "none", 1, 0) is None
+
+
+def test_rejects_path_components(tmp_path):
+    with pytest.raises(ValueError):
+        store(tmp_path).read_tile("HOMO_SAPIENS", "..", "RNA_SEQ", "none", 1, 0)
+
+
+def test_least_recently_used_tiles_are_evicted(tmp_path):
+    tiles = store(tmp_path)
+    tiles.ingest("HOMO_SAPIENS", prediction(0, 64))
+    # Room for exactly one prediction's tiles (two groups, two zoom levels)
+    tiles.max_bytes = tiles.stats()["bytes"]
+    tiles.ingest("HOMO_SAPIENS", prediction(64 * 64, 64))
+
+    assert tiles.stats()["bytes"] <= tiles.max_bytes
+    assert tiles.stats()["tiles"] == 4
+    assert tiles.stats()["tiles_evicted"] > 0
+    assert tiles.read_tile("HOMO_SAPIENS", "chr22", "RNA_SEQ", "none", 1, 0) is None
+    assert tiles.read_tile("HOMO_SAPIENS", "chr22", "RNA_SEQ", "none", 1, 64) is not None
+
+
+def test_zoom_levels_nest_above_the_native_resolution():
+    assert zoom_levels_for(1, [1, 16, 256, 4096]) == [1, 16, 256, 4096]
+    assert zoom_levels_for(128, [1, 16, 256, 4096]) == [256, 4096]
+    assert zoom_levels_for(1, [16, 24]) == [16]